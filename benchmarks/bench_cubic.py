@@ -0,0 +1,74 @@
+"""Cubic Root Benchmark
+
+Compare the analytic cubic solver against the old np.roots path for Peng Robinson Z factors.
+Run from the repository root with: python -m benchmarks.bench_cubic
+"""
+
+import time
+
+import numpy as np
+
+import eos.peng_robinson as pr
+
+
+def zfactors_nproots(A: float, B: float) -> tuple[float, float]:
+    """Peng Robinson Z Factors with np.roots
+
+    The method pengrob_zfactors used before the analytic solver, kept here as the reference.
+    The real roots are picked the same way as cubic.cubic_zroots, so both sides are compared
+    on the liquid and vapor roots the solvers use.
+
+    Args:
+        A (float): Peng Robinson A
+        B (float): Peng Robinson B
+
+    Returns:
+        zliq (float): Smallest Real Z Factor above B, the vapor root if there is none
+        zvap (float): Largest Real Z Factor
+    """
+    coeff = [1, -1 * (1 - B), A - 2 * B - 3 * B**2, -1 * (A * B - B**2 - B**3)]
+    zroots = np.roots(coeff)
+    zray = zroots.real[abs(zroots.imag) < 1e-5]
+    zvap = max(zray)
+    zphys = zray[zray > B]
+    return (min(zphys) if zphys.size else zvap), zvap
+
+
+def bench_cubic(nstate: int = 10000, seed: int = 42) -> None:
+    """Time and compare both cubic root methods on random (A, B) states
+
+    Args:
+        nstate (int): Number of (A, B) states to solve
+        seed (int): Random Seed for the states
+
+    Returns:
+        None, prints a summary table
+    """
+    rng = np.random.default_rng(seed)
+    A = rng.uniform(0.001, 2.0, nstate)  # covers gas, liquid and three root regions
+    B = rng.uniform(0.001, 0.3, nstate)
+
+    start = time.perf_counter()
+    ref = np.array([zfactors_nproots(a, b) for a, b in zip(A, B)])
+    t_roots = time.perf_counter() - start
+
+    start = time.perf_counter()
+    zliq, zvap = pr.pengrob_zroots(A, B)
+    t_batch = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for a, b in zip(A, B):
+        pr.pengrob_zroots(a, b)
+    t_loop = time.perf_counter() - start
+
+    err = max(np.max(abs(zliq - ref[:, 0])), np.max(abs(zvap - ref[:, 1])))
+
+    print(f"{nstate} Peng Robinson cubics")
+    print(f"{'np.roots loop':>20}: {t_roots * 1e3:10.2f} ms")
+    print(f"{'analytic loop':>20}: {t_loop * 1e3:10.2f} ms, {t_roots / t_loop:6.1f}x")
+    print(f"{'analytic batch':>20}: {t_batch * 1e3:10.2f} ms, {t_roots / t_batch:6.1f}x")
+    print(f"{'max root difference':>20}: {err:10.3E}")
+
+
+if __name__ == "__main__":
+    bench_cubic()
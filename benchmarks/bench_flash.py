@@ -0,0 +1,190 @@
+"""Flash and Saturation Regression Benchmark
+
+Time the bubble point, dew point and flash paths on the ternary and lift gas mixtures, plus
+batch flashes over a pressure and temperature grid. Each case records its best wall time over
+a few repeats and how many times the cubic EOS fugacity kernel was evaluated, which
+stands in for the iteration count and does not depend on the machine.
+
+Run from the repository root with: python -m benchmarks.bench_flash
+The results are compared against benchmarks/bench_flash_baseline.json, the run fails when a
+case is slower than the baseline by more than the tolerance or needs more kernel evaluations.
+Pass --update to write the current results as the new baseline.
+"""
+
+import argparse
+import json
+import os
+import platform
+import sys
+import time
+
+import numpy as np
+
+import overall as oa
+import telemetry as tm
+from proptables.bini_vals import bini_dict
+from proptables.crit_vals import prop_dict
+
+BASELINE = os.path.join(os.path.dirname(__file__), "bench_flash_baseline.json")
+
+prac_comp = {"c3": 0.6, "nc4": 0.3, "nc5": 0.1}
+
+lift_comp = {
+    "c1": 0.7785,
+    "c2": 0.0575,
+    "c3": 0.0249,
+    "nc4": 0.0039,
+    "ic4": 0.0021,
+    "nc5": 0.0011,
+    "ic5": 0.0008,
+    "nc6": 0.0013,
+    "nc7": 0.0007,
+    "nc8": 0.0003,
+    "nc9": 0.0002,
+    "nc10": 0.0001,
+    "co2": 0.1228,
+    "n2": 0.0058,
+}
+
+
+def bench_cases() -> dict:
+    """Benchmark Cases, name: function with no arguments
+
+    Returns:
+        cases (dict): Case names and the calls they time
+    """
+    prac_pgrid, prac_tgrid = np.meshgrid(np.linspace(0, 300, 40), np.linspace(50, 250, 40))
+    lift_pgrid, lift_tgrid = np.meshgrid(np.linspace(0, 1500, 40), np.linspace(-200, 100, 40))
+    return {
+        "prac_bubble_100F": lambda: oa.bubblepoint_pressure(100, prac_comp, prop_dict, bini_dict),
+        "prac_dew_100F": lambda: oa.dewpoint_pressure(100, prac_comp, prop_dict, bini_dict),
+        "prac_flash_175psig_150F": lambda: oa.phase_comp(175, 150, prac_comp, prop_dict, bini_dict),
+        "lift_bubble_-100F": lambda: oa.bubblepoint_pressure(-100, lift_comp, prop_dict, bini_dict),
+        "lift_dew_50F": lambda: oa.dewpoint_pressure(50, lift_comp, prop_dict, bini_dict),
+        "lift_flash_535psig_-100F": lambda: oa.phase_comp(535, -100, lift_comp, prop_dict, bini_dict),
+        "prac_batch_40x40": lambda: oa.phase_comp_batch(prac_pgrid, prac_tgrid, prac_comp, prop_dict, bini_dict),
+        "lift_batch_40x40": lambda: oa.phase_comp_batch(lift_pgrid, lift_tgrid, lift_comp, prop_dict, bini_dict),
+    }
+
+
+def count_lnphi(func) -> int:
+    """Number of cubic EOS ln phi Evaluations made by One Run of a Case
+
+    Counted by telemetry, so the evaluations inside cubic.cubic_lnphi_derivs are included.
+
+    Args:
+        func (function): Case to run
+
+    Returns:
+        ncalls (int): Evaluations of the cubic EOS fugacity kernel
+    """
+    with tm.record() as rec:
+        func()
+    return rec.calls.get("cubic_lnphi", 0)
+
+
+def bench_case(func, repeat: int) -> dict:
+    """Best Time and Kernel Calls of a Case
+
+    Short cases are looped until one timed sample takes at least 50 ms, which keeps
+    timer and scheduler noise out of the millisecond cases.
+
+    Args:
+        func (function): Case to run
+        repeat (int): Number of timed samples, the fastest is kept
+
+    Returns:
+        result (dict): time_ms per call and lnphi_calls
+    """
+    start = time.perf_counter()
+    func()  # warm up the caches
+    number = max(1, int(0.05 / max(time.perf_counter() - start, 1e-6)))
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(number):
+            func()
+        times.append((time.perf_counter() - start) / number)
+    return {"time_ms": round(min(times) * 1e3, 4), "lnphi_calls": count_lnphi(func)}
+
+
+def run_bench(repeat: int = 5) -> dict:
+    """Run every Benchmark Case
+
+    Args:
+        repeat (int): Number of timed runs per case
+
+    Returns:
+        results (dict): Case name: time_ms and lnphi_calls
+    """
+    return {name: bench_case(func, repeat) for name, func in bench_cases().items()}
+
+
+def compare_bench(results: dict, baseline: dict, tol: float) -> list:
+    """Cases that Regressed against the Baseline
+
+    Args:
+        results (dict): Current results from run_bench
+        baseline (dict): Baseline results from run_bench
+        tol (float): Allowed fractional slow down in time, 0.25 is 25 percent
+
+    Returns:
+        fails (list): Messages for each regressed case, empty if none
+    """
+    fails = []
+    for name, res in results.items():
+        base = baseline.get(name)
+        if base is None:
+            continue
+        if res["time_ms"] > base["time_ms"] * (1 + tol):
+            fails.append(f"{name}: {res['time_ms']:.3f} ms vs baseline {base['time_ms']:.3f} ms")
+        if res["lnphi_calls"] > base["lnphi_calls"]:
+            fails.append(f"{name}: {res['lnphi_calls']} lnphi calls vs baseline {base['lnphi_calls']}")
+    return fails
+
+
+def main(argv: list | None = None) -> int:
+    """Command Line Entry, compare against or update the baseline
+
+    Args:
+        argv (list): Command Line Arguments, None reads sys.argv
+
+    Returns:
+        status (int): 0 if no case regressed, 1 otherwise
+    """
+    parser = argparse.ArgumentParser(description="Flash and saturation regression benchmark")
+    parser.add_argument("--update", action="store_true", help="write the results as the new baseline")
+    parser.add_argument("--tol", type=float, default=0.25, help="allowed fractional slow down, default 0.25")
+    parser.add_argument("--repeat", type=int, default=5, help="timed runs per case, default 5")
+    parser.add_argument("--baseline", default=BASELINE, help="baseline json file")
+    args = parser.parse_args(argv)
+
+    results = run_bench(args.repeat)
+    baseline = {}
+    if os.path.exists(args.baseline):
+        with open(args.baseline) as f:
+            baseline = json.load(f)["cases"]
+
+    print(f"{'case':>26} {'time ms':>10} {'base ms':>10} {'lnphi':>7} {'base':>7}")
+    for name, res in results.items():
+        base = baseline.get(name, {"time_ms": float("nan"), "lnphi_calls": -1})
+        print(
+            f"{name:>26} {res['time_ms']:10.3f} {base['time_ms']:10.3f} {res['lnphi_calls']:7d} {base['lnphi_calls']:7d}"
+        )
+
+    if args.update:
+        with open(args.baseline, "w") as f:
+            info = {"python": platform.python_version(), "machine": platform.machine(), "numpy": np.__version__}
+            json.dump({"info": info, "cases": results}, f, indent=2)
+            f.write("\n")
+        print(f"baseline written to {args.baseline}")
+        return 0
+
+    fails = compare_bench(results, baseline, args.tol)
+    for msg in fails:
+        print(f"REGRESSION {msg}")
+    return 1 if fails else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
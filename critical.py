@@ -0,0 +1,239 @@
+"""Mixture Critical Point
+
+Heidemann and Khalil 1980 critical point of a mixture on the cubic equation of state, with the
+two conditions written as in Michelsen 1980. In temperature and volume the Helmholtz energy
+matrix Q_ij = sqrt(zi zj) d2(A / RT) / dni dnj has a zero smallest eigenvalue at the critical point,
+and the cubic form of the third derivatives along dn_i = sqrt(zi) u_i, u the eigenvector of that
+eigenvalue, is zero as well. The inner loop finds the temperature of the zero eigenvalue at a
+fixed volume, the outer loop the volume where the cubic form vanishes, both by secant. The
+volume is started at four times the mixture b and the temperature at 1.5 times the molar
+average critical temperature, as Heidemann and Khalil suggest.
+
+The residual part of A / RT for one mole of any cubic, Michelsen and Mollerup 2007:
+    F = -n ln(1 - B / V) - D / (RT B (delta1 - delta2)) ln((V + delta1 B) / (V + delta2 B))
+with B = sum(ni bi) and D = sum(ni nj aij). The second derivatives are analytic, the cubic form
+differences the residual second derivatives along dn, the ideal part of it is analytic.
+"""
+
+import math
+
+import numpy as np
+
+import eos.cubic as cb
+import fluid as fd
+
+
+def helmholtz_hessian(
+    ni_ray: np.ndarray, vol: float, bi_ray: np.ndarray, aij_rt: np.ndarray, eos: cb.CubicEOS = cb.PR
+) -> np.ndarray:
+    """Residual Helmholtz Energy Mole Number Derivatives at Constant T and V
+
+    Args:
+        ni_ray (np.ndarray): Mole Numbers, lbmol
+        vol (float): Total Volume, ft3
+        bi_ray (np.ndarray): b values, ft3/lbmol
+        aij_rt (np.ndarray): Matrix of a values over RT, sqrt(ai aj) (1 - kij) / (R T)
+        eos (cb.CubicEOS): Equation of State, cubic.PR or cubic.SRK
+
+    Returns:
+        fij (np.ndarray): d2F / dni dnj, n x n
+    """
+    ntot = ni_ray.sum()
+    bmix = ni_ray @ bi_ray
+    di_ray = 2 * aij_rt @ ni_ray
+    dmix = ni_ray @ aij_rt @ ni_ray
+    d1 = eos.delta1
+    d2 = eos.delta2
+    v1 = vol + d1 * bmix
+    v2 = vol + d2 * bmix
+
+    # h(V, B) = ln((V + d1 B) / (V + d2 B)) / (B (d1 - d2)) and its B derivatives
+    log_ratio = math.log(v1 / v2)
+    log_b = d1 / v1 - d2 / v2
+    log_bb = -(d1**2) / v1**2 + d2**2 / v2**2
+    h = log_ratio / (bmix * (d1 - d2))
+    h_b = (log_b / bmix - log_ratio / bmix**2) / (d1 - d2)
+    h_bb = (log_bb / bmix - 2 * log_b / bmix**2 + 2 * log_ratio / bmix**3) / (d1 - d2)
+
+    F_nb = 1 / (vol - bmix)
+    F_bb = ntot / (vol - bmix) ** 2 - dmix * h_bb
+    F_bd = -h_b
+    F_d = -h
+    bi_di = np.outer(bi_ray, di_ray)
+    return (
+        F_nb * (bi_ray[:, None] + bi_ray[None, :])
+        + F_bb * np.outer(bi_ray, bi_ray)
+        + F_bd * (bi_di + bi_di.T)
+        + F_d * 2 * aij_rt
+    )
+
+
+def critical_conditions(
+    tabs: float, vol: float, fluid: fd.Fluid, eos: cb.CubicEOS = cb.PR, eps: float = 1e-5
+) -> tuple[float, float, np.ndarray]:
+    """Smallest Eigenvalue and Cubic Form of one Mole of the Feed
+
+    Args:
+        tabs (float): Absolute Temperature, rankine
+        vol (float): Molar Volume, ft3/lbmol
+        fluid (fd.Fluid): Compiled Mixture
+        eos (cb.CubicEOS): Equation of State, cubic.PR or cubic.SRK
+        eps (float): Step along dn for the cubic form
+
+    Returns:
+        lam (float): Smallest Eigenvalue of Q, zero on the spinodal
+        cubic (float): Cubic Form along the Eigenvector, zero at the critical point
+        dn_ray (np.ndarray): Mole Number Direction of the Eigenvector, sqrt(zi) ui
+    """
+    zi_ray = fluid.zi_ray
+    _, bi_ray, sqai_ray = fluid.ab_temp(tabs, eos)
+    aij_rt = np.outer(sqai_ray, sqai_ray) * fluid.kmat / (cb.rcon * tabs)
+    sqz = np.sqrt(zi_ray)
+
+    fij = helmholtz_hessian(zi_ray, vol, bi_ray, aij_rt, eos)
+    qmat = np.eye(zi_ray.size) + np.outer(sqz, sqz) * fij  # ideal part is delta_ij / ni
+    eigval, eigvec = np.linalg.eigh(qmat)
+    lam = float(eigval[0])
+    dn_ray = sqz * eigvec[:, 0]
+
+    # third derivatives along dn, ideal part is -dn^3 / n^2
+    fplus = helmholtz_hessian(zi_ray + eps * dn_ray, vol, bi_ray, aij_rt, eos)
+    fminus = helmholtz_hessian(zi_ray - eps * dn_ray, vol, bi_ray, aij_rt, eos)
+    cubic = float(dn_ray @ (fplus - fminus) @ dn_ray / (2 * eps) - np.sum(dn_ray**3 / zi_ray**2))
+    return lam, cubic, dn_ray
+
+
+def _spinodal_temp(tabs: float, vol: float, fluid: fd.Fluid, eos: cb.CubicEOS, maxiter: int) -> float:
+    """Temperature of a Zero Smallest Eigenvalue at a Molar Volume, secant from tabs"""
+    t0 = tabs
+    lam0, _, _ = critical_conditions(t0, vol, fluid, eos)
+    t1 = tabs * 1.02
+    for _ in range(maxiter):
+        lam1, _, _ = critical_conditions(t1, vol, fluid, eos)
+        if lam1 == lam0:
+            break
+        dt = -lam1 * (t1 - t0) / (lam1 - lam0)
+        dt = max(min(dt, 0.1 * t1), -0.1 * t1)  # keep the secant from leaving for negative temperatures
+        t0, lam0 = t1, lam1
+        t1 = t1 + dt
+        if abs(dt) < 1e-10 * t1:
+            break
+    return t1
+
+
+def critical_state(
+    fluid: fd.Fluid, eos: cb.CubicEOS = cb.PR, maxiter: int = 50
+) -> tuple[float, float, np.ndarray]:
+    """Critical Temperature, Volume and Composition Direction of a Mixture
+
+    Args:
+        fluid (fd.Fluid): Compiled Mixture
+        eos (cb.CubicEOS): Equation of State, cubic.PR or cubic.SRK
+        maxiter (int): Maximum Number of Iterations of each loop
+
+    Returns:
+        tabs (float): Critical Temperature, rankine, raises ValueError if none is found
+        vol (float): Critical Molar Volume, ft3/lbmol
+        dn_ray (np.ndarray): Mole Number Direction along which the phases split, sqrt(zi) ui
+    """
+    zi_ray = fluid.zi_ray
+    _, bi_ray, _ = fluid.ab_temp(float(fluid.tcrit_ray @ zi_ray), eos)
+    bmix = float(zi_ray @ bi_ray)  # b does not depend on temperature
+
+    def cubic_at(ratio: float, tabs: float) -> tuple[float, float]:
+        tabs = _spinodal_temp(tabs, ratio * bmix, fluid, eos, maxiter)
+        return critical_conditions(tabs, ratio * bmix, fluid, eos)[1], tabs
+
+    tabs = 1.5 * float(fluid.tcrit_ray @ zi_ray)
+    r0 = 4.0
+    c0, tabs = cubic_at(r0, tabs)
+    r1 = 3.5
+    for _ in range(maxiter):
+        c1, tabs = cubic_at(r1, tabs)
+        if c1 == c0:
+            break
+        dr = -c1 * (r1 - r0) / (c1 - c0)
+        dr = max(min(dr, 0.5), -0.5 * (r1 - 1))  # the volume has to stay above b
+        r0, c0 = r1, c1
+        r1 = r1 + dr
+        if abs(dr) < 1e-9 * r1:
+            break
+    else:
+        raise ValueError("Critical point did not converge")
+
+    vol = r1 * bmix
+    lam, cubic, dn_ray = critical_conditions(tabs, vol, fluid, eos)
+    if not (abs(lam) < 1e-6 and math.isfinite(cubic)) or r1 <= 1:
+        raise ValueError("Critical point did not converge")
+    return tabs, vol, dn_ray
+
+
+def critical_pressure(tabs: float, vol: float, fluid: fd.Fluid, eos: cb.CubicEOS = cb.PR) -> float:
+    """Equation of State Pressure of the Feed at a Temperature and Molar Volume
+
+    Args:
+        tabs (float): Absolute Temperature, rankine
+        vol (float): Molar Volume, ft3/lbmol
+        fluid (fd.Fluid): Compiled Mixture
+        eos (cb.CubicEOS): Equation of State, cubic.PR or cubic.SRK
+
+    Returns:
+        pabs (float): Absolute Pressure, psia
+    """
+    zi_ray = fluid.zi_ray
+    _, bi_ray, sqai_ray = fluid.ab_temp(tabs, eos)
+    zsqa = zi_ray * sqai_ray
+    amix = zsqa @ fluid.kmat @ zsqa
+    bmix = zi_ray @ bi_ray
+    return float(cb.rcon * tabs / (vol - bmix) - amix / ((vol + eos.delta1 * bmix) * (vol + eos.delta2 * bmix)))
+
+
+def critical_lnk(
+    tabs: float, vol: float, dn_ray: np.ndarray, fluid: fd.Fluid, scale: float, eos: cb.CubicEOS = cb.PR
+) -> np.ndarray:
+    """Log Equilibrium Ratios a Short Way down the Saturation Curve from the Critical Point
+
+    Next to the critical point the incipient phase has mole numbers z + s dn, once normalized that
+    makes ln K close to s (dn / z - sum(dn)). The guess is scaled so the largest ln K is scale, and
+    the sign is set so the light components have K above one, as the Wilson K values do.
+
+    Args:
+        tabs (float): Critical Temperature, rankine
+        vol (float): Critical Molar Volume, ft3/lbmol
+        dn_ray (np.ndarray): Mole Number Direction from critical_state
+        fluid (fd.Fluid): Compiled Mixture
+        scale (float): Largest ln K of the guess
+        eos (cb.CubicEOS): Equation of State, cubic.PR or cubic.SRK
+
+    Returns:
+        lnk (np.ndarray): Log of Equilibrium Ratios
+    """
+    wray = dn_ray / fluid.zi_ray - np.sum(dn_ray)
+    wray = wray / np.max(abs(wray))
+    lnk_wilson = np.log(fluid.wilson_ki(critical_pressure(tabs, vol, fluid, eos), tabs))
+    return scale * wray * math.copysign(1.0, wray @ lnk_wilson)
+
+
+def critical_point(
+    comp_dict: dict | fd.Fluid,
+    prop_dict: dict | None = None,
+    bini_dict: dict | None = None,
+    eos: cb.CubicEOS = cb.PR,
+    maxiter: int = 50,
+) -> tuple[float, float]:
+    """Cubic EOS Critical Point of a Mixture
+
+    Args:
+        comp_dict (dict | fd.Fluid): Mixture Molar Composition, or a compiled fluid.Fluid
+        prop_dict (dict): Property Table for Lookup, not needed with a Fluid
+        bini_dict (dict): Binary Interaction Table, not needed with a Fluid
+        eos (cb.CubicEOS): Equation of State, cubic.PR or cubic.SRK
+        maxiter (int): Maximum Number of Iterations of each loop
+
+    Returns:
+        pcrit (float): Critical Pressure, psig, raises ValueError if none is found
+        tcrit (float): Critical Temperature, deg F
+    """
+    fluid = fd.as_fluid(comp_dict, prop_dict, bini_dict)
+    tabs, vol, _ = critical_state(fluid, eos, maxiter)
+    return critical_pressure(tabs, vol, fluid, eos) - 14.7, tabs - 459.67
@@ -0,0 +1,141 @@
+"""Phase Envelope
+
+Trace the bubble and dew point curves of a mixture in one continuation run, Michelsen 1980.
+The bubble curve (beta = 0) is started at low pressure and followed up through the critical
+point, where the K values pass through one and the same curve continues down as the dew curve.
+Each new point is started from a linear extrapolation along the curve, so the Newton solve
+only needs a few iterations. The "crit" point is solved for exactly with critical.critical_state
+when the curve passes it, the interpolation between the two points on either side can be off by
+tens of psi on a flat envelope top.
+"""
+
+import math
+
+import numpy as np
+
+import critical as cr
+import eos.cubic as cb
+import fluid as fd
+import saturation as sat
+
+
+def phase_envelope(
+    comp_dict: dict | fd.Fluid,
+    prop_dict: dict | None = None,
+    bini_dict: dict | None = None,
+    pmin: float = 5.0,
+    maxpts: int = 300,
+    eos: cb.CubicEOS = cb.PR,
+) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Cubic EOS Phase Envelope
+
+    March along the saturation curve from the low pressure bubble point, through the critical
+    point and down the dew curve until the pressure drops back below pmin. The step size grows
+    when the Newton solve converges quickly and shrinks when it struggles. The specified variable
+    is switched to whichever of ln K, ln T or ln P is changing the fastest, so the cricondenbar,
+    cricondentherm and critical point are passed without trouble.
+
+    Args:
+        comp_dict (dict | fd.Fluid): Mixture Molar Composition, or a compiled fluid.Fluid
+        prop_dict (dict): Property Table for Lookup, not needed with a Fluid
+        bini_dict (dict): Binary Interaction Table, not needed with a Fluid
+        pmin (float): Starting and Ending Pressure, psig
+        maxpts (int): Maximum Number of Points on the Envelope
+        eos (cb.CubicEOS): Equation of State, cubic.PR or cubic.SRK
+
+    Returns:
+        pres (np.ndarray): Saturation Pressures, psig
+        temp (np.ndarray): Saturation Temperatures, deg F
+        desc (np.ndarray): Saturation Type, "bub", "crit" or "dew"
+    """
+    fluid = fd.as_fluid(comp_dict, prop_dict, bini_dict)
+    comp_list = fluid.comp_list
+    prop_dict = fluid.prop_dict
+    zi_ray = fluid.zi_ray
+    kmat = fluid.kmat
+    nc = zi_ray.size
+    beta = 0.0  # the feed is the liquid the whole way, the vapor is the incipient phase
+
+    pabs = pmin + 14.7
+    tabs = fluid.wilson_temp(pabs, beta)
+    lnk = np.log(fluid.wilson_ki(pabs, tabs))
+    X = np.concatenate((lnk, [math.log(tabs), math.log(pabs)]))
+
+    spec = nc + 1  # start with pressure specified
+    X, jac, _ = sat.sat_newton(X, spec, X[spec], zi_ray, beta, comp_list, prop_dict, kmat, eos=eos)
+
+    kref = int(np.argmax(abs(X[:nc])))  # ln K of this component changes sign at the critical point
+    points = [X]
+    labels = ["bub"]
+    label = "bub"
+
+    dS = 0.1  # first step, in ln P
+    dmax_k = 1.0  # largest extrapolated change in any ln K
+    dmax_tp = 0.2  # largest extrapolated change in ln T or ln P
+
+    while len(points) < maxpts:
+        # sensitivity of every variable to the specified one, dX/dS
+        rhs = np.zeros(nc + 2)
+        rhs[-1] = 1
+        sens = np.linalg.solve(jac, rhs)
+        dX = sens * dS
+
+        # specify whichever variable moves the most, near the critical point that has to be a ln K
+        spec = int(np.argmax(abs(dX)))
+        if np.max(abs(X[:nc])) < 0.5:
+            spec = int(np.argmax(abs(dX[:nc])))
+
+        scale = min(1.0, dmax_k / max(np.max(abs(dX[:nc])), 1e-12), dmax_tp / max(np.max(abs(dX[nc:])), 1e-12))
+        dX *= scale
+
+        # step across the critical point instead of landing on the trivial solution
+        if spec < nc and abs(X[spec] + dX[spec]) < 0.05 and X[spec] * dX[spec] < 0:
+            dX *= -2 * X[spec] / dX[spec]
+
+        for _ in range(8):
+            Xguess = X + dX
+            try:
+                Xnew, jac_new, niter = sat.sat_newton(
+                    Xguess, spec, Xguess[spec], zi_ray, beta, comp_list, prop_dict, kmat, maxiter=8, eos=eos
+                )
+            except (ValueError, np.linalg.LinAlgError):
+                dX /= 2
+                continue
+            if np.max(abs(Xnew[:nc])) > 1e-3:  # not the trivial solution
+                break
+            dX /= 2
+        else:
+            break  # could not take another step, return what has been traced
+
+        if Xnew[kref] * X[kref] < 0:  # passed through the critical point
+            frac = X[kref] / (X[kref] - Xnew[kref])
+            points.append(_critical_point(X + frac * (Xnew - X), fluid, eos))
+            labels.append("crit")
+            label = "dew"
+
+        dS = dX[spec] * (1.5 if niter <= 3 else 0.7 if niter >= 5 else 1.0)
+        X, jac = Xnew, jac_new
+        points.append(X)
+        labels.append(label)
+
+        if label == "dew" and math.exp(X[nc + 1]) < pabs:
+            break
+
+    points = np.array(points)
+    pres = np.exp(points[:, nc + 1]) - 14.7
+    temp = np.exp(points[:, nc]) - 459.67
+    desc = np.array(labels)
+    return pres, temp, desc
+
+
+def _critical_point(Xint: np.ndarray, fluid: fd.Fluid, eos: cb.CubicEOS) -> np.ndarray:
+    """Critical Point in the Envelope Variables, the interpolated Xint if it is not solved near it"""
+    nc = fluid.zi_ray.size
+    try:
+        tabs, vol, _ = cr.critical_state(fluid, eos)
+        pabs = cr.critical_pressure(tabs, vol, fluid, eos)
+    except (ValueError, np.linalg.LinAlgError):
+        return Xint
+    if pabs <= 0 or abs(math.log(tabs) - Xint[nc]) > 0.05 or abs(math.log(pabs) - Xint[nc + 1]) > 0.2:
+        return Xint  # a different critical point than the one the curve went through
+    return np.concatenate((np.zeros(nc), [math.log(tabs), math.log(pabs)]))
@@ -0,0 +1,590 @@
+"""Generic Cubic Equation of State
+
+Two parameter cubic equations of state share one form, Michelsen 2008 Chapter 3,
+
+    P = R T / (V - b) - a / ((V + delta1 b) (V + delta2 b))
+
+with a = omega_a alpha R^2 Tc^2 / Pc, b = omega_b R Tc / Pc and
+alpha = (1 + m(w) (1 - sqrt(Tr)))^2. Peng Robinson and Soave-Redlich-Kwong only differ in the
+constants (omega_a, omega_b, delta1, delta2) and in m(w). The Z factor, fugacity and K value
+kernels here take the equation of state as a parameter, so every solver runs the same code
+for either model.
+"""
+
+import math
+from collections import OrderedDict
+
+import numpy as np
+
+import eos.mixing_rules as mr
+import num_methods as nm
+import proptables.crit_vals as ct
+import telemetry as tm
+
+rcon = 10.731  # psia-ft3/(lbmol-R)
+
+_ab_cache = OrderedDict()  # (eos name, tabs, component tuple, id of prop_dict) -> (prop_dict, ai, bi, sqai, dsqai)
+_ab_cache_size = 128  # max number of temperature and component sets to keep
+
+
+def mi_pengrob(acc: np.ndarray) -> np.ndarray:
+    """Peng Robinson m Factor, with the Robinson 1978 correction for heavy components
+
+    Args:
+        acc (np.ndarray): Accentric Factors, unitless
+
+    Returns:
+        mi (np.ndarray): Peng Robinson mi
+    """
+    return np.where(
+        acc < 0.49,
+        0.37464 + 1.54226 * acc - 0.26922 * acc**2,
+        0.3796 + 1.485 * acc - 0.1644 * acc**2 + 0.01667 * acc * 3,
+    )
+
+
+def mi_srk(acc: np.ndarray) -> np.ndarray:
+    """Soave-Redlich-Kwong m Factor
+
+    Args:
+        acc (np.ndarray): Accentric Factors, unitless
+
+    Returns:
+        mi (np.ndarray): SRK mi
+    """
+    return 0.48 + 1.574 * acc - 0.176 * acc**2
+
+
+class CubicEOS:
+    def __init__(self, name: str, omega_a: float, omega_b: float, delta1: float, delta2: float, mi_func):
+        """Constants of a Two Parameter Cubic Equation of State
+
+        Args:
+            name (str): Short Name, also used in cache keys
+            omega_a (float): Constant of the a parameter
+            omega_b (float): Constant of the b parameter
+            delta1 (float): First Volume Constant of the attractive term
+            delta2 (float): Second Volume Constant of the attractive term
+            mi_func (function): m(w), takes an array of accentric factors
+        """
+        self.name = name
+        self.omega_a = omega_a
+        self.omega_b = omega_b
+        self.delta1 = delta1
+        self.delta2 = delta2
+        self.mi_func = mi_func
+        self.usum = delta1 + delta2  # coefficients of the Z cubic
+        self.wprod = delta1 * delta2
+
+    def __repr__(self):
+        return f"Cubic EOS: {self.name}, delta1: {self.delta1:.4f}, delta2: {self.delta2:.4f}"
+
+
+PR = CubicEOS("pr", 0.45724, 0.0778, 1 + math.sqrt(2), 1 - math.sqrt(2), mi_pengrob)
+SRK = CubicEOS("srk", 0.42747, 0.08664, 1.0, 0.0, mi_srk)
+
+
+def crit_rays(comp_list: list, prop_dict: dict) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Critical Property Arrays of the Components
+
+    Args:
+        comp_list (list): Feed Components, string of values
+        prop_dict (dict): Critical Property Lookup Dictionary or crit_vals.PropTable
+
+    Returns:
+        pcrit (np.ndarray): Critical Pressures, psia
+        tcrit (np.ndarray): Critical Temperatures, rankine
+        acc (np.ndarray): Accentric Factors, unitless
+    """
+    rows = ct.gather_props(comp_list, prop_dict)
+    return np.ascontiguousarray(rows["pcrit"]), np.ascontiguousarray(rows["tcrit"]), np.ascontiguousarray(rows["acent"])
+
+
+def cubic_ab_temp(
+    tabs: np.ndarray, comp_list: list, prop_dict: dict, eos: CubicEOS = PR
+) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Component a and b Arrays over Temperatures
+
+    Pass tabs as a column, shape (m, 1), to get an (m, n) array of a values for m temperatures.
+
+    Args:
+        tabs (np.ndarray): Absolute Temperatures, Rankine
+        comp_list (list): Feed Components, string of values
+        prop_dict (dict): Critical Property Lookup Dictionary
+        eos (CubicEOS): Equation of State, PR or SRK
+
+    Returns:
+        ai_ray (np.ndarray): a values, psia-ft6/(lbmol2)
+        bi_ray (np.ndarray): b values, ft3/lbmol
+        sqai_ray (np.ndarray): Square root of a values
+    """
+    return cubic_ab_crit(tabs, *crit_rays(comp_list, prop_dict), eos)
+
+
+def cubic_ab_crit(
+    tabs: np.ndarray, pcrit: np.ndarray, tcrit: np.ndarray, acc: np.ndarray, eos: CubicEOS = PR
+) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Component a and b Arrays from Critical Property Arrays
+
+    Same as cubic_ab_temp for callers that already hold the arrays, such as fluid.Fluid.
+
+    Args:
+        tabs (np.ndarray): Absolute Temperatures, Rankine
+        pcrit (np.ndarray): Critical Pressures, psia
+        tcrit (np.ndarray): Critical Temperatures, rankine
+        acc (np.ndarray): Accentric Factors, unitless
+        eos (CubicEOS): Equation of State, PR or SRK
+
+    Returns:
+        ai_ray (np.ndarray): a values, psia-ft6/(lbmol2)
+        bi_ray (np.ndarray): b values, ft3/lbmol
+        sqai_ray (np.ndarray): Square root of a values
+    """
+    alpha = (1 + eos.mi_func(acc) * (1 - np.sqrt(tabs / tcrit))) ** 2
+    ai_ray = eos.omega_a * alpha * rcon**2 * tcrit**2 / pcrit
+    bi_ray = eos.omega_b * rcon * tcrit / pcrit
+    sqai_ray = np.sqrt(ai_ray)
+    return ai_ray, bi_ray, sqai_ray
+
+
+def cubic_ab_cache(
+    tabs: float, comp_list: list, prop_dict: dict, eos: CubicEOS = PR
+) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Component a and b Arrays, Cached
+
+    Read only arrays stored by equation of state, temperature and component set. An isothermal
+    solve only calculates them once. The least recently used entries are dropped once more
+    than _ab_cache_size sets are stored.
+
+    Args:
+        tabs (float): Absolute Temperature, Rankine
+        comp_list (list): Feed Components, string of values
+        prop_dict (dict): Critical Property Lookup Dictionary
+        eos (CubicEOS): Equation of State, PR or SRK
+
+    Returns:
+        ai_ray (np.ndarray): a values for each component, psia-ft6/(lbmol2)
+        bi_ray (np.ndarray): b values for each component, ft3/lbmol
+        sqai_ray (np.ndarray): Square root of a values for each component
+    """
+    hit = _ab_entry(tabs, comp_list, prop_dict, eos)
+    return hit[1], hit[2], hit[3]
+
+
+def cubic_dsqai_cache(tabs: float, comp_list: list, prop_dict: dict, eos: CubicEOS = PR) -> np.ndarray:
+    """Temperature Derivative of the Square Root of the a Values, Cached
+
+    Stored next to the cubic_ab_cache arrays, so a Newton solve at a fixed temperature
+    does not read the property table again.
+
+    Args:
+        tabs (float): Absolute Temperature, Rankine
+        comp_list (list): Feed Components, string of values
+        prop_dict (dict): Critical Property Lookup Dictionary
+        eos (CubicEOS): Equation of State, PR or SRK
+
+    Returns:
+        dsqai_ray (np.ndarray): d sqrt(ai) / dT, sqrt(psia)-ft3/(lbmol-R)
+    """
+    return _ab_entry(tabs, comp_list, prop_dict, eos)[4]
+
+
+def _ab_entry(tabs: float, comp_list: list, prop_dict: dict, eos: CubicEOS) -> tuple:
+    key = (eos.name, float(tabs), tuple(comp_list), id(prop_dict))
+    hit = _ab_cache.get(key)
+    if hit is not None and hit[0] is prop_dict:
+        _ab_cache.move_to_end(key)
+        return hit
+
+    crits = crit_rays(comp_list, prop_dict)
+    rays = (*cubic_ab_crit(tabs, *crits, eos), cubic_dsqai_crit(tabs, *crits, eos))
+    for ray in rays:
+        ray.setflags(write=False)
+
+    hit = (prop_dict, *rays)
+    _ab_cache[key] = hit
+    if len(_ab_cache) > _ab_cache_size:
+        _ab_cache.popitem(last=False)
+    return hit
+
+
+def cubic_dsqai_temp(tabs: np.ndarray, comp_list: list, prop_dict: dict, eos: CubicEOS = PR) -> np.ndarray:
+    """Temperature Derivative of the Square Root of the Component a Values
+
+    sqrt(ai) = sqrt(omega_a R^2 Tc^2 / Pc) (1 + m (1 - sqrt(T / Tc))), so the derivative
+    is -sqrt(omega_a R^2 Tc^2 / Pc) m / (2 sqrt(T Tc)). Same shapes as cubic_ab_temp.
+
+    Args:
+        tabs (np.ndarray): Absolute Temperatures, Rankine
+        comp_list (list): Feed Components, string of values
+        prop_dict (dict): Critical Property Lookup Dictionary
+        eos (CubicEOS): Equation of State, PR or SRK
+
+    Returns:
+        dsqai_ray (np.ndarray): d sqrt(ai) / dT, sqrt(psia)-ft3/(lbmol-R)
+    """
+    return cubic_dsqai_crit(tabs, *crit_rays(comp_list, prop_dict), eos)
+
+
+def cubic_dsqai_crit(
+    tabs: np.ndarray, pcrit: np.ndarray, tcrit: np.ndarray, acc: np.ndarray, eos: CubicEOS = PR
+) -> np.ndarray:
+    """Temperature Derivative of the Square Root of the a Values from Critical Property Arrays
+
+    Args:
+        tabs (np.ndarray): Absolute Temperatures, Rankine
+        pcrit (np.ndarray): Critical Pressures, psia
+        tcrit (np.ndarray): Critical Temperatures, rankine
+        acc (np.ndarray): Accentric Factors, unitless
+        eos (CubicEOS): Equation of State, PR or SRK
+
+    Returns:
+        dsqai_ray (np.ndarray): d sqrt(ai) / dT, sqrt(psia)-ft3/(lbmol-R)
+    """
+    sqac = np.sqrt(eos.omega_a * rcon**2 * tcrit**2 / pcrit)
+    return -sqac * eos.mi_func(acc) / (2 * np.sqrt(tabs * tcrit))
+
+
+def cubic_zroots(A: np.ndarray, B: np.ndarray, eos: CubicEOS = PR) -> tuple[np.ndarray, np.ndarray]:
+    """Liquid and Vapor Z Factors
+
+    Solve Z^3 + (u B - B - 1) Z^2 + (A + w B^2 - u B - u B^2) Z - (A B + w B^2 + w B^3) = 0
+    for any number of (A, B) pairs at once, u = delta1 + delta2 and w = delta1 * delta2.
+    The liquid root is the smallest root above B, the vapor root is the largest.
+    If only one real root exists, both are the same value.
+
+    Args:
+        A (np.ndarray): Mixture A
+        B (np.ndarray): Mixture B
+        eos (CubicEOS): Equation of State, PR or SRK
+
+    Return:
+        zliq (np.ndarray): Liquid Like Z Factors
+        zvap (np.ndarray): Vapor Like Z Factors
+    """
+    rec = tm.active.get()
+    if rec is not None:
+        rec.count("cubic_zroots")
+    u = eos.usum
+    w = eos.wprod
+    c2 = (u - 1) * B - 1
+    c1 = A + w * B**2 - u * B - u * B**2
+    c0 = -(A * B + w * B**2 + w * B**3)
+    zmin, zmax = nm.cubic_roots(c2, c1, c0)
+    zliq = np.where(zmin > B, zmin, zmax)  # roots below B are not physical
+    return zliq, zmax
+
+
+def cubic_lnphi(
+    pabs: np.ndarray,
+    tabs: np.ndarray,
+    zi_ray: np.ndarray,
+    ai_ray: np.ndarray,
+    bi_ray: np.ndarray,
+    sqai_ray: np.ndarray,
+    kmat: np.ndarray,
+    vapor: bool | None,
+    eos: CubicEOS = PR,
+) -> tuple[np.ndarray, np.ndarray]:
+    """Log Fugacity Coefficients, Vectorized
+
+    Log fugacity coefficients for one phase at any number of states in one pass.
+    For m states pabs and tabs are shape (m,) and zi_ray is shape (m, n). The component
+    arrays are either shape (n,) for one temperature or (m, n) from cubic_ab_temp.
+
+    Args:
+        pabs (np.ndarray): Absolute Evaluation Pressure, psia
+        tabs (np.ndarray): Absolute Evaluation Temp, rankine
+        zi_ray (np.ndarray): Molar Fractions of Evaluated Phase
+        ai_ray (np.ndarray): a values, psia-ft6/(lbmol2)
+        bi_ray (np.ndarray): b values, ft3/lbmol
+        sqai_ray (np.ndarray): Square root of a values
+        kmat (np.ndarray): Matrix of (1 - kij) from mixing_rules.bini_matrix
+        vapor (bool | None): True - Evaluate Vapor, False Evaluate Liquid, None - Lowest Gibbs Energy Root
+        eos (CubicEOS): Equation of State, PR or SRK
+
+    Returns:
+        lnphi (np.ndarray): Log of Fugacity Coefficients
+        zfac (np.ndarray): Z Factor of the Phase
+    """
+    rec = tm.active.get()
+    if rec is not None:
+        rec.count("cubic_lnphi")
+    pabs = np.asarray(pabs, dtype=float)
+    tabs = np.asarray(tabs, dtype=float)
+
+    zsqa = zi_ray * sqai_ray
+    fugj = zsqa @ kmat.T  # j summations, same as mixing_rules.mix_a_ray for every state
+    amix = (zsqa * fugj).sum(axis=-1)
+    bmix = (zi_ray * bi_ray).sum(axis=-1)
+
+    Amix = amix * pabs / (rcon**2 * tabs**2)
+    Bmix = bmix * pabs / (rcon * tabs)
+    zfac = cubic_zphase(Amix, Bmix, vapor, eos)
+    lnphi = cubic_lnphi_root(zfac, Amix, Bmix, amix, bmix, bi_ray, sqai_ray, fugj, eos)
+    return lnphi, zfac
+
+
+def cubic_gibbs(zfac: np.ndarray, A: np.ndarray, B: np.ndarray, eos: CubicEOS = PR) -> np.ndarray:
+    """Reduced Residual Gibbs Energy of the Mixture at a Root
+
+    G / (n R T) = Z - 1 - ln(Z - B) - A / (B (delta1 - delta2)) ln((Z + delta1 B) / (Z + delta2 B)),
+    which is sum(zi ln phi_i), so comparing roots does not need the component values.
+
+    Args:
+        zfac (np.ndarray): Z Factor of the Root
+        A (np.ndarray): Mixture A
+        B (np.ndarray): Mixture B
+        eos (CubicEOS): Equation of State, PR or SRK
+
+    Returns:
+        gres (np.ndarray): Reduced Residual Gibbs Energy
+    """
+    fugend = np.log((zfac + eos.delta1 * B) / (zfac + eos.delta2 * B))
+    return zfac - 1 - np.log(zfac - B) - A / ((eos.delta1 - eos.delta2) * B) * fugend
+
+
+def cubic_zphase(A: np.ndarray, B: np.ndarray, vapor: bool | None, eos: CubicEOS = PR) -> np.ndarray:
+    """Z Factor of the Evaluated Phase
+
+    Args:
+        A (np.ndarray): Mixture A
+        B (np.ndarray): Mixture B
+        vapor (bool | None): True - Vapor Root, False - Liquid Root, None - Lowest Gibbs Energy Root
+        eos (CubicEOS): Equation of State, PR or SRK
+
+    Returns:
+        zfac (np.ndarray): Z Factor of the Phase
+    """
+    zliq, zvap = cubic_zroots(A, B, eos)
+    if vapor is None:  # keep the root with the lowest gibbs energy
+        return np.where(cubic_gibbs(zvap, A, B, eos) < cubic_gibbs(zliq, A, B, eos), zvap, zliq)
+    return zvap if vapor else zliq
+
+
+def cubic_lnphi_root(
+    zfac: np.ndarray,
+    A: np.ndarray,
+    B: np.ndarray,
+    amix: np.ndarray,
+    bmix: np.ndarray,
+    bi_ray: np.ndarray,
+    sqai_ray: np.ndarray,
+    fugj: np.ndarray,
+    eos: CubicEOS = PR,
+) -> np.ndarray:
+    """Log Fugacity Coefficients at a Chosen Root
+
+    ln phi_i = bi / b (Z - 1) - ln(Z - B)
+               - A / (B (delta1 - delta2)) (2 sum_j(zj aij) / a - bi / b) ln((Z + delta1 B) / (Z + delta2 B))
+
+    The mixture values have no component axis, the terms built from them get one just before they
+    meet the component arrays, so a single state runs on numpy scalars.
+
+    Args:
+        zfac (np.ndarray): Z Factor of the Phase
+        A (np.ndarray): Mixture A
+        B (np.ndarray): Mixture B
+        amix (np.ndarray): Mixture a
+        bmix (np.ndarray): Mixture b
+        bi_ray (np.ndarray): b values, ft3/lbmol
+        sqai_ray (np.ndarray): Square root of a values
+        fugj (np.ndarray): j Component Summations from mixing_rules.mix_a_ray
+        eos (CubicEOS): Equation of State, PR or SRK
+
+    Returns:
+        lnphi (np.ndarray): Log of Fugacity Coefficients
+    """
+    fugend = np.log((zfac + eos.delta1 * B) / (zfac + eos.delta2 * B))
+    coef = A / ((eos.delta1 - eos.delta2) * B) * fugend
+    lnphi = (
+        (-np.log(zfac - B))[..., None]
+        + ((zfac - 1) / bmix)[..., None] * bi_ray  # noqa: W503
+        - coef[..., None] * (2 * sqai_ray * fugj / amix[..., None] - (bi_ray / bmix[..., None]))  # noqa: W503
+    )
+    return lnphi
+
+
+def cubic_lnphi_derivs(
+    pabs: np.ndarray,
+    tabs: np.ndarray,
+    ni_ray: np.ndarray,
+    ai_ray: np.ndarray,
+    bi_ray: np.ndarray,
+    sqai_ray: np.ndarray,
+    kmat: np.ndarray,
+    vapor: bool | None,
+    eos: CubicEOS = PR,
+    dsqai_ray: np.ndarray | None = None,
+    moles: bool = True,
+) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray | None, np.ndarray | None]:
+    """Log Fugacity Coefficients and their Analytic Derivatives
+
+    Derivatives of ln phi in pressure, temperature and mole numbers from the reduced residual
+    Helmholtz energy F(n, T, V) = -n g - D(T) / T f, Michelsen and Mollerup 2007 Chapter 3, where
+    g = ln(1 - B / V), f = ln((V + delta1 B) / (V + delta2 B)) / (R B (delta1 - delta2)),
+    B = sum(ni bi) and D = sum(ni nj aij). The phase is picked the same way as cubic_lnphi.
+    Same shapes as cubic_lnphi, with an extra trailing component axis on dlnphi_dn.
+
+    Args:
+        pabs (np.ndarray): Absolute Evaluation Pressure, psia
+        tabs (np.ndarray): Absolute Evaluation Temp, rankine
+        ni_ray (np.ndarray): Mole Numbers of the Evaluated Phase, need not sum to one
+        ai_ray (np.ndarray): a values, psia-ft6/(lbmol2)
+        bi_ray (np.ndarray): b values, ft3/lbmol
+        sqai_ray (np.ndarray): Square root of a values
+        kmat (np.ndarray): Matrix of (1 - kij) from mixing_rules.bini_matrix
+        vapor (bool | None): True - Evaluate Vapor, False Evaluate Liquid, None - Lowest Gibbs Energy Root
+        eos (CubicEOS): Equation of State, PR or SRK
+        dsqai_ray (np.ndarray): d sqrt(ai) / dT from cubic_dsqai_temp, None skips the temperature derivative
+        moles (bool): False skips the mole number derivative, the most expensive part
+
+    Returns:
+        lnphi (np.ndarray): Log of Fugacity Coefficients
+        zfac (np.ndarray): Z Factor of the Phase
+        dlnphi_dp (np.ndarray): d ln phi_i / dP, 1/psia
+        dlnphi_dt (np.ndarray | None): d ln phi_i / dT, 1/rankine, None without dsqai_ray
+        dlnphi_dn (np.ndarray | None): d ln phi_i / d nj, 1/lbmol, None if moles is False
+    """
+    rec = tm.active.get()
+    if rec is not None:
+        rec.count("cubic_lnphi")  # one ln phi evaluation, same as a cubic_lnphi call
+    ntot = ni_ray.sum(axis=-1)
+    zi_ray = ni_ray / ntot[..., None]
+    pabs = np.asarray(pabs, dtype=float)
+    tabs = np.asarray(tabs, dtype=float)
+
+    # everything below is for one mole of the phase, the mole number derivative is scaled at the end
+    # the mixture values keep no component axis, for one state they stay numpy scalars, which are
+    # several times cheaper than arrays of one, and get a trailing axis where they meet the components
+    zsqa = zi_ray * sqai_ray
+    fugj = zsqa @ kmat.T
+    di_ray = 2 * sqai_ray * fugj  # dD / dni
+    dmix = (zsqa * fugj).sum(axis=-1)
+    bmix = (zi_ray * bi_ray).sum(axis=-1)
+    rt = rcon * tabs
+    zfac = cubic_zphase(dmix * pabs / (rcon**2 * tabs**2), bmix * pabs / (rcon * tabs), vapor, eos)
+    vol = zfac * rt / pabs
+
+    vmb = vol - bmix
+    vb1 = vol + eos.delta1 * bmix
+    vb2 = vol + eos.delta2 * bmix
+    g_v = bmix / (vol * vmb)
+    g_b = -1 / vmb
+    g_vv = 1 / vol**2 - 1 / vmb**2
+    g_bv = 1 / vmb**2
+    f = np.log(vb1 / vb2) / (rcon * bmix * (eos.delta1 - eos.delta2))
+    f_v = -1 / (rcon * vb1 * vb2)
+    f_b = -(f + vol * f_v) / bmix
+    f_vv = (vb1 + vb2) / (rcon * vb1**2 * vb2**2)
+    f_bv = -(2 * f_v + vol * f_vv) / bmix
+
+    cap_d = dmix / tabs
+    F_d = -f / tabs
+    F_vv = -g_vv - cap_d * f_vv
+    F_iv = -g_v[..., None] + (-g_bv - cap_d * f_bv)[..., None] * bi_ray - (f_v / tabs)[..., None] * di_ray
+
+    # ln phi_i = dF / dni - ln Z, with dF / dni = -g + dF / dB bi + dF / dD dD / dni and -g - ln Z = -ln(Z - B)
+    F_b = 1 / vmb - cap_d * f_b
+    lnphi = (-np.log(vmb * pabs / rt))[..., None] + F_b[..., None] * bi_ray + F_d[..., None] * di_ray
+    dpdv = -rt * (F_vv + 1 / vol**2)
+    dpdn = rt[..., None] * ((1 / vol)[..., None] - F_iv)
+    dvdn = -dpdn / dpdv[..., None]
+    dlnphi_dp = dvdn / rt[..., None] - (1 / pabs)[..., None]
+
+    dlnphi_dn = None
+    if moles:
+        f_bb = -(2 * f_b + vol * f_bv) / bmix
+        F_nb = -g_b
+        F_bb = g_bv - cap_d * f_bb  # g_bb is -g_bv
+        F_bd = -f_b / tabs
+        bi_col = bi_ray[..., None]
+        bi_row = bi_ray[..., None, :]
+        di_col = di_ray[..., None]
+        di_row = di_ray[..., None, :]
+        aij = sqai_ray[..., None] * sqai_ray[..., None, :] * kmat
+        F_ij = (
+            F_nb[..., None, None] * (bi_col + bi_row)
+            + F_bd[..., None, None] * (bi_col * di_row + bi_row * di_col)  # noqa: W503
+            + F_bb[..., None, None] * bi_col * bi_row  # noqa: W503
+            + (2 * F_d)[..., None, None] * aij  # noqa: W503
+        )
+        dlnphi_dn = F_ij + 1 + dpdn[..., None] * dpdn[..., None, :] / (rt * dpdv)[..., None, None]
+        dlnphi_dn = dlnphi_dn / ntot[..., None, None]
+
+    dlnphi_dt = None
+    if dsqai_ray is not None:
+        dit_ray = 2 * (sqai_ray * ((zi_ray * dsqai_ray) @ kmat.T) + dsqai_ray * fugj)  # d(dD / dni) / dT
+        dmix_t = (zi_ray * dit_ray).sum(axis=-1) / 2
+        dcap_d = dmix / tabs**2 - dmix_t / tabs
+        F_it = (f_b * dcap_d)[..., None] * bi_ray + (f / tabs**2)[..., None] * di_ray + F_d[..., None] * dit_ray
+        dpdt = pabs / tabs - rt * f_v * dcap_d
+        dlnphi_dt = F_it + (1 / tabs)[..., None] - dvdn * (dpdt / rt)[..., None]
+
+    return lnphi, zfac, dlnphi_dp, dlnphi_dt, dlnphi_dn
+
+
+def cubic_fugco_list(
+    pabs: float,
+    tabs: float,
+    comp_list: list,
+    zi_list: list,
+    prop_dict: dict,
+    bini_dict: dict,
+    vapor: bool,
+    eos: CubicEOS = PR,
+) -> np.ndarray:
+    """Fugacity Coefficients of a Liquid or Vapor
+
+    Args:
+        pabs (float): Absolute Evaluation Pressure, psia
+        tabs (float): Absolute Evaluation Temp, rankine
+        comp_list (list): List of String Components
+        zi_list (list): Molar Fractions of Evaluated Mixture
+        prop_dict (dict): Properties Dictionary
+        bini_dict (dict): Binary Interaction Parameter Dictionary
+        vapor (bool): True - Evaluate Vapor, False Evaluate Liquid
+        eos (CubicEOS): Equation of State, PR or SRK
+
+    Returns:
+        phi_ray (np.ndarray): Fugacity Coefficients for specified phase
+    """
+    rec = tm.active.get()
+    if rec is not None:
+        rec.count("cubic_fugco_list")
+    ai_ray, bi_ray, sqai_ray = cubic_ab_cache(tabs, comp_list, prop_dict, eos)
+    kmat = mr.bini_matrix(comp_list, bini_dict)
+    zi_ray = np.asarray(zi_list, dtype=float)
+
+    lnphi, _ = cubic_lnphi(pabs, tabs, zi_ray, ai_ray, bi_ray, sqai_ray, kmat, vapor, eos)
+    return np.exp(lnphi)
+
+
+def cubic_ki_list(
+    pabs: float,
+    tabs: float,
+    ci_list: list,
+    xi_list: list,
+    yi_list: list,
+    prop_dict: dict,
+    bini_dict: dict,
+    eos: CubicEOS = PR,
+) -> np.ndarray:
+    """Equilibrium Constants, fugacity coefficient of the liquid over the vapor
+
+    Args:
+        pabs (float): Absolute Evaluation Pressure, psia
+        tabs (float): Absolute Evaluation Temp, rankine
+        ci_list (list): List of String Components
+        xi_list (list): Liquid Phase Molar Fractions
+        yi_list (list): Vapor Phase Molar Fractions
+        prop_dict (dict): Properties Dictionary
+        bini_dict (dict): Binary Interaction Parameter Dictionary
+        eos (CubicEOS): Equation of State, PR or SRK
+
+    Returns:
+        ki_ray (np.ndarray): Equilibrium Constants
+    """
+    phi_vap_ray = cubic_fugco_list(pabs, tabs, ci_list, yi_list, prop_dict, bini_dict, True, eos)
+    phi_liq_ray = cubic_fugco_list(pabs, tabs, ci_list, xi_list, prop_dict, bini_dict, False, eos)
+    return phi_liq_ray / phi_vap_ray
@@ -9,6 +9,8 @@ import math
 
 import numpy as np
 
+import eos.cubic as cb
+
 
 def whit_pk(mw_c7_plus: float) -> float:
     """Whitson Torp Pk
@@ -96,6 +98,44 @@ def wilson_ki_list(pabs: float, tabs: float, ci_list: list, zi_list: list, prop_
     return ki_list
 
 
+def wilson_ki_ray(pabs: np.ndarray, tabs: np.ndarray, comp_list: list, prop_dict: dict) -> np.ndarray:
+    """Wilson Equilibrium Constants, Vectorized
+
+    Wilson equilibrium constants for many pressures and temperatures at once.
+    Pass pabs and tabs as columns, shape (m, 1), to get an (m, n) array.
+
+    Args:
+        pabs (np.ndarray): Absolute Evaluation Pressures, psia
+        tabs (np.ndarray): Absolute Evaluation Temps, rankine
+        comp_list (list): List of String Components
+        prop_dict (dict): Properties Dictionary
+
+    Returns:
+        ki_ray (np.ndarray): Wilson Equilibrium Constants
+    """
+    pcrit, tcrit, acc = cb.crit_rays(comp_list, prop_dict)
+    return wilson_ki_crit(pabs, tabs, pcrit, tcrit, acc)
+
+
+def wilson_ki_crit(
+    pabs: np.ndarray, tabs: np.ndarray, pcrit: np.ndarray, tcrit: np.ndarray, acc: np.ndarray
+) -> np.ndarray:
+    """Wilson Equilibrium Constants from Critical Property Arrays
+
+    Args:
+        pabs (np.ndarray): Absolute Evaluation Pressures, psia
+        tabs (np.ndarray): Absolute Evaluation Temps, rankine
+        pcrit (np.ndarray): Critical Pressures, psia
+        tcrit (np.ndarray): Critical Temperatures, rankine
+        acc (np.ndarray): Accentric Factors, unitless
+
+    Returns:
+        ki_ray (np.ndarray): Wilson Equilibrium Constants
+    """
+    ki_ray = np.exp(np.log(pcrit / pabs) + 5.373 * (1 + acc) * (1 - (tcrit / tabs)))
+    return ki_ray
+
+
 def safran_cfifteen(tabs: float, zi: float, pcrit: float, tcrit: float, acc: float) -> float:
     """Equation C-15 from Al-Safran Multiphase Flow
 
@@ -172,3 +212,67 @@ def dewpoint_guess(tabs: float, comp_dict: dict, prop_dict: dict) -> float:
         pdi = safran_ceighteen(tabs, zi, prop_dict[ci].pcrit, prop_dict[ci].tcrit, prop_dict[ci].acent)
         plist.append(pdi)
     return 1 / sum(plist)
+
+
+def wilson_bubble_temp(pabs: float, comp_list: list, zi_ray: np.ndarray, prop_dict: dict) -> float:
+    """Wilson Bubble Point Temperature
+
+    Temperature where the Wilson K values give sum(zi * Ki) = 1, found by bisection.
+
+    Args:
+        pabs (float): Absolute Pressure, psia
+        comp_list (list): List of String Components
+        zi_ray (np.ndarray): Feed Mixture Molar Fractions
+        prop_dict (dict): Properties Dictionary
+
+    Returns:
+        tabs (float): Bubble Point Temperature Guess, rankine
+    """
+    return wilson_temp_crit(pabs, zi_ray, *cb.crit_rays(comp_list, prop_dict), 0.0)
+
+
+def wilson_dew_temp(pabs: float, comp_list: list, zi_ray: np.ndarray, prop_dict: dict) -> float:
+    """Wilson Dew Point Temperature
+
+    Temperature where the Wilson K values give sum(zi / Ki) = 1, found by bisection.
+
+    Args:
+        pabs (float): Absolute Pressure, psia
+        comp_list (list): List of String Components
+        zi_ray (np.ndarray): Feed Mixture Molar Fractions
+        prop_dict (dict): Properties Dictionary
+
+    Returns:
+        tabs (float): Dew Point Temperature Guess, rankine
+    """
+    return wilson_temp_crit(pabs, zi_ray, *cb.crit_rays(comp_list, prop_dict), 1.0)
+
+
+def wilson_temp_crit(
+    pabs: float, zi_ray: np.ndarray, pcrit: np.ndarray, tcrit: np.ndarray, acc: np.ndarray, beta: float
+) -> float:
+    """Wilson Saturation Temperature from Critical Property Arrays
+
+    Bisection on sum(zi * Ki) = 1 for a bubble point or sum(zi / Ki) = 1 for a dew point.
+
+    Args:
+        pabs (float): Absolute Pressure, psia
+        zi_ray (np.ndarray): Feed Mixture Molar Fractions
+        pcrit (np.ndarray): Critical Pressures, psia
+        tcrit (np.ndarray): Critical Temperatures, rankine
+        acc (np.ndarray): Accentric Factors, unitless
+        beta (float): Vapor Mole Fraction, 0 for Bubble Point, 1 for Dew Point
+
+    Returns:
+        tabs (float): Saturation Temperature Guess, rankine
+    """
+    sign = 1 if beta == 0 else -1  # flips sum(zi / Ki) so both residuals grow with temperature
+    tlow, thigh = 50.0, 3000.0  # rankine
+    for _ in range(60):
+        tmid = (tlow + thigh) / 2
+        ki_ray = wilson_ki_crit(pabs, tmid, pcrit, tcrit, acc)
+        if sign * (zi_ray @ ki_ray**sign - 1) > 0:
+            thigh = tmid
+        else:
+            tlow = tmid
+    return (tlow + thigh) / 2
@@ -1,3 +1,18 @@
+"""Mixing Rules
+
+Van der Waals one fluid mixing rules for the a and b parameters of a cubic equation of state.
+The array functions build the (1 - kij) matrix once per component set so the double summation
+is a single quadratic form instead of a python double loop.
+"""
+
+from collections import OrderedDict
+
+import numpy as np
+
+_kmat_cache = OrderedDict()  # (id of bini_dict, component tuple) -> (bini_dict, kmat)
+_kmat_cache_size = 128  # max number of component sets to keep
+
+
 def bini_aij(ai: float, aj: float, kij: float) -> float:
     """Binary Interaction of ai and aj
 
@@ -27,23 +42,60 @@ def mix_a(ci_list: list, zi_list: list, ai_list: list, bini_dict: dict) -> float
     Returns:
         mixa (float): Mixture Peng Robinson a Value
     """
-    cj_list = ci_list.copy()
-    zj_list = zi_list.copy()
-    aj_list = ai_list.copy()
+    kmat = bini_matrix(ci_list, bini_dict)
+    mixa, _ = mix_a_ray(np.asarray(zi_list), np.sqrt(ai_list), kmat)
+    return float(mixa)
 
-    at_list = []  # store all the values to be summed up
 
-    # double for loop for double summation
-    for ci, zi, ai in zip(ci_list, zi_list, ai_list):
-        for cj, zj, aj in zip(cj_list, zj_list, aj_list):
+def bini_matrix(ci_list: list, bini_dict: dict) -> np.ndarray:
+    """Binary Interaction Matrix
 
-            kij = bini_dict[ci][cj]  # binary interation parameter
-            aij = bini_aij(ai, aj, kij)
-            at = zi * zj * aij
-            at_list.append(at)
+    Dense matrix of (1 - kij) for the components in the mixture. The matrix is built
+    once per component set and bini_dict, later calls return the stored read only matrix.
+    Changing values inside bini_dict after the first call will not rebuild the matrix. The
+    least recently used matrices are dropped once more than _kmat_cache_size sets are stored.
 
-    mixa = sum(at_list)
-    return mixa
+    Args:
+        ci_list (list): Components in the Mixture, strings
+        bini_dict (dict): Dictionary of Binary Interaction Parameters
+
+    Returns:
+        kmat (np.ndarray): Matrix of (1 - kij), n x n
+    """
+    key = (id(bini_dict), tuple(ci_list))
+    hit = _kmat_cache.get(key)
+    if hit is not None and hit[0] is bini_dict:  # id can be reused if the dict was deleted
+        _kmat_cache.move_to_end(key)
+        return hit[1]
+
+    kmat = np.array([[1 - bini_dict[ci][cj] for cj in ci_list] for ci in ci_list], dtype=float)
+    kmat.setflags(write=False)
+    _kmat_cache[key] = (bini_dict, kmat)
+    if len(_kmat_cache) > _kmat_cache_size:
+        _kmat_cache.popitem(last=False)
+    return kmat
+
+
+def mix_a_ray(zi_ray: np.ndarray, sqai_ray: np.ndarray, kmat: np.ndarray) -> tuple[float, np.ndarray]:
+    """Mixture little a value and fugacity summations from arrays
+
+    The fugacity summation of component i is sum_j zj * (1 - kij) * aj^0.5, which is a
+    single matrix vector product. The mixture a is then the dot product of zi * ai^0.5
+    with the summations, so both come out of the same pass.
+
+    Args:
+        zi_ray (np.ndarray): Molar Fraction of the Components
+        sqai_ray (np.ndarray): Square root of PR or SRK a parameters for each component
+        kmat (np.ndarray): Matrix of (1 - kij) from bini_matrix
+
+    Returns:
+        mixa (float): Mixture Peng Robinson or SRK a Value
+        fugj_ray (np.ndarray): j Component Summations for each component
+    """
+    zsqa = zi_ray * sqai_ray
+    fugj_ray = kmat @ zsqa
+    mixa = zsqa @ fugj_ray
+    return mixa, fugj_ray
 
 
 def mix_b(zi_list: list, bi_list: list) -> float:
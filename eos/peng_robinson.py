@@ -8,7 +8,7 @@ import math
 
 import numpy as np
 
-import eos.mixing_rules as mr
+import eos.cubic as cb
 
 
 def pengrob_mi(acc: float) -> float:
@@ -105,23 +105,38 @@ def pengrob_capbi(pabs: float, tabs: float, rcon: float, bi: float) -> float:
     return capbi
 
 
-# should I make this decide what to return for liquid, gas or single phase?
+def pengrob_zroots(A: np.ndarray, B: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """Peng Robinson Liquid and Vapor Z Factors
+
+    Solve the Peng Robinson cubic for any number of (A, B) pairs at once, see cubic.cubic_zroots.
+
+    Args:
+        A (np.ndarray): Peng Robinson A
+        B (np.ndarray): Peng Robinson B
+
+    Return:
+        zliq (np.ndarray): Liquid Like Z Factors
+        zvap (np.ndarray): Vapor Like Z Factors
+    """
+    return cb.cubic_zroots(A, B, cb.PR)
+
+
 def pengrob_zfactors(A: float, B: float) -> np.ndarray:
     """Peng Robinson Z Factors
 
-    Find the 3 roots of the Peng Robinson Equation of state.
-    Return only the list of real roots, discard imaginary.
+    Find the liquid like and vapor like roots of the Peng Robinson Equation of state.
+    Uses the analytic cubic solution instead of np.roots. The np.roots version returned
+    every real root, one or three of them in no set order. This always returns two,
+    [zliq, zvap], picked as in cubic.cubic_zroots, so zray[0] is the liquid and zray[-1] the vapor.
 
     Args:
         A (float): Peng Robinson A
         B (float): Peng Robinson B
 
     Return:
-        zray (np array): List of real Z Factors
+        zray (np array): Liquid and Vapor Z Factors, the same value for a single real root
     """
-    coeff = [1, -1 * (1 - B), A - 2 * B - 3 * B**2, -1 * (A * B - B**2 - B**3)]  # coefficients of cubic equation
-    zroots = np.roots(coeff)
-    zray = zroots.real[abs(zroots.imag) < 1e-5]  # filter out imaginary numbers
+    zray = np.array(pengrob_zroots(A, B))
     return zray
 
 
@@ -158,30 +173,42 @@ def pengrob_ab_rays(tabs: float, comp_list: list, prop_dict: dict) -> tuple[list
     return pra_list, prb_list
 
 
-def pengrob_fugj(ci: str, cj_list: list, zj_list: list, aj_list: list, bini_dict: dict) -> float:
-    """Peng Robinson Fugacity Coefficient Summation
+def pengrob_ab_temp(tabs: np.ndarray, comp_list: list, prop_dict: dict) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Peng Robinson a and b Arrays over Temperatures
 
-    Completes the summation that is inside the Peng Robinson Fugacity Coefficient
-    for each component to be evaluated. I actually like the term fugj better, but
-    I don't have a great way to rename stuff? I guess sum is not worst than list...
+    Calculate the a, b and sqrt(a) values for every component with array math.
+    Pass tabs as a column, shape (m, 1), to get an (m, n) array of a values for m temperatures.
 
     Args:
-        ci (str): Primary Component Abbreviation
-        cj_list (list): Secondary Components in the Mixture
-        zj_list (list): Molar Fractions of the Components
-        aj_list (list): Peng Rob a values for Secondary Components
-        bini_dict (dict): Binary Interaction Parameters for Lookup
+        tabs (np.ndarray): Absolute Temperatures, Rankine
+        comp_list (list): Feed Components, string of values
+        prop_dict (dict): Critical Property Lookup Dictionary
 
     Returns:
-        fugsum (float): Summation of j components in PR Fugacity Coefficient
+        ai_ray (np.ndarray): Peng Robinson a values, psia-ft6/(lbmol2)
+        bi_ray (np.ndarray): Peng Robinson b values, ft3/lbmol
+        sqai_ray (np.ndarray): Square root of Peng Robinson a values
     """
-    fugj_list = []
-    for cj, zj, aj in zip(cj_list, zj_list, aj_list):
-        kij = bini_dict[ci][cj]
-        fugj = zj * (1 - kij) * (aj) ** (1 / 2)
-        fugj_list.append(fugj)
-    fugsum = sum(fugj_list)
-    return fugsum
+    return cb.cubic_ab_temp(tabs, comp_list, prop_dict, cb.PR)
+
+
+def pengrob_ab_cache(tabs: float, comp_list: list, prop_dict: dict) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Peng Robinson a and b Arrays, Cached
+
+    Same values as pengrob_ab_rays, but as read only arrays that are stored by temperature
+    and component set, see cubic.cubic_ab_cache.
+
+    Args:
+        tabs (float): Absolute Temperature, Rankine
+        comp_list (list): Feed Components, string of values
+        prop_dict (dict): Critical Property Lookup Dictionary
+
+    Returns:
+        ai_ray (np.ndarray): Peng Robinson a values for each component, psia-ft6/(lbmol2)
+        bi_ray (np.ndarray): Peng Robinson b values for each component, ft3/lbmol
+        sqai_ray (np.ndarray): Square root of Peng Robinson a values for each component
+    """
+    return cb.cubic_ab_cache(tabs, comp_list, prop_dict, cb.PR)
 
 
 def pengrob_fugco(
@@ -197,7 +224,8 @@ def pengrob_fugco(
     """Peng Robinson Fugacity Coefficient
 
     Calculate the fugacity coefficient for a single component in either
-    the vapor or liquid phase.
+    the vapor or liquid phase. ai, bi and fugj can also be arrays of every
+    component, which returns an array of fugacity coefficients.
 
     Args:
         ai (float): Peng Robinson a for Component
@@ -207,7 +235,7 @@ def pengrob_fugco(
         Am (float): Peng Robinson A for Mixture
         Bm (float): Peng Robinson B for Mixture
         Zm (float): Z Factor Overall for Vapor or Liquid
-        fugj (float): j Component Summation from Peng Robinson Fug Coeff.
+        fugj (float): j Component Summation, from mixing_rules.mix_a_ray
 
     Returns:
         phi_i (float): Peng Robinson Fugacity Coefficient for Comp i
@@ -219,15 +247,83 @@ def pengrob_fugco(
     lnphi = (
         -math.log(Zm - Bm)
         + (Zm - 1) * bi / bm  # noqa: W503
-        - Am / (2**1.5 * Bm) * ((1 / am) * (2 * math.sqrt(ai) * fugj) - bi / bm) * fugend  # noqa: W503
+        - Am / (2**1.5 * Bm) * ((1 / am) * (2 * np.sqrt(ai) * fugj) - bi / bm) * fugend  # noqa: W503
     )
-    phi_i = math.exp(lnphi)
+    phi_i = np.exp(lnphi)
     return phi_i
 
 
+def pengrob_lnphi(
+    pabs: np.ndarray,
+    tabs: np.ndarray,
+    zi_ray: np.ndarray,
+    ai_ray: np.ndarray,
+    bi_ray: np.ndarray,
+    sqai_ray: np.ndarray,
+    kmat: np.ndarray,
+    vapor: bool | None,
+) -> tuple[np.ndarray, np.ndarray]:
+    """Peng Robinson Log Fugacity Coefficients, Vectorized
+
+    Log fugacity coefficients for one phase at any number of states in one pass,
+    see cubic.cubic_lnphi for the array shapes.
+
+    Args:
+        pabs (np.ndarray): Absolute Evaluation Pressure, psia
+        tabs (np.ndarray): Absolute Evaluation Temp, rankine
+        zi_ray (np.ndarray): Molar Fractions of Evaluated Phase
+        ai_ray (np.ndarray): Peng Robinson a values, psia-ft6/(lbmol2)
+        bi_ray (np.ndarray): Peng Robinson b values, ft3/lbmol
+        sqai_ray (np.ndarray): Square root of Peng Robinson a values
+        kmat (np.ndarray): Matrix of (1 - kij) from mixing_rules.bini_matrix
+        vapor (bool | None): True - Evaluate Vapor, False Evaluate Liquid, None - Lowest Gibbs Energy Root
+
+    Returns:
+        lnphi (np.ndarray): Log of Peng Robinson Fugacity Coefficients
+        zfac (np.ndarray): Z Factor of the Phase
+    """
+    return cb.cubic_lnphi(pabs, tabs, zi_ray, ai_ray, bi_ray, sqai_ray, kmat, vapor, cb.PR)
+
+
+def pengrob_lnphi_derivs(
+    pabs: np.ndarray,
+    tabs: np.ndarray,
+    ni_ray: np.ndarray,
+    ai_ray: np.ndarray,
+    bi_ray: np.ndarray,
+    sqai_ray: np.ndarray,
+    kmat: np.ndarray,
+    vapor: bool | None,
+    dsqai_ray: np.ndarray | None = None,
+) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray | None, np.ndarray]:
+    """Peng Robinson Log Fugacity Coefficients with Analytic Derivatives
+
+    Pressure, temperature and mole number derivatives of ln phi, see cubic.cubic_lnphi_derivs.
+
+    Args:
+        pabs (np.ndarray): Absolute Evaluation Pressure, psia
+        tabs (np.ndarray): Absolute Evaluation Temp, rankine
+        ni_ray (np.ndarray): Mole Numbers of the Evaluated Phase
+        ai_ray (np.ndarray): Peng Robinson a values, psia-ft6/(lbmol2)
+        bi_ray (np.ndarray): Peng Robinson b values, ft3/lbmol
+        sqai_ray (np.ndarray): Square root of Peng Robinson a values
+        kmat (np.ndarray): Matrix of (1 - kij) from mixing_rules.bini_matrix
+        vapor (bool | None): True - Evaluate Vapor, False Evaluate Liquid, None - Lowest Gibbs Energy Root
+        dsqai_ray (np.ndarray): d sqrt(ai) / dT from cubic.cubic_dsqai_temp, None skips the temperature derivative
+
+    Returns:
+        lnphi (np.ndarray): Log of Peng Robinson Fugacity Coefficients
+        zfac (np.ndarray): Z Factor of the Phase
+        dlnphi_dp (np.ndarray): d ln phi_i / dP, 1/psia
+        dlnphi_dt (np.ndarray | None): d ln phi_i / dT, 1/rankine
+        dlnphi_dn (np.ndarray): d ln phi_i / d nj, 1/lbmol
+    """
+    return cb.cubic_lnphi_derivs(pabs, tabs, ni_ray, ai_ray, bi_ray, sqai_ray, kmat, vapor, cb.PR, dsqai_ray)
+
+
 def pengrob_fugco_list(
     pabs: float, tabs: float, comp_list: list, zi_list: list, prop_dict: dict, bini_dict: dict, vapor: bool
-) -> list:
+) -> np.ndarray:
     """Peng Robinson Fugacity Coefficient List for Liquids or Vapor
 
     Calculate the fugacity coefficients for liquid or Vapor phase.
@@ -242,41 +338,14 @@ def pengrob_fugco_list(
         vapor (bool): True - Evaluate Vapor, False Evaluate Liquid
 
     Returns:
-        phi_list (float): Peng Robinson Fugacity Coefficient for specified phase
+        phi_ray (np.ndarray): Peng Robinson Fugacity Coefficients for specified phase
     """
-    rcon = 10.731  # psia-ft3/lbmol-R
-    ai_list, bi_list = pengrob_ab_rays(tabs, comp_list, prop_dict)  # same for both
-
-    # make mixing rules a seperate file? also make one for loop for both?
-    amix = mr.mix_a(comp_list, zi_list, ai_list, bini_dict)
-    bmix = mr.mix_b(zi_list, bi_list)
-
-    Amix = pengrob_capai(pabs, tabs, rcon, amix)
-    Bmix = pengrob_capbi(pabs, tabs, rcon, bmix)
-
-    zray = pengrob_zfactors(Amix, Bmix)
-
-    if vapor:
-        zfac = max(zray)  # keep the largest value for vapor
-    else:
-        zfac = min(zray)  # keep smallest value for liquid
-
-    phi_list = []
-
-    aj_list = ai_list.copy()  # prevent weird behavior from occuring with loop
-    cj_list = comp_list.copy()
-
-    for ci, ai, bi in zip(comp_list, ai_list, bi_list):
-        fugj = pengrob_fugj(ci, cj_list, zi_list, aj_list, bini_dict)
-        phi_i = pengrob_fugco(ai, bi, amix, bmix, Amix, Bmix, zfac, fugj)
-        phi_list.append(phi_i)
-
-    return phi_list
+    return cb.cubic_fugco_list(pabs, tabs, comp_list, zi_list, prop_dict, bini_dict, vapor, cb.PR)
 
 
 def pengrob_ki_list(
     pabs: float, tabs: float, ci_list: list, xi_list: list, yi_list: list, prop_dict: dict, bini_dict: dict
-) -> list:
+) -> np.ndarray:
     """Peng Robinson Equilibrium Constants
 
     Calculate the peng robinson equilibrium constants for a mixture.
@@ -291,11 +360,6 @@ def pengrob_ki_list(
         bini_dict (dict): Binary Interaction Parameter Dictionary
 
     Returns:
-        ki_list (float): Peng Robinson Equilibrium Constants
+        ki_ray (np.ndarray): Peng Robinson Equilibrium Constants
     """
-    phi_vap_list = pengrob_fugco_list(pabs, tabs, ci_list, yi_list, prop_dict, bini_dict, True)
-    phi_liq_list = pengrob_fugco_list(pabs, tabs, ci_list, xi_list, prop_dict, bini_dict, False)
-
-    # calculate out a new ki, the book says to use log rules? can you get zero phi's?
-    ki_list = [phi_liq / phi_vap for phi_vap, phi_liq in zip(phi_vap_list, phi_liq_list)]
-    return ki_list
+    return cb.cubic_ki_list(pabs, tabs, ci_list, xi_list, yi_list, prop_dict, bini_dict, cb.PR)
@@ -3,6 +3,8 @@
 
 import numpy as np
 
+import eos.cubic as cb
+
 
 def srk_mi(acc: float) -> float:
     """Soave-Redlich-Kwong m Factor
@@ -95,20 +97,122 @@ def srk_capbi(pabs: float, tabs: float, rcon: float, bi: float) -> float:
     return capb
 
 
+def srk_zroots(A: np.ndarray, B: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """Soave-Redlich-Kwong Liquid and Vapor Z Factors
+
+    Solve the Soave-Redlich-Kwong cubic for any number of (A, B) pairs at once, see cubic.cubic_zroots.
+
+    Args:
+        A (np.ndarray): Soave-Redlich-Kwong A
+        B (np.ndarray): Soave-Redlich-Kwong B
+
+    Return:
+        zliq (np.ndarray): Liquid Like Z Factors
+        zvap (np.ndarray): Vapor Like Z Factors
+    """
+    return cb.cubic_zroots(A, B, cb.SRK)
+
+
 def srk_zfactors(A: float, B: float) -> np.ndarray:
     """Soave-Redlich-Kwong Z Factors
 
-    Find the 3 roots of the Soave-Redlich-Kwong Equation of state.
-    Return only the list of real roots, discard imaginary.
+    Find the liquid like and vapor like roots of the Soave-Redlich-Kwong Equation of state.
+    Uses the analytic cubic solution instead of np.roots. The cubic is
+    Z^3 - Z^2 + (A - B - B^2) Z - A B, the np.roots version had + B^2 in the Z coefficient.
+    The np.roots version also returned every real root, one or three of them in no set order.
+    This always returns two, [zliq, zvap], picked as in cubic.cubic_zroots.
 
     Args:
         A (float): Soave-Redlich-Kwong A
         B (float): Soave-Redlich-Kwong B
 
     Return:
-        zray (np array): List of real Z Factors
+        zray (np array): Liquid and Vapor Z Factors, the same value for a single real root
     """
-    coeff = [1, -1, A - B + B**2, -A * B]  # coefficients of srk cubic equation
-    zroots = np.roots(coeff)
-    zray = zroots.real[abs(zroots.imag) < 1e-5]  # filter out imaginary numbers
+    zray = np.array(srk_zroots(A, B))
     return zray
+
+
+def srk_ab_cache(tabs: float, comp_list: list, prop_dict: dict) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Soave-Redlich-Kwong a and b Arrays, Cached
+
+    Args:
+        tabs (float): Absolute Temperature, Rankine
+        comp_list (list): Feed Components, string of values
+        prop_dict (dict): Critical Property Lookup Dictionary
+
+    Returns:
+        ai_ray (np.ndarray): SRK a values for each component, psia-ft6/(lbmol2)
+        bi_ray (np.ndarray): SRK b values for each component, ft3/lbmol
+        sqai_ray (np.ndarray): Square root of SRK a values for each component
+    """
+    return cb.cubic_ab_cache(tabs, comp_list, prop_dict, cb.SRK)
+
+
+def srk_lnphi(
+    pabs: np.ndarray,
+    tabs: np.ndarray,
+    zi_ray: np.ndarray,
+    ai_ray: np.ndarray,
+    bi_ray: np.ndarray,
+    sqai_ray: np.ndarray,
+    kmat: np.ndarray,
+    vapor: bool | None,
+) -> tuple[np.ndarray, np.ndarray]:
+    """Soave-Redlich-Kwong Log Fugacity Coefficients, Vectorized
+
+    Args:
+        pabs (np.ndarray): Absolute Evaluation Pressure, psia
+        tabs (np.ndarray): Absolute Evaluation Temp, rankine
+        zi_ray (np.ndarray): Molar Fractions of Evaluated Phase
+        ai_ray (np.ndarray): SRK a values, psia-ft6/(lbmol2)
+        bi_ray (np.ndarray): SRK b values, ft3/lbmol
+        sqai_ray (np.ndarray): Square root of SRK a values
+        kmat (np.ndarray): Matrix of (1 - kij) from mixing_rules.bini_matrix
+        vapor (bool | None): True - Evaluate Vapor, False Evaluate Liquid, None - Lowest Gibbs Energy Root
+
+    Returns:
+        lnphi (np.ndarray): Log of SRK Fugacity Coefficients
+        zfac (np.ndarray): Z Factor of the Phase
+    """
+    return cb.cubic_lnphi(pabs, tabs, zi_ray, ai_ray, bi_ray, sqai_ray, kmat, vapor, cb.SRK)
+
+
+def srk_fugco_list(
+    pabs: float, tabs: float, comp_list: list, zi_list: list, prop_dict: dict, bini_dict: dict, vapor: bool
+) -> np.ndarray:
+    """Soave-Redlich-Kwong Fugacity Coefficients for Liquids or Vapor
+
+    Args:
+        pabs (float): Absolute Evaluation Pressure, psia
+        tabs (float): Absolute Evaluation Temp, rankine
+        comp_list (list): List of String Components
+        zi_list (list): Molar Fractions of Evaluated Mixture
+        prop_dict (dict): Properties Dictionary
+        bini_dict (dict): Binary Interaction Parameter Dictionary
+        vapor (bool): True - Evaluate Vapor, False Evaluate Liquid
+
+    Returns:
+        phi_ray (np.ndarray): SRK Fugacity Coefficients for specified phase
+    """
+    return cb.cubic_fugco_list(pabs, tabs, comp_list, zi_list, prop_dict, bini_dict, vapor, cb.SRK)
+
+
+def srk_ki_list(
+    pabs: float, tabs: float, ci_list: list, xi_list: list, yi_list: list, prop_dict: dict, bini_dict: dict
+) -> np.ndarray:
+    """Soave-Redlich-Kwong Equilibrium Constants
+
+    Args:
+        pabs (float): Absolute Evaluation Pressure, psia
+        tabs (float): Absolute Evaluation Temp, rankine
+        ci_list (list): List of String Components
+        xi_list (list): Liquid Phase Molar Fractions
+        yi_list (list): Vapor Phase Molar Fractions
+        prop_dict (dict): Properties Dictionary
+        bini_dict (dict): Binary Interaction Parameter Dictionary
+
+    Returns:
+        ki_ray (np.ndarray): SRK Equilibrium Constants
+    """
+    return cb.cubic_ki_list(pabs, tabs, ci_list, xi_list, yi_list, prop_dict, bini_dict, cb.SRK)
@@ -0,0 +1,221 @@
+"""Two Phase Flash
+
+Solve the K values of a two phase flash at a fixed pressure and temperature, Michelsen 2008.
+Successive substitution is used far from the answer, with every fifth step extrapolated by
+the dominant eigenvalue method (GDEM) so the slow mode near the critical point is removed.
+Once the fugacity residuals are small the solver switches to Newton on ln K, which finishes
+in a few quadratic steps. Convergence is on fugacity equality, not on the change in beta.
+"""
+
+import numpy as np
+
+import eos.cubic as cb
+import flash_jit as fj
+import rachford_rice as rr
+import stability as st
+import telemetry as tm
+
+
+def flash_residual(
+    lnk: np.ndarray,
+    pabs: float,
+    tabs: float,
+    zi_ray: np.ndarray,
+    ai_ray: np.ndarray,
+    bi_ray: np.ndarray,
+    sqai_ray: np.ndarray,
+    kmat: np.ndarray,
+    beta: float,
+    eos: cb.CubicEOS = cb.PR,
+) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """Fugacity Residuals of a Flash at Given K Values
+
+    Several sets of K values at the same pressure and temperature can be passed as rows of lnk.
+
+    Args:
+        lnk (np.ndarray): Log of Equilibrium Ratios, shape (n,) or (m, n)
+        pabs (float): Absolute Evaluation Pressure, psia
+        tabs (float): Absolute Evaluation Temp, rankine
+        zi_ray (np.ndarray): Feed Mixture Molar Fractions
+        ai_ray (np.ndarray): Cubic EOS a values
+        bi_ray (np.ndarray): Cubic EOS b values
+        sqai_ray (np.ndarray): Square root of Cubic EOS a values
+        kmat (np.ndarray): Matrix of (1 - kij) from mixing_rules.bini_matrix
+        beta (float): Starting Vapor Mole Fraction for the Rachford Rice solve
+        eos (cb.CubicEOS): Equation of State, cubic.PR or cubic.SRK
+
+    Returns:
+        gray (np.ndarray): Residuals, ln K + ln phi vapor - ln phi liquid
+        xi_ray (np.ndarray): Liquid Molar Fractions
+        yi_ray (np.ndarray): Vapor Molar Fractions
+        beta (np.ndarray): Vapor Mole Fraction, Total Mixture
+    """
+    ki_ray = np.exp(lnk)
+    beta = rr.rr_solve(zi_ray, ki_ray, beta)
+    xi_ray = rr.liquid_frac(zi_ray, ki_ray, np.expand_dims(beta, -1))
+    yi_ray = rr.vapor_frac(zi_ray, ki_ray, np.expand_dims(beta, -1))
+    xi_ray = xi_ray / xi_ray.sum(axis=-1, keepdims=True)
+    yi_ray = yi_ray / yi_ray.sum(axis=-1, keepdims=True)
+
+    lnphi_liq, _ = cb.cubic_lnphi(pabs, tabs, xi_ray, ai_ray, bi_ray, sqai_ray, kmat, False, eos)
+    lnphi_vap, _ = cb.cubic_lnphi(pabs, tabs, yi_ray, ai_ray, bi_ray, sqai_ray, kmat, True, eos)
+    gray = lnk + lnphi_vap - lnphi_liq
+    return gray, xi_ray, yi_ray, beta
+
+
+def flash_jacobian(
+    xi_ray: np.ndarray,
+    yi_ray: np.ndarray,
+    beta: float,
+    pabs: float,
+    tabs: float,
+    zi_ray: np.ndarray,
+    ai_ray: np.ndarray,
+    bi_ray: np.ndarray,
+    sqai_ray: np.ndarray,
+    kmat: np.ndarray,
+    eos: cb.CubicEOS = cb.PR,
+) -> np.ndarray:
+    """Analytic Flash Jacobian in ln K
+
+    The vapor moles follow ln K through the Rachford Rice solve, dv/d ln K = beta (1 - beta) diag(q)
+    + q q^T / S with q = xi yi / zi and S = sum((yi - xi)^2 / zi). With the mole number derivatives
+    of ln phi in both phases this gives J = I + ((1 - beta) PhiV + beta PhiL) (diag(q) + q q^T / (beta (1 - beta) S)),
+    where Phi are the derivatives for one mole of each phase.
+
+    Args:
+        xi_ray (np.ndarray): Liquid Molar Fractions
+        yi_ray (np.ndarray): Vapor Molar Fractions
+        beta (float): Vapor Mole Fraction, between zero and one
+        pabs (float): Absolute Evaluation Pressure, psia
+        tabs (float): Absolute Evaluation Temp, rankine
+        zi_ray (np.ndarray): Feed Mixture Molar Fractions
+        ai_ray (np.ndarray): Cubic EOS a values
+        bi_ray (np.ndarray): Cubic EOS b values
+        sqai_ray (np.ndarray): Square root of Cubic EOS a values
+        kmat (np.ndarray): Matrix of (1 - kij) from mixing_rules.bini_matrix
+        eos (cb.CubicEOS): Equation of State, cubic.PR or cubic.SRK
+
+    Returns:
+        jac (np.ndarray): Jacobian of the residuals, n x n
+    """
+    _, _, _, _, dlnphi_liq = cb.cubic_lnphi_derivs(pabs, tabs, xi_ray, ai_ray, bi_ray, sqai_ray, kmat, False, eos)
+    _, _, _, _, dlnphi_vap = cb.cubic_lnphi_derivs(pabs, tabs, yi_ray, ai_ray, bi_ray, sqai_ray, kmat, True, eos)
+    # a component missing from the feed is missing from both phases, it adds nothing to q or S
+    present = zi_ray > 0
+    qray = np.divide(xi_ray * yi_ray, zi_ray, out=np.zeros_like(zi_ray), where=present)
+    ssum = np.sum(np.divide((yi_ray - xi_ray) ** 2, zi_ray, out=np.zeros_like(zi_ray), where=present))
+    dvdlnk = np.diag(qray) + np.outer(qray, qray) / (beta * (1 - beta) * ssum)
+    return np.eye(zi_ray.size) + ((1 - beta) * dlnphi_vap + beta * dlnphi_liq) @ dvdlnk
+
+
+def flash_ssgdem(
+    pabs: float,
+    tabs: float,
+    zi_ray: np.ndarray,
+    ai_ray: np.ndarray,
+    bi_ray: np.ndarray,
+    sqai_ray: np.ndarray,
+    kmat: np.ndarray,
+    ki_ray: np.ndarray,
+    maxiter: int = 200,
+    eos: cb.CubicEOS = cb.PR,
+) -> tuple[np.ndarray, np.ndarray, float, int, int]:
+    """Accelerated Successive Substitution Flash with a Newton Finish
+
+    Successive substitution on ln K, every fifth step is extrapolated with the dominant
+    eigenvalue of the last two updates. When the largest residual drops below 1e-3 with
+    beta between zero and one, Newton on ln K takes over. A Newton step that does not
+    lower the residual is halved, and after that the solver falls back to substitution.
+    With numba installed the substitution runs compiled in flash_jit to the final tolerance,
+    the numpy loop below only finishes what it could not. A flash that has not converged on
+    fugacity equality, or on the trivial solution, after maxiter steps is returned as nan.
+
+    Args:
+        pabs (float): Absolute Evaluation Pressure, psia
+        tabs (float): Absolute Evaluation Temp, rankine
+        zi_ray (np.ndarray): Feed Mixture Molar Fractions
+        ai_ray (np.ndarray): Cubic EOS a values
+        bi_ray (np.ndarray): Cubic EOS b values
+        sqai_ray (np.ndarray): Square root of Cubic EOS a values
+        kmat (np.ndarray): Matrix of (1 - kij) from mixing_rules.bini_matrix
+        ki_ray (np.ndarray): Starting Equilibrium Ratios, stability or Wilson
+        maxiter (int): Maximum Number of Total Iterations
+        eos (cb.CubicEOS): Equation of State, cubic.PR or cubic.SRK
+
+    Returns:
+        xi_ray (np.ndarray): Liquid Molar Fractions
+        yi_ray (np.ndarray): Vapor Molar Fractions
+        beta (float): Vapor Mole Fraction, Total Mixture, nan with xi and yi if not converged
+        niter_ss (int): Number of Substitution Steps, including accelerated ones
+        niter_newton (int): Number of Newton Steps
+    """
+    gtol = 1e-10  # largest fugacity residual at the answer
+    gnewton = 1e-3  # largest fugacity residual to switch to newton
+    ngdem = 5  # accelerate every this many substitution steps
+
+    lnk = np.log(ki_ray)
+    beta = 0.5
+    niter_ss = 0
+    niter_newton = 0
+    dlnk_old = None
+    if fj.enabled:
+        xi_ray, yi_ray, beta, niter, gmax, lnk_jit = fj.flash_ss(
+            pabs, tabs, zi_ray, bi_ray, sqai_ray, kmat, ki_ray, gtol, st.ktriv, maxiter // 2, eos
+        )
+        if gmax < gtol or np.max(abs(lnk_jit)) < st.ktriv:
+            rec = tm.active.get()
+            if rec is not None:
+                rec.iterations += niter
+                rec.residual = float(gmax)
+            return xi_ray, yi_ray, float(beta), niter, niter_newton
+        if np.isfinite(gmax):  # slow near the critical point, newton below takes it from here
+            lnk = lnk_jit
+            niter_ss = niter
+    gray, xi_ray, yi_ray, beta = flash_residual(lnk, pabs, tabs, zi_ray, ai_ray, bi_ray, sqai_ray, kmat, beta, eos)
+
+    while niter_ss + niter_newton < maxiter:
+        gmax = np.max(abs(gray))
+        if gmax < gtol or np.max(abs(lnk)) < st.ktriv or not np.isfinite(gmax):
+            break
+
+        if gmax < gnewton and 0 < beta < 1:
+            jac = flash_jacobian(xi_ray, yi_ray, beta, pabs, tabs, zi_ray, ai_ray, bi_ray, sqai_ray, kmat, eos)
+            dlnk = np.linalg.solve(jac, -gray)
+            if not np.all(np.isfinite(dlnk)):
+                gnewton = gmax / 10
+                continue
+            for _ in range(4):
+                gnew, xnew, ynew, bnew = flash_residual(
+                    lnk + dlnk, pabs, tabs, zi_ray, ai_ray, bi_ray, sqai_ray, kmat, beta, eos
+                )
+                if np.max(abs(gnew)) < gmax:
+                    break
+                dlnk /= 2
+            else:
+                gnewton = gmax / 10  # newton is not helping here, substitute further first
+                continue
+            niter_newton += 1
+            lnk = lnk + dlnk
+            gray, xi_ray, yi_ray, beta = gnew, xnew, ynew, bnew
+            continue
+
+        # substitution step is ln K minus the residual, ln phi liquid - ln phi vapor
+        dlnk = -gray
+        niter_ss += 1
+        if niter_ss % ngdem == 0 and dlnk_old is not None:
+            lam = (dlnk @ dlnk) / (dlnk_old @ dlnk)
+            if 0 < lam < 1:
+                dlnk = dlnk / (1 - lam)  # sum of the geometric series of the dominant mode
+        lnk = lnk + dlnk
+        dlnk_old = dlnk if niter_ss % ngdem else None
+        gray, xi_ray, yi_ray, beta = flash_residual(lnk, pabs, tabs, zi_ray, ai_ray, bi_ray, sqai_ray, kmat, beta, eos)
+
+    gmax = float(np.max(abs(gray)))
+    rec = tm.active.get()
+    if rec is not None:
+        rec.iterations += niter_ss + niter_newton
+        rec.residual = gmax
+    if not (gmax < gtol or np.max(abs(lnk)) < st.ktriv):  # out of iterations, same as overall.phase_comp_batch
+        return np.full_like(zi_ray, np.nan), np.full_like(zi_ray, np.nan), np.nan, niter_ss, niter_newton
+    return xi_ray, yi_ray, float(beta), niter_ss, niter_newton
@@ -0,0 +1,316 @@
+"""Flash Result Cache
+
+Opt in memoization for phase_comp, bubblepoint_pressure and dewpoint_pressure. Callers that ask
+the same question over and over, the same meter composition at conditions rounded to the
+instrument, can route their calls through a FlashCache instead of overall.
+
+The key is the equation of state, the component tuple, the composition, pressure and temperature rounded to a
+resolution, and a fingerprint of the property and binary interaction values in use. The
+solve is run at the rounded point, so a cached answer does not depend on which nearby
+input happened to fill the entry first. Entries are evicted least recently used past
+maxsize and expire after ttl seconds. An optional SQLite file keeps results between runs.
+"""
+
+import hashlib
+import json
+import math
+import sqlite3
+import time
+from collections import OrderedDict
+
+import eos.cubic as cb
+import fluid as fd
+import overall as oa
+import proptables.crit_vals as ct
+
+_fingerprints = OrderedDict()  # (id of prop_dict, id of bini_dict, component tuple) -> (prop_dict, bini_dict, digest)
+_fingerprints_size = 128  # max number of component sets to keep
+
+
+def table_fingerprint(comp_list: list, prop_dict: dict, bini_dict: dict) -> str:
+    """Fingerprint of the Table Values used by a Mixture
+
+    Hash of the critical properties and binary interaction values of the components,
+    so an edited table does not serve stale answers from the persistent tier. The digest is
+    stored per table pair and component set, the same way as mixing_rules.bini_matrix, so
+    values changed inside a table after the first call are not picked up in this process.
+    The least recently used digests are dropped once more than _fingerprints_size are stored.
+
+    Args:
+        comp_list (list): List of String Components
+        prop_dict (dict): Property Table for Lookup
+        bini_dict (dict): Binary Interaction Table
+
+    Returns:
+        fingerprint (str): Hex digest of the table values
+    """
+    key = (id(prop_dict), id(bini_dict), tuple(comp_list))
+    hit = _fingerprints.get(key)
+    if hit is not None and hit[0] is prop_dict and hit[1] is bini_dict:  # id can be reused if a dict was deleted
+        _fingerprints.move_to_end(key)
+        return hit[2]
+
+    rows = []
+    for comp in comp_list:
+        bini_row = bini_dict[comp]
+        prop = prop_dict[comp]
+        rows.append((comp, tuple((field, getattr(prop, field)) for field in sorted(ct.ChemProps.__slots__))))
+        rows.append((comp, tuple([bini_row[other] for other in comp_list])))
+    fingerprint = hashlib.sha1(repr(tuple(rows)).encode()).hexdigest()
+
+    _fingerprints[key] = (prop_dict, bini_dict, fingerprint)
+    if len(_fingerprints) > _fingerprints_size:
+        _fingerprints.popitem(last=False)
+    return fingerprint
+
+
+def quantize(value: float, step: float) -> float:
+    """Round a Value to the Nearest Multiple of a Step
+
+    Args:
+        value (float): Value to round
+        step (float): Resolution, zero leaves the value unchanged
+
+    Returns:
+        qvalue (float): Rounded Value
+    """
+    if step <= 0:
+        return float(value)
+    return round(round(value / step) * step, 12)
+
+
+class FlashCache:
+    def __init__(
+        self,
+        maxsize: int = 1024,
+        ttl: float | None = None,
+        db_path: str | None = None,
+        pres_step: float = 0.1,
+        temp_step: float = 0.1,
+        comp_step: float = 1e-6,
+    ):
+        """Flash Result Cache
+
+        Args:
+            maxsize (int): Most Entries kept in memory, least recently used are dropped
+            ttl (float): Seconds an entry stays valid, None never expires
+            db_path (str): SQLite file for the persistent tier, None keeps it in memory only
+            pres_step (float): Pressure Resolution, psi
+            temp_step (float): Temperature Resolution, deg F
+            comp_step (float): Molar Fraction Resolution
+        """
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.pres_step = pres_step
+        self.temp_step = temp_step
+        self.comp_step = comp_step
+        self.hits = 0
+        self.misses = 0
+        self.db_hits = 0
+        self._mem = OrderedDict()  # key: (created, value)
+
+        self._db = None
+        if db_path is not None:
+            self._db = sqlite3.connect(db_path)
+            self._db.execute("CREATE TABLE IF NOT EXISTS flash_cache (key TEXT PRIMARY KEY, created REAL, value TEXT)")
+            self._db.commit()
+
+    def __repr__(self):
+        return f"FlashCache: {len(self._mem)} entries, {self.hits} hits, {self.misses} misses"
+
+    def stats(self) -> dict:
+        """Cache Counters
+
+        Returns:
+            stats (dict): hits, misses, db_hits (hits served by SQLite), size and hit_rate
+        """
+        calls = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "db_hits": self.db_hits,
+            "size": len(self._mem),
+            "hit_rate": self.hits / calls if calls else 0.0,
+        }
+
+    def clear(self) -> None:
+        """Drop every entry, in memory and in the SQLite tier, and reset the counters"""
+        self._mem.clear()
+        if self._db is not None:
+            self._db.execute("DELETE FROM flash_cache")
+            self._db.commit()
+        self.hits = 0
+        self.misses = 0
+        self.db_hits = 0
+
+    def close(self) -> None:
+        """Close the SQLite tier, the memory tier keeps working"""
+        if self._db is not None:
+            self._db.close()
+            self._db = None
+
+    def _tables(self, comp_dict: dict | fd.Fluid, prop_dict: dict | None, bini_dict: dict | None) -> tuple:
+        if isinstance(comp_dict, fd.Fluid):
+            return comp_dict.prop_dict, comp_dict.bini_dict
+        return prop_dict, bini_dict
+
+    def _quant_comp(self, comp_dict: dict | fd.Fluid) -> dict:
+        if isinstance(comp_dict, fd.Fluid):  # keyed on the composition, same as the dictionary
+            comp_dict = comp_dict.comp_dict
+        return {comp: quantize(zi, self.comp_step) for comp, zi in comp_dict.items()}
+
+    def _key(
+        self,
+        func: str,
+        peval: float | None,
+        teval: float,
+        qcomp: dict,
+        prop_dict: dict,
+        bini_dict: dict,
+        eos: cb.CubicEOS,
+    ) -> tuple:
+        comp_list = list(qcomp.keys())
+        fingerprint = table_fingerprint(comp_list, prop_dict, bini_dict)
+        return (func, eos.name, tuple(comp_list), tuple(qcomp.values()), peval, teval, fingerprint)
+
+    def _expired(self, created: float) -> bool:
+        return self.ttl is not None and time.time() - created > self.ttl
+
+    def _get(self, key: tuple):
+        entry = self._mem.get(key)
+        if entry is not None:
+            if not self._expired(entry[0]):
+                self._mem.move_to_end(key)
+                self.hits += 1
+                return entry[1]
+            del self._mem[key]
+
+        if self._db is not None:
+            sql = "SELECT created, value FROM flash_cache WHERE key = ?"
+            row = self._db.execute(sql, (json.dumps(key),)).fetchone()
+            if row is not None and not self._expired(row[0]):
+                value = json.loads(row[1])
+                self._put_mem(key, row[0], value)
+                self.hits += 1
+                self.db_hits += 1
+                return value
+
+        self.misses += 1
+        return None
+
+    def _put_mem(self, key: tuple, created: float, value) -> None:
+        self._mem[key] = (created, value)
+        self._mem.move_to_end(key)
+        while len(self._mem) > self.maxsize:
+            self._mem.popitem(last=False)
+
+    def _put(self, key: tuple, value) -> None:
+        created = time.time()
+        self._put_mem(key, created, value)
+        if self._db is not None:
+            self._db.execute(
+                "INSERT OR REPLACE INTO flash_cache (key, created, value) VALUES (?, ?, ?)",
+                (json.dumps(key), created, json.dumps(value)),
+            )
+            self._db.commit()
+
+    def phase_comp(
+        self,
+        peval: float,
+        teval: float,
+        comp_dict: dict | fd.Fluid,
+        prop_dict: dict | None = None,
+        bini_dict: dict | None = None,
+        eos: cb.CubicEOS = cb.PR,
+    ) -> tuple[list, list]:
+        """Cached overall.phase_comp, solved at the rounded pressure, temperature and composition
+
+        Args:
+            peval (float): Evaluated Pressure, psig
+            teval (float): Evaluated Temperature, deg F
+            comp_dict (dict | fd.Fluid): Mixture Molar Composition, or a compiled fluid.Fluid
+            prop_dict (dict): Property Table for Lookup, not needed with a Fluid
+            bini_dict (dict): Binary Interaction Table, not needed with a Fluid
+            eos (cb.CubicEOS): Equation of State, cubic.PR or cubic.SRK
+
+        Returns:
+            xi_list (list): Liquid Molar Fraction Composition
+            yi_list (list): Vapour Molar Fraction Composition
+        """
+        prop_dict, bini_dict = self._tables(comp_dict, prop_dict, bini_dict)
+        qpres = quantize(peval, self.pres_step)
+        qtemp = quantize(teval, self.temp_step)
+        qcomp = self._quant_comp(comp_dict)
+        key = self._key("phase_comp", qpres, qtemp, qcomp, prop_dict, bini_dict, eos)
+        value = self._get(key)
+        if value is None:
+            xi_list, yi_list = oa.phase_comp(qpres, qtemp, qcomp, prop_dict, bini_dict, eos)
+            value = [[float(xi) for xi in xi_list], [float(yi) for yi in yi_list]]
+            self._put(key, value)
+        return list(value[0]), list(value[1])
+
+    def bubblepoint_pressure(
+        self,
+        teval: float,
+        comp_dict: dict | fd.Fluid,
+        prop_dict: dict | None = None,
+        bini_dict: dict | None = None,
+        eos: cb.CubicEOS = cb.PR,
+    ) -> float:
+        """Cached overall.bubblepoint_pressure, solved at the rounded temperature and composition
+
+        Args:
+            teval (float): Evaluated Temperature, deg F
+            comp_dict (dict | fd.Fluid): Mixture Molar Composition, or a compiled fluid.Fluid
+            prop_dict (dict): Property Table for Lookup, not needed with a Fluid
+            bini_dict (dict): Binary Interaction Table, not needed with a Fluid
+            eos (cb.CubicEOS): Equation of State, cubic.PR or cubic.SRK
+
+        Returns:
+            pbub (float): Bubble Point Pressure, psig
+        """
+        name = "bubblepoint_pressure"
+        return self._saturation(name, oa.bubblepoint_pressure, teval, comp_dict, prop_dict, bini_dict, eos)
+
+    def dewpoint_pressure(
+        self,
+        teval: float,
+        comp_dict: dict | fd.Fluid,
+        prop_dict: dict | None = None,
+        bini_dict: dict | None = None,
+        eos: cb.CubicEOS = cb.PR,
+    ) -> float:
+        """Cached overall.dewpoint_pressure, solved at the rounded temperature and composition
+
+        Args:
+            teval (float): Evaluated Temperature, deg F
+            comp_dict (dict | fd.Fluid): Mixture Molar Composition, or a compiled fluid.Fluid
+            prop_dict (dict): Property Table for Lookup, not needed with a Fluid
+            bini_dict (dict): Binary Interaction Table, not needed with a Fluid
+            eos (cb.CubicEOS): Equation of State, cubic.PR or cubic.SRK
+
+        Returns:
+            pdew (float): Dew Point Pressure, psig
+        """
+        return self._saturation("dewpoint_pressure", oa.dewpoint_pressure, teval, comp_dict, prop_dict, bini_dict, eos)
+
+    def _saturation(
+        self,
+        name: str,
+        func,
+        teval: float,
+        comp_dict: dict | fd.Fluid,
+        prop_dict: dict | None,
+        bini_dict: dict | None,
+        eos: cb.CubicEOS,
+    ) -> float:
+        prop_dict, bini_dict = self._tables(comp_dict, prop_dict, bini_dict)
+        qtemp = quantize(teval, self.temp_step)
+        qcomp = self._quant_comp(comp_dict)
+        key = self._key(name, None, qtemp, qcomp, prop_dict, bini_dict, eos)
+        value = self._get(key)
+        if value is None:
+            value = float(func(qtemp, qcomp, prop_dict, bini_dict, eos))
+            if math.isfinite(value):  # failed solves are tried again next time
+                self._put(key, value)
+        return value
@@ -0,0 +1,357 @@
+"""Compiled Flash Kernels
+
+Loop versions of the cubic Z factor and ln phi kernel, the Rachford Rice solve and the
+accelerated successive substitution flash, compiled with numba when it is installed. For a
+three component mixture the numpy kernels spend most of their time in call overhead, the
+compiled loops do not have any. The loops follow cubic.cubic_lnphi, rachford_rice.rr_solve_scalar
+and the substitution part of flash.flash_ssgdem step for step, so both backends land on the
+same answer to the solver tolerance.
+
+numba is optional. Without it enabled is False and flash.flash_ssgdem stays on numpy, the
+functions here still run as plain python, which is only useful for checking them. Compiled
+code is cached in __pycache__ next to this file, the compile cost is paid once per machine.
+Set enabled = False at runtime to go back to the numpy backend.
+"""
+
+import math
+
+import numpy as np
+
+import eos.cubic as cb
+
+try:
+    import numba
+except ImportError:  # optional, the numpy backend is used
+    numba = None
+
+enabled = numba is not None  # use the compiled kernels in flash.flash_ssgdem
+
+
+def jit(func):
+    """Compile with numba and cache it on disk, the python function is returned without numba"""
+    if numba is None:
+        return func
+    return numba.njit(cache=True)(func)
+
+
+@jit
+def cubic_roots_loop(c2: float, c1: float, c0: float) -> tuple[float, float]:
+    """Smallest and Largest Real Roots of a Cubic, same as num_methods.cubic_roots_scalar
+
+    Args:
+        c2 (float): Coefficient of z^2
+        c1 (float): Coefficient of z
+        c0 (float): Constant Coefficient
+
+    Return:
+        zmin (float): Smallest Real Root
+        zmax (float): Largest Real Root
+    """
+    shift = c2 / 3
+    p = c1 - c2 * shift
+    q = 2 * shift**3 - shift * c1 + c0
+    disc = (q / 2) ** 2 + (p / 3) ** 3
+
+    if disc < 0:
+        rad = math.sqrt(-p / 3)
+        theta = math.acos(max(-1.0, min(1.0, -q / (2 * rad**3)))) / 3
+        zmin = 2 * rad * math.cos(theta + 2 * math.pi / 3) - shift
+        zmax = 2 * rad * math.cos(theta) - shift
+    else:
+        sdisc = math.sqrt(disc)
+        u = -q / 2 + sdisc
+        v = -q / 2 - sdisc
+        zmin = math.copysign(abs(u) ** (1 / 3), u) + math.copysign(abs(v) ** (1 / 3), v) - shift
+        zmax = zmin
+
+    for _ in range(2):  # halley polish of both roots
+        f = ((zmin + c2) * zmin + c1) * zmin + c0
+        df = (3 * zmin + 2 * c2) * zmin + c1
+        den = 2 * df**2 - f * (6 * zmin + 2 * c2)
+        if den != 0:
+            zmin = zmin - 2 * f * df / den
+        f = ((zmax + c2) * zmax + c1) * zmax + c0
+        df = (3 * zmax + 2 * c2) * zmax + c1
+        den = 2 * df**2 - f * (6 * zmax + 2 * c2)
+        if den != 0:
+            zmax = zmax - 2 * f * df / den
+    return zmin, zmax
+
+
+@jit
+def lnphi_loop(
+    pabs: float,
+    tabs: float,
+    zi_ray: np.ndarray,
+    bi_ray: np.ndarray,
+    sqai_ray: np.ndarray,
+    kmat: np.ndarray,
+    delta1: float,
+    delta2: float,
+    phase: int,
+    lnphi: np.ndarray,
+) -> float:
+    """Log Fugacity Coefficients of one Phase, same as cubic.cubic_lnphi for a single state
+
+    Args:
+        pabs (float): Absolute Evaluation Pressure, psia
+        tabs (float): Absolute Evaluation Temp, rankine
+        zi_ray (np.ndarray): Molar Fractions of Evaluated Phase
+        bi_ray (np.ndarray): b values, ft3/lbmol
+        sqai_ray (np.ndarray): Square root of a values
+        kmat (np.ndarray): Matrix of (1 - kij) from mixing_rules.bini_matrix
+        delta1 (float): First Volume Constant of the Equation of State
+        delta2 (float): Second Volume Constant of the Equation of State
+        phase (int): 0 - Liquid, 1 - Vapor, -1 - Lowest Gibbs Energy Root
+        lnphi (np.ndarray): Filled with the Log of Fugacity Coefficients
+
+    Returns:
+        zfac (float): Z Factor of the Phase
+    """
+    nc = zi_ray.size
+    fugj = np.empty(nc)
+    amix = 0.0
+    bmix = 0.0
+    for i in range(nc):
+        fsum = 0.0
+        for j in range(nc):
+            fsum += zi_ray[j] * sqai_ray[j] * kmat[i, j]
+        fugj[i] = fsum
+        amix += zi_ray[i] * sqai_ray[i] * fsum
+        bmix += zi_ray[i] * bi_ray[i]
+
+    A = amix * pabs / (cb.rcon**2 * tabs**2)
+    B = bmix * pabs / (cb.rcon * tabs)
+    u = delta1 + delta2
+    w = delta1 * delta2
+    zmin, zmax = cubic_roots_loop((u - 1) * B - 1, A + w * B**2 - u * B - u * B**2, -(A * B + w * B**2 + w * B**3))
+    zliq = zmin if zmin > B else zmax  # roots below B are not physical
+
+    fcon = A / ((delta1 - delta2) * B)
+    if phase == 1:
+        zfac = zmax
+    elif phase == 0:
+        zfac = zliq
+    else:  # cubic.cubic_gibbs of both roots
+        gliq = zliq - 1 - math.log(zliq - B) - fcon * math.log((zliq + delta1 * B) / (zliq + delta2 * B))
+        gvap = zmax - 1 - math.log(zmax - B) - fcon * math.log((zmax + delta1 * B) / (zmax + delta2 * B))
+        zfac = zmax if gvap < gliq else zliq
+
+    fugend = math.log((zfac + delta1 * B) / (zfac + delta2 * B))
+    lnzb = math.log(zfac - B)
+    for i in range(nc):
+        bratio = bi_ray[i] / bmix
+        lnphi[i] = -lnzb + (zfac - 1) * bratio - fcon * (2 * sqai_ray[i] * fugj[i] / amix - bratio) * fugend
+    return zfac
+
+
+@jit
+def rr_loop(zi_ray: np.ndarray, ki_ray: np.ndarray, beta: float, tol: float, maxiter: int) -> float:
+    """Rachford and Rice Vapor Mole Fraction, same as rachford_rice.rr_solve_scalar
+
+    Args:
+        zi_ray (np.ndarray): Feed Mixture Molar Fractions
+        ki_ray (np.ndarray): Equilibrium Ratios of Components
+        beta (float): Starting Vapor Mole Fraction
+        tol (float): How much Beta needs to change
+        maxiter (int): Maximum Number of Iterations
+
+    Return:
+        beta (float): Vapor Mole Fraction, Total Mixture
+    """
+    nc = zi_ray.size
+    subcool = 0.0
+    superheat = 0.0
+    kmax = ki_ray[0]
+    kmin = ki_ray[0]
+    low = 0.0
+    high = 1.0
+    for i in range(nc):
+        kmo = ki_ray[i] - 1
+        subcool += zi_ray[i] * kmo
+        superheat += zi_ray[i] * kmo / ki_ray[i]
+        kmax = max(kmax, ki_ray[i])
+        kmin = min(kmin, ki_ray[i])
+        if kmo > 0:  # same window as rachford_rice.rr_bounds
+            low = max(low, (ki_ray[i] * zi_ray[i] - 1) / kmo)
+        elif kmo < 0:
+            high = min(high, (1 - zi_ray[i]) / -kmo)
+    if subcool <= 0:
+        return 0.0
+    if superheat >= 0:
+        return 1.0
+
+    asym_min = 1 / (1 - kmax)
+    asym_max = 1 / (1 - kmin)
+    if not low < beta < high:
+        beta = (low + high) / 2
+
+    for _ in range(maxiter):
+        rrf_sum = 0.0
+        rrd_sum = 0.0
+        for i in range(nc):
+            kmo = ki_ray[i] - 1
+            den = 1 + beta * kmo
+            rrf_sum += zi_ray[i] * kmo / den
+            rrd_sum -= zi_ray[i] * kmo * kmo / (den * den)  # no division by zi, it can be zero
+        if rrf_sum > 0:  # g falls with beta, the root is above
+            low = beta
+        elif rrf_sum < 0:
+            high = beta
+        else:
+            return beta
+
+        dmin = beta - asym_min
+        dmax = asym_max - beta
+        hfun = dmin * dmax * rrf_sum
+        hder = dmin * dmax * rrd_sum + (dmax - dmin) * rrf_sum
+        beta_nxt = beta - hfun / hder
+        if not low <= beta_nxt <= high:
+            beta_nxt = (low + high) / 2
+        if abs(beta_nxt - beta) < tol:
+            return beta_nxt
+        beta = beta_nxt
+    return beta
+
+
+@jit
+def flash_ss_loop(
+    pabs: float,
+    tabs: float,
+    zi_ray: np.ndarray,
+    bi_ray: np.ndarray,
+    sqai_ray: np.ndarray,
+    kmat: np.ndarray,
+    delta1: float,
+    delta2: float,
+    lnk: np.ndarray,
+    gtol: float,
+    ktriv: float,
+    maxiter: int,
+) -> tuple[np.ndarray, np.ndarray, float, int, float]:
+    """Accelerated Successive Substitution Flash, the substitution part of flash.flash_ssgdem
+
+    Every fifth step is extrapolated with the dominant eigenvalue of the last two updates.
+
+    Args:
+        pabs (float): Absolute Evaluation Pressure, psia
+        tabs (float): Absolute Evaluation Temp, rankine
+        zi_ray (np.ndarray): Feed Mixture Molar Fractions
+        bi_ray (np.ndarray): Cubic EOS b values
+        sqai_ray (np.ndarray): Square root of Cubic EOS a values
+        kmat (np.ndarray): Matrix of (1 - kij) from mixing_rules.bini_matrix
+        delta1 (float): First Volume Constant of the Equation of State
+        delta2 (float): Second Volume Constant of the Equation of State
+        lnk (np.ndarray): Starting Log of Equilibrium Ratios, updated in place
+        gtol (float): Largest Fugacity Residual at the Answer
+        ktriv (float): Largest ln K of the Trivial Solution
+        maxiter (int): Maximum Number of Substitutions
+
+    Returns:
+        xi_ray (np.ndarray): Liquid Molar Fractions
+        yi_ray (np.ndarray): Vapor Molar Fractions
+        beta (float): Vapor Mole Fraction, Total Mixture
+        niter (int): Number of Substitution Steps
+        gmax (float): Largest Fugacity Residual, nan if a phase had no root
+    """
+    ngdem = 5  # accelerate every this many substitution steps
+    nc = zi_ray.size
+    xi_ray = np.empty(nc)
+    yi_ray = np.empty(nc)
+    ki_ray = np.empty(nc)
+    lnphi_liq = np.empty(nc)
+    lnphi_vap = np.empty(nc)
+    dlnk = np.empty(nc)
+    dlnk_old = np.zeros(nc)
+    have_old = False
+    beta = 0.5
+    niter = 0
+    gmax = math.inf
+
+    while True:
+        for i in range(nc):
+            ki_ray[i] = math.exp(lnk[i])
+        beta = rr_loop(zi_ray, ki_ray, beta, 1e-12, 50)
+        xsum = 0.0
+        ysum = 0.0
+        for i in range(nc):
+            xi_ray[i] = zi_ray[i] / (1 - beta + beta * ki_ray[i])
+            yi_ray[i] = ki_ray[i] * xi_ray[i]
+            xsum += xi_ray[i]
+            ysum += yi_ray[i]
+        for i in range(nc):
+            xi_ray[i] /= xsum
+            yi_ray[i] /= ysum
+
+        lnphi_loop(pabs, tabs, xi_ray, bi_ray, sqai_ray, kmat, delta1, delta2, 0, lnphi_liq)
+        lnphi_loop(pabs, tabs, yi_ray, bi_ray, sqai_ray, kmat, delta1, delta2, 1, lnphi_vap)
+        gmax = 0.0
+        kbig = 0.0
+        for i in range(nc):
+            dlnk[i] = lnphi_liq[i] - lnphi_vap[i] - lnk[i]  # minus the residual
+            gmax = max(gmax, abs(dlnk[i]))
+            kbig = max(kbig, abs(lnk[i]))
+        if not math.isfinite(gmax):
+            return xi_ray, yi_ray, beta, niter, math.nan
+        if gmax < gtol or kbig < ktriv or niter >= maxiter:
+            return xi_ray, yi_ray, beta, niter, gmax
+
+        niter += 1
+        if niter % ngdem == 0 and have_old:
+            num = 0.0
+            den = 0.0
+            for i in range(nc):
+                num += dlnk[i] * dlnk[i]
+                den += dlnk_old[i] * dlnk[i]
+            lam = num / den if den != 0 else 0.0  # numba raises on a division by zero
+            if 0 < lam < 1:
+                for i in range(nc):
+                    dlnk[i] /= 1 - lam  # sum of the geometric series of the dominant mode
+        for i in range(nc):
+            lnk[i] += dlnk[i]
+            dlnk_old[i] = dlnk[i]
+        have_old = niter % ngdem != 0
+
+
+def flash_ss(
+    pabs: float,
+    tabs: float,
+    zi_ray: np.ndarray,
+    bi_ray: np.ndarray,
+    sqai_ray: np.ndarray,
+    kmat: np.ndarray,
+    ki_ray: np.ndarray,
+    gtol: float,
+    ktriv: float,
+    maxiter: int = 200,
+    eos: cb.CubicEOS = cb.PR,
+) -> tuple[np.ndarray, np.ndarray, float, int, float, np.ndarray]:
+    """Compiled Substitution Flash from Equilibrium Ratios
+
+    Args:
+        pabs (float): Absolute Evaluation Pressure, psia
+        tabs (float): Absolute Evaluation Temp, rankine
+        zi_ray (np.ndarray): Feed Mixture Molar Fractions
+        bi_ray (np.ndarray): Cubic EOS b values
+        sqai_ray (np.ndarray): Square root of Cubic EOS a values
+        kmat (np.ndarray): Matrix of (1 - kij) from mixing_rules.bini_matrix
+        ki_ray (np.ndarray): Starting Equilibrium Ratios, stability or Wilson
+        gtol (float): Largest Fugacity Residual at the Answer
+        ktriv (float): Largest ln K of the Trivial Solution
+        maxiter (int): Maximum Number of Substitutions
+        eos (cb.CubicEOS): Equation of State, cubic.PR or cubic.SRK
+
+    Returns:
+        xi_ray (np.ndarray): Liquid Molar Fractions
+        yi_ray (np.ndarray): Vapor Molar Fractions
+        beta (float): Vapor Mole Fraction, Total Mixture
+        niter (int): Number of Substitution Steps
+        gmax (float): Largest Fugacity Residual, nan if a phase had no root
+        lnk (np.ndarray): Log of Equilibrium Ratios at the last step
+    """
+    lnk = np.log(np.asarray(ki_ray, dtype=float))  # a new array, the loop updates it in place
+    args = (float(pabs), float(tabs), *(np.ascontiguousarray(ray, dtype=float) for ray in (zi_ray, bi_ray, sqai_ray)))
+    xi_ray, yi_ray, beta, niter, gmax = flash_ss_loop(
+        *args, np.ascontiguousarray(kmat, dtype=float), eos.delta1, eos.delta2, lnk, gtol, ktriv, maxiter
+    )
+    return xi_ray, yi_ray, beta, niter, gmax, lnk
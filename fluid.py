@@ -0,0 +1,198 @@
+"""Compiled Fluid
+
+A mixture checked once and turned into contiguous arrays, so solvers called thousands of times
+on the same feed skip the dictionary lookups. Every solver in overall, envelope and flash_cache
+takes a Fluid in place of the composition dictionary, the property and binary tables are then
+not needed.
+
+    fluid = Fluid(comp_dict, prop_dict, bini_dict)
+    pbub = overall.bubblepoint_pressure(100, fluid)
+"""
+
+from collections import OrderedDict
+
+import numpy as np
+
+import eos.cubic as cb
+import eos.eos_start as es
+import eos.mixing_rules as mr
+import proptables.crit_vals as ct
+
+_fluid_cache = OrderedDict()  # (composition items, id of prop_dict, id of bini_dict) -> (prop_dict, bini_dict, Fluid)
+_fluid_cache_size = 128  # max number of compositions to keep
+
+
+def comp_verify(comp_dict: dict, prop_dict: dict, bini_dict: dict) -> None:
+    """Composition Verification
+
+    Verify the molar composition sums to one and all the components are present
+
+    Args:
+        comp_dict (dict): Mixture Molar Composition
+        prop_dict (dict): Property Table for Lookup
+        bini_dict (dict): Binary Interaction Table
+
+    Returns:
+        None if no errors are present.
+    """
+    zi_list = comp_dict.values()
+    zi_tot = sum(zi_list)
+    zi_err = 1 - zi_tot
+    err_tot = 1e-3  # how much off can the values be from adding to one
+
+    if abs(zi_err) > err_tot:
+        raise ValueError(f"Molar fractions do not sum to one, Error is {zi_err: .3E}")
+
+    miss_prop = comp_dict.keys() - prop_dict.keys()
+    miss_bini = comp_dict.keys() - bini_dict.keys()
+
+    if bool(miss_prop) is True:
+        raise KeyError(f"{miss_prop} are not defined in property table")
+
+    if bool(miss_bini) is True:
+        raise KeyError(f"{miss_bini} are not defined in binary interaction table")
+
+    return None
+
+
+class Fluid:
+    def __init__(self, comp_dict: dict, prop_dict: dict, bini_dict: dict, verify: bool = True):
+        """Mixture Compiled to Arrays
+
+        The arrays are read only, build a new Fluid for a new composition.
+
+        Args:
+            comp_dict (dict): Mixture Molar Composition
+            prop_dict (dict): Property Table for Lookup
+            bini_dict (dict): Binary Interaction Table
+            verify (bool): Run comp_verify on the inputs, raises ValueError or KeyError
+        """
+        if verify:
+            comp_verify(comp_dict, prop_dict, bini_dict)
+        self.comp_list = list(comp_dict.keys())
+        self.prop_dict = prop_dict
+        self.bini_dict = bini_dict
+        self.zi_ray = np.array(list(comp_dict.values()), dtype=float)
+        rows = ct.gather_props(self.comp_list, prop_dict)
+        self.mw_ray = np.ascontiguousarray(rows["mw"])
+        self.pcrit_ray = np.ascontiguousarray(rows["pcrit"])
+        self.tcrit_ray = np.ascontiguousarray(rows["tcrit"])
+        self.acc_ray = np.ascontiguousarray(rows["acent"])
+        self.kmat = mr.bini_matrix(self.comp_list, bini_dict)
+        for ray in (self.zi_ray, self.mw_ray, self.pcrit_ray, self.tcrit_ray, self.acc_ray):
+            ray.setflags(write=False)
+
+    def __repr__(self):
+        return f"Fluid: {len(self.comp_list)} components, MW: {self.mw_ray @ self.zi_ray:.2f}"
+
+    @property
+    def comp_dict(self) -> dict:
+        """Composition as a Dictionary, component: molar fraction"""
+        return dict(zip(self.comp_list, self.zi_ray.tolist()))
+
+    def ab_rays(self, tabs: float, eos: cb.CubicEOS = cb.PR) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Component a and b Arrays at one Temperature, through cubic.cubic_ab_cache
+
+        Args:
+            tabs (float): Absolute Temperature, rankine
+            eos (cb.CubicEOS): Equation of State, cubic.PR or cubic.SRK
+
+        Returns:
+            ai_ray (np.ndarray): a values, psia-ft6/(lbmol2)
+            bi_ray (np.ndarray): b values, ft3/lbmol
+            sqai_ray (np.ndarray): Square root of a values
+        """
+        return cb.cubic_ab_cache(tabs, self.comp_list, self.prop_dict, eos)
+
+    def ab_temp(self, tabs: np.ndarray, eos: cb.CubicEOS = cb.PR) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Component a and b Arrays over Temperatures, pass tabs as a column for (m, n) arrays
+
+        Args:
+            tabs (np.ndarray): Absolute Temperatures, rankine
+            eos (cb.CubicEOS): Equation of State, cubic.PR or cubic.SRK
+
+        Returns:
+            ai_ray (np.ndarray): a values, psia-ft6/(lbmol2)
+            bi_ray (np.ndarray): b values, ft3/lbmol
+            sqai_ray (np.ndarray): Square root of a values
+        """
+        return cb.cubic_ab_crit(tabs, self.pcrit_ray, self.tcrit_ray, self.acc_ray, eos)
+
+    def wilson_ki(self, pabs: np.ndarray, tabs: np.ndarray) -> np.ndarray:
+        """Wilson Equilibrium Constants, pass pabs and tabs as columns for (m, n) arrays
+
+        Args:
+            pabs (np.ndarray): Absolute Pressures, psia
+            tabs (np.ndarray): Absolute Temperatures, rankine
+
+        Returns:
+            ki_ray (np.ndarray): Wilson Equilibrium Constants
+        """
+        return es.wilson_ki_crit(pabs, tabs, self.pcrit_ray, self.tcrit_ray, self.acc_ray)
+
+    def wilson_temp(self, pabs: float, beta: float) -> float:
+        """Wilson Saturation Temperature Guess, same as eos_start.wilson_bubble_temp and wilson_dew_temp
+
+        Args:
+            pabs (float): Absolute Pressure, psia
+            beta (float): Vapor Mole Fraction, 0 for Bubble Point, 1 for Dew Point
+
+        Returns:
+            tabs (float): Saturation Temperature Guess, rankine
+        """
+        return es.wilson_temp_crit(pabs, self.zi_ray, self.pcrit_ray, self.tcrit_ray, self.acc_ray, beta)
+
+    def bubblepoint_guess(self, tabs: float) -> float:
+        """Al-Safran Bubble Point Pressure Guess, same as eos_start.bubblepoint_guess
+
+        Args:
+            tabs (float): Absolute Temperature, rankine
+
+        Returns:
+            pbub (float): Guessed Bubble Point Pressure, psia
+        """
+        pbi = es.safran_cfifteen(tabs, self.zi_ray, self.pcrit_ray, self.tcrit_ray, self.acc_ray)
+        return float(np.sum(pbi))
+
+    def dewpoint_guess(self, tabs: float) -> float:
+        """Al-Safran Dew Point Pressure Guess, same as eos_start.dewpoint_guess
+
+        Args:
+            tabs (float): Absolute Temperature, rankine
+
+        Returns:
+            pdew (float): Guessed Dew Point Pressure, psia
+        """
+        pdi = es.safran_ceighteen(tabs, self.zi_ray, self.pcrit_ray, self.tcrit_ray, self.acc_ray)
+        return float(1 / np.sum(pdi))
+
+
+def as_fluid(comp_dict: dict | Fluid, prop_dict: dict | None = None, bini_dict: dict | None = None) -> Fluid:
+    """Fluid from the Solver Arguments
+
+    A Fluid is passed through untouched. A composition dictionary is compiled without
+    comp_verify, same as the solvers have always treated it. The Fluid is stored on the
+    composition and the ids of the tables, like mixing_rules.bini_matrix, so repeated calls
+    with the same feed skip the compile. Its arrays are read only, sharing it is safe.
+
+    Args:
+        comp_dict (dict | Fluid): Mixture Molar Composition or a compiled Fluid
+        prop_dict (dict): Property Table for Lookup, not needed with a Fluid
+        bini_dict (dict): Binary Interaction Table, not needed with a Fluid
+
+    Returns:
+        fluid (Fluid): Compiled Mixture
+    """
+    if isinstance(comp_dict, Fluid):
+        return comp_dict
+    key = (tuple(comp_dict.items()), id(prop_dict), id(bini_dict))
+    hit = _fluid_cache.get(key)
+    if hit is not None and hit[0] is prop_dict and hit[1] is bini_dict:  # ids can be reused if a table was deleted
+        _fluid_cache.move_to_end(key)
+        return hit[2]
+
+    fluid = Fluid(comp_dict, prop_dict, bini_dict, verify=False)
+    _fluid_cache[key] = (prop_dict, bini_dict, fluid)
+    if len(_fluid_cache) > _fluid_cache_size:
+        _fluid_cache.popitem(last=False)
+    return fluid
@@ -5,6 +5,8 @@ A place to keep various optimization and numerical iteration routies.
 
 import math
 
+import numpy as np
+
 
 # https://docs.python.org/3/library/string.html#formatspec
 def mix_comp_table(mix_comp: dict, xi_list: list, yi_list: list) -> str:
@@ -57,3 +59,120 @@ def nv_secant(nv1: float, nv2: float, xsum1: float, xsum2: float) -> float:
     xsum2 -= 1  # subtract one, to solve to zero
     nv3 = nv2 - xsum2 * (nv1 - nv2) / (xsum1 - xsum2)
     return nv3
+
+
+def cubic_roots(c2: np.ndarray, c1: np.ndarray, c0: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """Smallest and Largest Real Roots of a Cubic
+
+    Closed form roots of z^3 + c2 * z^2 + c1 * z + c0 = 0 for any number of cubics at once.
+    Three real roots use the trigonometric form, one real root uses Cardano. Both are then
+    polished with two Halley steps. When only one real root exists it is returned twice.
+
+    Args:
+        c2 (np.ndarray): Coefficient of z^2
+        c1 (np.ndarray): Coefficient of z
+        c0 (np.ndarray): Constant Coefficient
+
+    Return:
+        zmin (np.ndarray): Smallest Real Root
+        zmax (np.ndarray): Largest Real Root
+    """
+    if np.ndim(c2) == 0 and np.ndim(c1) == 0 and np.ndim(c0) == 0:
+        return cubic_roots_scalar(float(c2), float(c1), float(c0))  # numpy overhead dominates one cubic
+
+    c2, c1, c0 = np.broadcast_arrays(*(np.asarray(c, dtype=float) for c in (c2, c1, c0)))
+    if c2.size == 1:
+        zmin, zmax = cubic_roots_scalar(c2.item(), c1.item(), c0.item())
+        return np.full(c2.shape, zmin), np.full(c2.shape, zmax)
+
+    # depressed cubic t^3 + p * t + q = 0, where z = t - c2 / 3
+    shift = c2 / 3
+    p = c1 - c2 * shift
+    q = 2 * shift**3 - shift * c1 + c0
+    disc = (q / 2) ** 2 + (p / 3) ** 3
+
+    # one real root, cardano
+    sdisc = np.sqrt(np.maximum(disc, 0))
+    tone = np.cbrt(-q / 2 + sdisc) + np.cbrt(-q / 2 - sdisc)
+
+    # three real roots, trigonometric, p is negative here unless it is a triple root
+    rad = np.sqrt(np.maximum(-p / 3, 0))
+    safe = np.where(rad > 0, rad, 1)
+    theta = np.arccos(np.clip(-q / (2 * safe**3), -1, 1)) / 3
+    tmax = 2 * rad * np.cos(theta)
+    tmin = 2 * rad * np.cos(theta + 2 * np.pi / 3)
+
+    three = disc < 0
+    zmin = np.where(three, tmin, tone) - shift
+    zmax = np.where(three, tmax, tone) - shift
+
+    zmin = cubic_halley(zmin, c2, c1, c0)
+    zmax = cubic_halley(zmax, c2, c1, c0)
+    return zmin, zmax
+
+
+def cubic_roots_scalar(c2: float, c1: float, c0: float) -> tuple[float, float]:
+    """Smallest and Largest Real Roots of a Single Cubic
+
+    Same method as cubic_roots, written with the math module for a single cubic.
+
+    Args:
+        c2 (float): Coefficient of z^2
+        c1 (float): Coefficient of z
+        c0 (float): Constant Coefficient
+
+    Return:
+        zmin (float): Smallest Real Root
+        zmax (float): Largest Real Root
+    """
+    shift = c2 / 3
+    p = c1 - c2 * shift
+    q = 2 * shift**3 - shift * c1 + c0
+    disc = (q / 2) ** 2 + (p / 3) ** 3
+
+    if disc < 0:
+        rad = math.sqrt(-p / 3)
+        theta = math.acos(max(-1.0, min(1.0, -q / (2 * rad**3)))) / 3
+        zmin = 2 * rad * math.cos(theta + 2 * math.pi / 3) - shift
+        zmax = 2 * rad * math.cos(theta) - shift
+    else:
+        sdisc = math.sqrt(disc)
+        u = -q / 2 + sdisc
+        v = -q / 2 - sdisc
+        zmin = zmax = math.copysign(abs(u) ** (1 / 3), u) + math.copysign(abs(v) ** (1 / 3), v) - shift
+
+    roots = []
+    for z in (zmin, zmax):
+        for _ in range(2):
+            f = ((z + c2) * z + c1) * z + c0
+            df = (3 * z + 2 * c2) * z + c1
+            den = 2 * df**2 - f * (6 * z + 2 * c2)
+            if den != 0:
+                z = z - 2 * f * df / den
+        roots.append(float(z))
+    return roots[0], roots[1]
+
+
+def cubic_halley(z: np.ndarray, c2: np.ndarray, c1: np.ndarray, c0: np.ndarray, steps: int = 2) -> np.ndarray:
+    """Halley Polish of Cubic Roots
+
+    Cleans up the round off from the closed form solution. Steps with a zero
+    denominator, such as a triple root, are skipped.
+
+    Args:
+        z (np.ndarray): Root Estimates
+        c2 (np.ndarray): Coefficient of z^2
+        c1 (np.ndarray): Coefficient of z
+        c0 (np.ndarray): Constant Coefficient
+        steps (int): Number of Halley Steps
+
+    Return:
+        z (np.ndarray): Polished Roots
+    """
+    for _ in range(steps):
+        f = ((z + c2) * z + c1) * z + c0
+        df = (3 * z + 2 * c2) * z + c1
+        ddf = 6 * z + 2 * c2
+        den = 2 * df**2 - f * ddf
+        z = z - np.where(den != 0, 2 * f * df / np.where(den != 0, den, 1), 0)
+    return z
@@ -2,16 +2,21 @@ import math
 
 import numpy as np
 
-import eos.eos_start as es
-import eos.peng_robinson as pr
-import num_methods as nm
+import critical as cr
+import eos.cubic as cb
+import flash as fl
+import fluid as fd
 import rachford_rice as rr
+import saturation as sat
+import stability as st
+import telemetry as tm
 
 
 def comp_verify(comp_dict: dict, prop_dict: dict, bini_dict: dict) -> None:
-    """Composition Verification
+    """Composition Verification, see fluid.comp_verify
 
-    Verify the molar composition sums to one and all the components are present
+    Verify the molar composition sums to one and all the components are present.
+    Building a fluid.Fluid runs the same checks.
 
     Args:
         comp_dict (dict): Mixture Molar Composition
@@ -21,161 +26,514 @@ def comp_verify(comp_dict: dict, prop_dict: dict, bini_dict: dict) -> None:
     Returns:
         None if no errors are present.
     """
-    zi_list = comp_dict.values()
-    zi_tot = sum(zi_list)
-    zi_err = 1 - zi_tot
-    err_tot = 1e-3  # how much off can the values be from adding to one
+    return fd.comp_verify(comp_dict, prop_dict, bini_dict)
 
-    if abs(zi_err) > err_tot:
-        raise ValueError(f"Molar fractions do not sum to one, Error is {zi_err: .3E}")
 
-    miss_prop = comp_dict.keys() - prop_dict.keys()
-    miss_bini = comp_dict.keys() - bini_dict.keys()
+def bubblepoint_pressure(
+    teval: float,
+    comp_dict: dict | fd.Fluid,
+    prop_dict: dict | None = None,
+    bini_dict: dict | None = None,
+    eos: cb.CubicEOS = cb.PR,
+) -> float:
+    """Cubic EOS Bubble Point Pressure
 
-    if bool(miss_prop) is True:
-        raise KeyError(f"{miss_prop} are not defined in property table")
-
-    if bool(miss_bini) is True:
-        raise KeyError(f"{miss_bini} are not defined in binary interaction table")
-
-    return None
-
-
-def bubblepoint_pressure(teval: float, comp_dict: dict, prop_dict: dict, bini_dict: dict) -> float:
-    """Peng Robinson Bubble Point Pressure
+    Starts from the Al-Safran bubble point guess and Wilson K values, then solves ln K and ln P
+    together with saturation.sat_pressure. The iteration count goes to an open telemetry record.
+    Next to the critical point those guesses fail or land on the other curve with the K values
+    flipped, the solve is then redone from saturation_critical.
 
     Args:
         teval (float): Evaluation Temperature, deg F
-        comp_dict (dict): Mixture Molar Composition
-        prop_dict (dict): Property Table for Lookup
-        bini_dict (dict): Binary Interaction Table
+        comp_dict (dict | fd.Fluid): Mixture Molar Composition, or a compiled fluid.Fluid
+        prop_dict (dict): Property Table for Lookup, not needed with a Fluid
+        bini_dict (dict): Binary Interaction Table, not needed with a Fluid
+        eos (cb.CubicEOS): Equation of State, cubic.PR or cubic.SRK
 
     Returns:
-        pbub (float): Bubble Point Pressure, psig
+        pbub (float): Bubble Point Pressure, psig, raises ValueError if there is none at teval
     """
-    comp_list = list(comp_dict.keys())
-    zi_list = list(comp_dict.values())
-    xi_list = zi_list.copy()
-
     tabs = teval + 459.67
-    plist = [es.bubblepoint_guess(tabs, comp_dict, prop_dict)]  # starting / guess pressure
-
-    ki_list = es.wilson_ki_list(plist[-1], tabs, comp_list, zi_list, prop_dict, bini_dict)
-    yi_list = [rr.vapor_frac(zi, ki, 0) for zi, ki in zip(zi_list, ki_list)]
-
-    ki_list = pr.pengrob_ki_list(plist[-1], tabs, comp_list, xi_list, yi_list, prop_dict, bini_dict)
-    yi_list = [rr.vapor_frac(zi, ki, 0) for zi, ki in zip(zi_list, ki_list)]
-    yi_tot_list = [sum(yi_list)]  # store this, do secant on this value
-
-    # rough approximation for going up or down, before secant method takes over
-    if yi_tot_list[0] > 0:
-        plist.append(plist[0] + 50)
-    else:
-        plist.append(plist[0] - 50)
-
-    pdiff = 0.001  # how much the iteration needs to change
-    while abs(plist[-2] - plist[-1]) > pdiff:
-        ki_list = pr.pengrob_ki_list(plist[-1], tabs, comp_list, xi_list, yi_list, prop_dict, bini_dict)
-        yi_list = [rr.vapor_frac(zi, ki, 0) for zi, ki in zip(zi_list, ki_list)]
-        yi_tot_list.append(sum(yi_list))
+    fluid = fd.as_fluid(comp_dict, prop_dict, bini_dict)
+    pabs = fluid.bubblepoint_guess(tabs)
+    try:
+        return saturation_pressure(pabs, tabs, fluid, None, None, 0.0, eos)
+    except ValueError:
+        return saturation_critical(tabs, fluid, None, None, 0.0, eos)
+
+
+def dewpoint_pressure(
+    teval: float,
+    comp_dict: dict | fd.Fluid,
+    prop_dict: dict | None = None,
+    bini_dict: dict | None = None,
+    eos: cb.CubicEOS = cb.PR,
+) -> float:
+    """Cubic EOS Dew Point Pressure
+
+    Starts from the Al-Safran dew point guess and Wilson K values, then solves ln K and ln P
+    together with saturation.sat_pressure. The iteration count goes to an open telemetry record.
+    Next to the critical point those guesses fail or land on the other curve with the K values
+    flipped, the solve is then redone from saturation_critical.
 
-        plist.append(nm.psi_secant(plist[-2], plist[-1], yi_tot_list[-2], yi_tot_list[-1]))
+    Args:
+        teval (float): Evaluation Temperature, deg F
+        comp_dict (dict | fd.Fluid): Mixture Molar Composition, or a compiled fluid.Fluid
+        prop_dict (dict): Property Table for Lookup, not needed with a Fluid
+        bini_dict (dict): Binary Interaction Table, not needed with a Fluid
+        eos (cb.CubicEOS): Equation of State, cubic.PR or cubic.SRK
 
-    return plist[-1] - 14.7
+    Returns:
+        pdew (float): Dew Point Pressure, psig, raises ValueError if there is none at teval
+    """
+    tabs = teval + 459.67
+    fluid = fd.as_fluid(comp_dict, prop_dict, bini_dict)
+    pabs = fluid.dewpoint_guess(tabs)
+    try:
+        return saturation_pressure(pabs, tabs, fluid, None, None, 1.0, eos)
+    except ValueError:
+        return saturation_critical(tabs, fluid, None, None, 1.0, eos)
+
+
+def saturation_pressure(
+    pabs: float,
+    tabs: float,
+    comp_dict: dict | fd.Fluid,
+    prop_dict: dict | None,
+    bini_dict: dict | None,
+    beta: float,
+    eos: cb.CubicEOS = cb.PR,
+) -> float:
+    """Saturation Pressure from a Starting Pressure
 
+    Args:
+        pabs (float): Starting Pressure, psia
+        tabs (float): Evaluation Temperature, rankine
+        comp_dict (dict | fd.Fluid): Mixture Molar Composition, or a compiled fluid.Fluid
+        prop_dict (dict): Property Table for Lookup, not needed with a Fluid
+        bini_dict (dict): Binary Interaction Table, not needed with a Fluid
+        beta (float): Vapor Mole Fraction, 0 for Bubble Point, 1 for Dew Point
+        eos (cb.CubicEOS): Equation of State, cubic.PR or cubic.SRK
 
-def dewpoint_pressure(teval: float, comp_dict: dict, prop_dict: dict, bini_dict: dict) -> float:
-    """Peng Robinson Dew Point Pressure
+    Returns:
+        psat (float): Saturation Pressure, psig
+    """
+    rec = tm.active.get()
+    fluid = fd.as_fluid(comp_dict, prop_dict, bini_dict)
+    lnk = np.log(fluid.wilson_ki(pabs, tabs))
+    if rec is not None:
+        rec.lap("guess")
+
+    X, _ = sat.sat_pressure(
+        lnk, pabs, tabs, fluid.zi_ray, beta, fluid.comp_list, fluid.prop_dict, fluid.kmat, eos=eos
+    )
+    if rec is not None:
+        rec.lap("newton")
+    if X[:-2] @ lnk < 0:
+        raise ValueError("Saturation point converged with the K values flipped, it is on the other curve")
+    return math.exp(X[-1]) - 14.7
+
+
+def saturation_critical(
+    tabs: float,
+    comp_dict: dict | fd.Fluid,
+    prop_dict: dict | None,
+    bini_dict: dict | None,
+    beta: float,
+    eos: cb.CubicEOS = cb.PR,
+) -> float:
+    """Saturation Pressure next to the Critical Point
+
+    Starts at the critical pressure from critical.critical_state with ln K a short way down the
+    curve from critical.critical_lnk, a longer and shorter way are tried if that fails. Farther
+    from the critical point none of those starts is close, the curve is then stepped along from
+    the critical point until it reaches the temperature. Only the branch that ends at the critical
+    point is followed from each side, the bubble curve below the critical temperature and the upper
+    dew curve above it.
 
     Args:
-        teval (float): Evaluation Temperature, deg F
-        comp_dict (dict): Mixture Molar Composition
-        prop_dict (dict): Property Table for Lookup
-        bini_dict (dict): Binary Interaction Table
+        tabs (float): Evaluation Temperature, rankine
+        comp_dict (dict | fd.Fluid): Mixture Molar Composition, or a compiled fluid.Fluid
+        prop_dict (dict): Property Table for Lookup, not needed with a Fluid
+        bini_dict (dict): Binary Interaction Table, not needed with a Fluid
+        beta (float): Vapor Mole Fraction, 0 for Bubble Point, 1 for Dew Point
+        eos (cb.CubicEOS): Equation of State, cubic.PR or cubic.SRK
 
     Returns:
-        pdew (float): Dew Point Pressure, psig
+        psat (float): Saturation Pressure, psig, raises ValueError if there is none
     """
-    comp_list = list(comp_dict.keys())
-    zi_list = list(comp_dict.values())
-    yi_list = zi_list.copy()
+    fluid = fd.as_fluid(comp_dict, prop_dict, bini_dict)
+    tcrit, vcrit, dn_ray = cr.critical_state(fluid, eos)
+    kind = "bubble" if beta == 0 else "dew"
+    if np.count_nonzero(fluid.zi_ray) == 1:  # saturation.sat_pure already failed, there is no curve to follow
+        teval, tcrit = tabs - 459.67, tcrit - 459.67
+        raise ValueError(f"No {kind} point of a single component at {teval:.2f} deg F, critical at {tcrit:.2f} deg F")
+    if (beta == 0) == (tabs > tcrit):
+        side = "above" if tabs > tcrit else "below"
+        raise ValueError(f"No {kind} point near the critical point {side} its temperature, {tcrit - 459.67:.2f} deg F")
+
+    pabs = cr.critical_pressure(tcrit, vcrit, fluid, eos)
+    for scale in (0.05, 0.1, 0.2, 0.02):
+        lnk = cr.critical_lnk(tcrit, vcrit, dn_ray, fluid, scale, eos)
+        try:
+            X, _ = sat.sat_pressure(
+                lnk, pabs, tabs, fluid.zi_ray, beta, fluid.comp_list, fluid.prop_dict, fluid.kmat, eos=eos
+            )
+        except ValueError:
+            continue
+        if X[:-2] @ lnk > 0:  # not the other curve with the K values flipped
+            return math.exp(X[-1]) - 14.7
+
+    # farther from the critical point a start at tabs is too far off, step down the curve to it instead
+    lnk = cr.critical_lnk(tcrit, vcrit, dn_ray, fluid, 0.05, eos)
+    try:
+        X = _critical_march(tabs, tcrit, pabs, lnk, fluid, beta, eos)
+    except (ValueError, np.linalg.LinAlgError):
+        X = None
+    if X is not None and X[:-2] @ lnk > 0:
+        return math.exp(X[-1]) - 14.7
+    raise ValueError(f"No {kind} point found from the critical point at {tabs - 459.67:.2f} deg F")
+
+
+def _critical_march(
+    tabs: float, tcrit: float, pcrit: float, lnk: np.ndarray, fluid: fd.Fluid, beta: float, eos: cb.CubicEOS
+) -> np.ndarray:
+    """Saturation Point at tabs Reached by Stepping the Largest ln K out from the Critical Point
+
+    Each step starts from a linear extrapolation along the curve, as in envelope.phase_envelope, and the
+    step that would pass tabs is replaced by a solve with ln T held there. Raises ValueError if the curve
+    does not head toward tabs.
+    """
+    nc = fluid.zi_ray.size
+    args = (fluid.zi_ray, beta, fluid.comp_list, fluid.prop_dict, fluid.kmat)
+    kref = int(np.argmax(abs(lnk)))
+    X = np.concatenate((lnk, [math.log(tcrit), math.log(pcrit)]))
+    X, jac, _ = sat.sat_newton(X, kref, X[kref], *args, maxiter=10, eos=eos)
+
+    ltarget = math.log(tabs)
+    rhs = np.zeros(nc + 2)
+    rhs[-1] = 1
+    dS = X[kref]  # step in the largest ln K, grows while the solves are quick
+    for _ in range(50):
+        sens = np.linalg.solve(jac, rhs)
+        dX = sens * dS
+        if (X[nc] + dX[nc] - ltarget) * (X[nc] - ltarget) <= 0:  # the step passes tabs, land on it
+            Xguess = X + sens * (ltarget - X[nc]) / sens[nc]
+            X, _, _ = sat.sat_newton(Xguess, nc, ltarget, *args, eos=eos)
+            return X
+        if dX[nc] * (ltarget - X[nc]) < 0:
+            raise ValueError("Saturation curve heads away from the temperature")
+        try:
+            X, jac, niter = sat.sat_newton(X + dX, kref, X[kref] + dX[kref], *args, maxiter=8, eos=eos)
+        except (ValueError, np.linalg.LinAlgError):
+            dS /= 2
+            continue
+        dS *= 1.5 if niter <= 3 else 1.0
+    raise ValueError("Saturation curve did not reach the temperature")
+
+
+def bubblepoint_temperature(
+    peval: float,
+    comp_dict: dict | fd.Fluid,
+    prop_dict: dict | None = None,
+    bini_dict: dict | None = None,
+    eos: cb.CubicEOS = cb.PR,
+) -> float:
+    """Cubic EOS Bubble Point Temperature
+
+    Starts from the Wilson bubble point temperature and K values, then solves ln K and ln T
+    together with saturation.sat_temperature. The iteration count goes to an open telemetry record.
 
-    tabs = teval + 459.67
-    plist = [es.dewpoint_guess(tabs, comp_dict, prop_dict)]  # starting / guess pressure
+    Args:
+        peval (float): Evaluation Pressure, psig
+        comp_dict (dict | fd.Fluid): Mixture Molar Composition, or a compiled fluid.Fluid
+        prop_dict (dict): Property Table for Lookup, not needed with a Fluid
+        bini_dict (dict): Binary Interaction Table, not needed with a Fluid
+        eos (cb.CubicEOS): Equation of State, cubic.PR or cubic.SRK
 
-    ki_list = es.wilson_ki_list(plist[-1], tabs, comp_list, zi_list, prop_dict, bini_dict)
-    xi_list = [rr.liquid_frac(zi, ki, 1) for zi, ki in zip(zi_list, ki_list)]
+    Returns:
+        tbub (float): Bubble Point Temperature, deg F, raises ValueError if there is none at peval
+    """
+    pabs = peval + 14.7
+    fluid = fd.as_fluid(comp_dict, prop_dict, bini_dict)
+    tabs = fluid.wilson_temp(pabs, 0.0)
+    return saturation_temperature(pabs, tabs, fluid, None, None, 0.0, eos)
 
-    ki_list = pr.pengrob_ki_list(plist[-1], tabs, comp_list, xi_list, yi_list, prop_dict, bini_dict)
-    xi_list = [rr.liquid_frac(zi, ki, 1) for zi, ki in zip(zi_list, ki_list)]
-    xi_tot_list = [sum(xi_list)]
 
-    # rough approximation for going up or down, before secant method takes over
-    if xi_tot_list[0] > 0:
-        plist.append(plist[0] + 50)
-    else:
-        plist.append(plist[0] - 50)
+def dewpoint_temperature(
+    peval: float,
+    comp_dict: dict | fd.Fluid,
+    prop_dict: dict | None = None,
+    bini_dict: dict | None = None,
+    eos: cb.CubicEOS = cb.PR,
+) -> float:
+    """Cubic EOS Dew Point Temperature
 
-    pdiff = 0.001  # how much the iteration needs to change
-    while abs(plist[-2] - plist[-1]) > pdiff:
-        ki_list = pr.pengrob_ki_list(plist[-1], tabs, comp_list, xi_list, yi_list, prop_dict, bini_dict)
-        xi_list = [rr.liquid_frac(zi, ki, 1) for zi, ki in zip(zi_list, ki_list)]
-        xi_tot_list.append(sum(xi_list))
+    Starts from the Wilson dew point temperature and K values, then solves ln K and ln T
+    together with saturation.sat_temperature, Pedersen Table 6.2. The iteration count goes
+    to an open telemetry record.
 
-        plist.append(nm.psi_secant(plist[-2], plist[-1], xi_tot_list[-2], xi_tot_list[-1]))
+    Args:
+        peval (float): Evaluation Pressure, psig
+        comp_dict (dict | fd.Fluid): Mixture Molar Composition, or a compiled fluid.Fluid
+        prop_dict (dict): Property Table for Lookup, not needed with a Fluid
+        bini_dict (dict): Binary Interaction Table, not needed with a Fluid
+        eos (cb.CubicEOS): Equation of State, cubic.PR or cubic.SRK
 
-    return plist[-1] - 14.7
+    Returns:
+        tdew (float): Dew Point Temperature, deg F, raises ValueError if there is none at peval
+    """
+    pabs = peval + 14.7
+    fluid = fd.as_fluid(comp_dict, prop_dict, bini_dict)
+    tabs = fluid.wilson_temp(pabs, 1.0)
+    return saturation_temperature(pabs, tabs, fluid, None, None, 1.0, eos)
+
+
+def saturation_temperature(
+    pabs: float,
+    tabs: float,
+    comp_dict: dict | fd.Fluid,
+    prop_dict: dict | None,
+    bini_dict: dict | None,
+    beta: float,
+    eos: cb.CubicEOS = cb.PR,
+) -> float:
+    """Saturation Temperature from a Starting Temperature
 
+    Args:
+        pabs (float): Evaluation Pressure, psia
+        tabs (float): Starting Temperature, rankine
+        comp_dict (dict | fd.Fluid): Mixture Molar Composition, or a compiled fluid.Fluid
+        prop_dict (dict): Property Table for Lookup, not needed with a Fluid
+        bini_dict (dict): Binary Interaction Table, not needed with a Fluid
+        beta (float): Vapor Mole Fraction, 0 for Bubble Point, 1 for Dew Point
+        eos (cb.CubicEOS): Equation of State, cubic.PR or cubic.SRK
 
-def phase_comp(peval: float, teval: float, comp_dict: dict, prop_dict: dict, bini_dict: dict) -> tuple[list, list]:
-    """Peng Robinson Two Phase Composition
+    Returns:
+        tsat (float): Saturation Temperature, deg F
+    """
+    rec = tm.active.get()
+    fluid = fd.as_fluid(comp_dict, prop_dict, bini_dict)
+    lnk = np.log(fluid.wilson_ki(pabs, tabs))
+    if rec is not None:
+        rec.lap("guess")
+
+    X, _ = sat.sat_temperature(
+        lnk, pabs, tabs, fluid.zi_ray, beta, fluid.comp_list, fluid.prop_dict, fluid.kmat, eos=eos
+    )
+    if rec is not None:
+        rec.lap("newton")
+    if X[:-2] @ lnk < 0:
+        raise ValueError("Saturation point converged with the K values flipped, it is on the other curve")
+    return math.exp(X[-2]) - 459.67
+
+
+def phase_comp(
+    peval: float,
+    teval: float,
+    comp_dict: dict | fd.Fluid,
+    prop_dict: dict | None = None,
+    bini_dict: dict | None = None,
+    eos: cb.CubicEOS = cb.PR,
+) -> tuple[list, list]:
+    """Cubic EOS Two Phase Composition
 
     Input a feed composition at a certain pressure and temperature.
-    Output the composition of the xi, the liquid and yi, the vapor
+    Output the composition of the xi, the liquid and yi, the vapor.
+    When the Wilson K values give a Rachford Rice root strictly between zero and one the
+    flash starts from them straight away. Otherwise a stability test runs first, with only
+    the trial phase that can split the feed, a single phase feed returns the feed as both
+    phases without flashing and an unstable feed starts the flash from the stability K values.
+    See flash.flash_ssgdem for the solver. Its substitution and newton step counts go to an
+    open telemetry record, a flash that does not converge raises ValueError.
 
     Args:
         peval (float): Evaluated Pressure, psig
         teval (float): Evaluated Temperature, deg F
-        comp_dict (dict): Mixture Molar Composition
-        prop_dict (dict): Property Table for Lookup
-        bini_dict (dict): Binary Interaction Table
+        comp_dict (dict | fd.Fluid): Mixture Molar Composition, or a compiled fluid.Fluid
+        prop_dict (dict): Property Table for Lookup, not needed with a Fluid
+        bini_dict (dict): Binary Interaction Table, not needed with a Fluid
+        eos (cb.CubicEOS): Equation of State, cubic.PR or cubic.SRK
 
     Returns:
         xi_list (list): Liquid Molar Fraction Composition
         yi_list (list): Vapour Molar Fraction Composition
     """
+    rec = tm.active.get()
     tabs = teval + 459.67
     pabs = peval + 14.7
-    ci_list = list(comp_dict.keys())
-    zi_list = list(comp_dict.values())
-
-    beta = [0.5]  # vapor mole fraction starting point
-
-    ki_list = es.wilson_ki_list(
-        pabs,
-        tabs,
-        ci_list,
-        zi_list,
-        prop_dict,
-        bini_dict,
+    fluid = fd.as_fluid(comp_dict, prop_dict, bini_dict)
+    zi_ray = fluid.zi_ray
+    ki_ray = fluid.wilson_ki(pabs, tabs)
+    if rec is not None:
+        rec.lap("wilson")
+
+    # stability test on the side wilson puts the feed, use its K values as the start when two phases are present
+    ai_ray, bi_ray, sqai_ray = fluid.ab_rays(tabs, eos)
+    kmat = fluid.kmat
+    subcool = rr.rr_subcool(zi_ray, ki_ray)
+    if subcool or rr.rr_superheat(zi_ray, ki_ray):
+        pabs_ray = np.array([pabs])
+        tabs_ray = np.array([tabs])
+        stable, ki_st = st.stability_batch(
+            pabs_ray, tabs_ray, zi_ray, ai_ray, bi_ray, sqai_ray, kmat, ki_ray[None, :], eos=eos, vapor=subcool
+        )
+        if rec is not None:
+            rec.lap("stability")
+        if stable[0]:
+            return zi_ray.tolist(), zi_ray.tolist()
+        ki_ray = ki_st[0]
+
+    xi_ray, yi_ray, beta, niter_ss, niter_newton = fl.flash_ssgdem(
+        pabs, tabs, zi_ray, ai_ray, bi_ray, sqai_ray, kmat, ki_ray, eos=eos
     )
+    if rec is not None:
+        rec.lap("flash")
+        rec.step("substitution", niter_ss)
+        rec.step("newton", niter_newton)
+    if np.isnan(beta):
+        niter = niter_ss + niter_newton
+        raise ValueError(f"Flash did not converge in {niter} iterations at {peval} psig, {teval} deg F")
+    if not 0 < beta < 1:  # a stability test that did not settle can send a single phase here
+        return zi_ray.tolist(), zi_ray.tolist()
+    xi_list = list(xi_ray)
+    yi_list = list(yi_ray)
+    return xi_list, yi_list
 
-    # use wilson to calculate xi and yi fractions, move to peng rob ki
-    xi_list = [rr.liquid_frac(zi, ki, beta[-1]) for zi, ki in zip(zi_list, ki_list)]
-    yi_list = [rr.vapor_frac(zi, ki, beta[-1]) for zi, ki in zip(zi_list, ki_list)]
-    ki_list = pr.pengrob_ki_list(pabs, tabs, ci_list, xi_list, yi_list, prop_dict, bini_dict)
-
-    rrf_tot, rrd_tot = rr.rr_sum(zi_list, ki_list, beta[-1])
-    beta.append(rr.rr_newton(rrf_tot, rrd_tot, beta[-1]))  # calculate next beta
-
-    bdiff = 1e-5  # how much iteration needs to change
-    while abs(beta[-2] - beta[-1]) > bdiff:
 
-        xi_list = [rr.liquid_frac(zi, ki, beta[-1]) for zi, ki in zip(zi_list, ki_list)]
-        yi_list = [rr.vapor_frac(zi, ki, beta[-1]) for zi, ki in zip(zi_list, ki_list)]
-        ki_list = pr.pengrob_ki_list(pabs, tabs, ci_list, xi_list, yi_list, prop_dict, bini_dict)
+def phase_comp_batch(
+    peval: np.ndarray,
+    teval: np.ndarray,
+    comp_dict: dict | fd.Fluid,
+    prop_dict: dict | None = None,
+    bini_dict: dict | None = None,
+    maxiter: int = 200,
+    eos: cb.CubicEOS = cb.PR,
+    zi_rows: np.ndarray | None = None,
+) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Cubic EOS Two Phase Composition over Many Points
+
+    Flash one feed composition at many pressure and temperature points. A stability test
+    screens out single phase points first. The stability K values, the Rachford Rice solve
+    and the fugacity K update then run for the remaining points in lockstep,
+    points drop out of the iteration as they converge. Single phase points return
+    beta of zero or one with both phases equal to the feed. Points that do not converge
+    in maxiter iterations are returned as nan. Each point can have its own feed with zi_rows,
+    the components are then the ones of comp_dict and its fractions are not used.
 
-        rrf_tot, rrd_tot = rr.rr_sum(zi_list, ki_list, beta[-1])
-        beta.append(rr.rr_newton(rrf_tot, rrd_tot, beta[-1]))  # calculate next beta
+    Args:
+        peval (np.ndarray): Evaluated Pressures, psig
+        teval (np.ndarray): Evaluated Temperatures, deg F, broadcast against peval
+        comp_dict (dict | fd.Fluid): Mixture Molar Composition, or a compiled fluid.Fluid
+        prop_dict (dict): Property Table for Lookup, not needed with a Fluid
+        bini_dict (dict): Binary Interaction Table, not needed with a Fluid
+        maxiter (int): Maximum Number of Iterations
+        eos (cb.CubicEOS): Equation of State, cubic.PR or cubic.SRK
+        zi_rows (np.ndarray): Feed Molar Fractions of each Point, shape of the points + (n,)
 
-    return xi_list, yi_list
+    Returns:
+        xi_ray (np.ndarray): Liquid Molar Fractions, shape of the points + (n,)
+        yi_ray (np.ndarray): Vapour Molar Fractions, shape of the points + (n,)
+        beta (np.ndarray): Vapor Mole Fractions, shape of the points
+    """
+    rec = tm.active.get()
+    pabs, tabs = np.broadcast_arrays(np.asarray(peval, dtype=float) + 14.7, np.asarray(teval, dtype=float) + 459.67)
+    shape = pabs.shape
+    pabs = pabs.ravel()
+    tabs = tabs.ravel()
+    npts = pabs.size
+
+    fluid = fd.as_fluid(comp_dict, prop_dict, bini_dict)
+    nc = fluid.zi_ray.size
+    if zi_rows is None:
+        zi_ray = np.broadcast_to(fluid.zi_ray, (npts, nc))
+    else:
+        zi_ray = np.broadcast_to(np.asarray(zi_rows, dtype=float), shape + (nc,)).reshape(npts, nc)
+
+    ai_ray, bi_ray, sqai_ray = fluid.ab_temp(tabs[:, None], eos)
+    kmat = fluid.kmat
+
+    ki = fluid.wilson_ki(pabs[:, None], tabs[:, None])
+    stable, ki = st.stability_batch(pabs, tabs, zi_ray, ai_ray, bi_ray, sqai_ray, kmat, ki, eos=eos)
+    if rec is not None:
+        rec.lap("stability")
+    lnk = np.log(ki)  # stable points are not flashed, their K values only place them on a side below
+    beta = np.full(npts, 0.5)  # vapor mole fraction starting point
+    active = ~stable
+    failed = np.zeros(npts, dtype=bool)
+    niter = 0
+
+    kdiff = 1e-7  # how much ln K needs to change
+    bdiff = 1e-5  # how much beta needs to change
+    ktriv = st.ktriv  # ln K this close to zero is the trivial solution
+    # diverging points overflow on the way to nan, they are reported as failed below
+    with np.errstate(divide="ignore", invalid="ignore", over="ignore"):
+        for _ in range(maxiter):
+            idx = np.flatnonzero(active)
+            if idx.size == 0:
+                break
+            niter += 1
+
+            ki = np.exp(lnk[idx])
+            beta_nxt = rr.rr_solve(zi_ray[idx], ki, beta[idx])
+
+            xi = rr.liquid_frac(zi_ray[idx], ki, beta_nxt[:, None])
+            yi = ki * xi
+            xi /= xi.sum(axis=1, keepdims=True)
+            yi /= yi.sum(axis=1, keepdims=True)
+
+            lnphi_liq, _ = cb.cubic_lnphi(
+                pabs[idx], tabs[idx], xi, ai_ray[idx], bi_ray, sqai_ray[idx], kmat, False, eos
+            )
+            lnphi_vap, _ = cb.cubic_lnphi(
+                pabs[idx], tabs[idx], yi, ai_ray[idx], bi_ray, sqai_ray[idx], kmat, True, eos
+            )
+            lnk_nxt = lnphi_liq - lnphi_vap
+
+            done = (np.max(abs(lnk_nxt - lnk[idx]), axis=1) < kdiff) & (abs(beta_nxt - beta[idx]) < bdiff)
+            done |= np.max(abs(lnk_nxt), axis=1) < ktriv
+            bad = ~np.all(np.isfinite(lnk_nxt), axis=1)  # no physical root, stop iterating it
+
+            lnk[idx] = lnk_nxt
+            beta[idx] = beta_nxt
+            active[idx[done | bad]] = False
+            failed[idx[bad]] = True
+
+    if rec is not None:
+        rec.lap("flash")
+        rec.iterations += niter
+    ki = np.exp(lnk)
+    rrf_liq, _ = rr.rr_sum_batch(zi_ray, ki, np.zeros(npts))  # rr_subcool for every point
+    rrf_vap, _ = rr.rr_sum_batch(zi_ray, ki, np.ones(npts))  # rr_superheat for every point
+    liquid = rrf_liq <= 0
+    vapor = rrf_vap >= 0
+
+    # trivial solutions, with three roots the lowest gibbs energy root picks the phase
+    # with one root, use the Pedersen volume test, V / b < 1.75 is liquid
+    trivial = np.max(abs(lnk), axis=1) < ktriv
+    _, zfeed = cb.cubic_lnphi(pabs, tabs, zi_ray, ai_ray, bi_ray, sqai_ray, kmat, None, eos)
+    _, zliq = cb.cubic_lnphi(pabs, tabs, zi_ray, ai_ray, bi_ray, sqai_ray, kmat, False, eos)
+    _, zvap = cb.cubic_lnphi(pabs, tabs, zi_ray, ai_ray, bi_ray, sqai_ray, kmat, True, eos)
+    bmix = (zi_ray @ bi_ray) * pabs / (cb.rcon * tabs)
+    liquid_root = np.where(zvap - zliq > 1e-10, zfeed == zliq, zfeed / bmix < 1.75)
+    liquid = np.where(trivial, liquid_root, liquid)
+    vapor = np.where(trivial, ~liquid, vapor & ~liquid)
+
+    xi_ray = rr.liquid_frac(zi_ray, ki, beta[:, None])
+    yi_ray = ki * xi_ray
+    xi_ray /= xi_ray.sum(axis=1, keepdims=True)
+    yi_ray /= yi_ray.sum(axis=1, keepdims=True)
+
+    single = liquid | vapor
+    beta = np.where(liquid, 0.0, np.where(vapor, 1.0, beta))
+    xi_ray[single] = zi_ray[single]
+    yi_ray[single] = zi_ray[single]
+
+    failed |= active
+    xi_ray[failed] = np.nan
+    yi_ray[failed] = np.nan
+    beta[failed] = np.nan
+
+    if rec is not None:
+        rec.lap("labels")
+    return xi_ray.reshape(shape + (nc,)), yi_ray.reshape(shape + (nc,)), beta.reshape(shape)
@@ -3,10 +3,22 @@
 Table 6.1 in the Pedersen Book has a good discussion on calculating the bubblepoint pressure of a mixture.
 It requires fugacity coefficients and then some iteration. Table 6.2 discusses how to find the dewpoint
 temperature calculation. Section 6.3 and 6.3.2 talks about how to figure out Flash Calculations for the phases.
+
+prop_dict is the original table, a dictionary of ChemProps. prop_table holds the same values in a structured
+array with a name to row map, any solver takes it in place of prop_dict and gathers a component subset in one
+indexing call. Pseudo components such as a c7+ fraction are added with PropTable.add_component.
 """
 
+from collections.abc import Mapping
+
+import numpy as np
+
+prop_dtype = np.dtype([("mw", "f8"), ("pcrit", "f8"), ("tcrit", "f8"), ("acent", "f8")])  # 32 bytes a component
+
 
 class ChemProps:
+    __slots__ = ("name", "abbrev", "mw", "pcrit", "tcrit", "acent")
+
     def __init__(self, name: str, abbrev: str, mw: float, pcrit: float, tcrit: float, acentric: float):
         self.name = name
         self.abbrev = abbrev
@@ -40,3 +52,100 @@ prop_dict = {
     "h2o": ChemProps("water", "h2o", 18.0153, 3198.8, 1164.83, 0.3443),
     "c7+": ChemProps("Homework Two", "c7+", 216, 230.4, 1279.8, 0.653),
 }
+
+
+class PropTable(Mapping):
+    def __init__(self, prop_dict: dict | None = None):
+        """Component Properties in a Structured Array
+
+        Reads like prop_dict, table[comp] returns a ChemProps, so it can be passed anywhere a
+        prop_dict is taken. Components can be added but not changed, the a and b cache in
+        eos.cubic is keyed on the table, build a new table to change a value. The ChemProps of a
+        row is made on its first lookup and handed out again after that.
+
+        Args:
+            prop_dict (dict): Dictionary of ChemProps to start from, None starts empty
+        """
+        self.index = {}  # component: row
+        self.names = []  # name and abbrev by row, kept out of the numeric array
+        self.abbrevs = []
+        self._rows = np.zeros(8, dtype=prop_dtype)
+        self._props = {}  # component: ChemProps of the row, made on the first lookup
+        for comp, prop in (prop_dict or {}).items():
+            self.add_component(comp, prop.name, prop.abbrev, prop.mw, prop.pcrit, prop.tcrit, prop.acent)
+
+    def __repr__(self):
+        return f"PropTable: {len(self.index)} components, {self.data.nbytes} bytes"
+
+    def __getitem__(self, comp: str) -> ChemProps:
+        prop = self._props.get(comp)
+        if prop is None:
+            nrow = self.index[comp]
+            prop = ChemProps(self.names[nrow], self.abbrevs[nrow], *self._rows[nrow].tolist())
+            self._props[comp] = prop
+        return prop
+
+    def __iter__(self):
+        return iter(self.index)
+
+    def __len__(self) -> int:
+        return len(self.index)
+
+    @property
+    def data(self) -> np.ndarray:
+        """Structured Array of every Component, one row each in the order they were added"""
+        return self._rows[: len(self.index)]
+
+    def add_component(
+        self, comp: str, name: str, abbrev: str, mw: float, pcrit: float, tcrit: float, acentric: float
+    ) -> None:
+        """Add a Component or Pseudo Component
+
+        Args:
+            comp (str): Key used in compositions, such as "c7+"
+            name (str): Full Name
+            abbrev (str): Formula or Short Name
+            mw (float): Molecular Weight, lb/lbmol
+            pcrit (float): Critical Pressure, psia
+            tcrit (float): Critical Temperature, rankine
+            acentric (float): Accentric Factor, unitless
+        """
+        if comp in self.index:
+            raise ValueError(f"{comp} is already in the table, build a new table to change it")
+        nrow = len(self.index)
+        if nrow == self._rows.size:  # double the storage, rows are added one at a time
+            self._rows = np.concatenate((self._rows, np.zeros(nrow, dtype=prop_dtype)))
+        self._rows[nrow] = (mw, pcrit, tcrit, acentric)
+        self.names.append(name)
+        self.abbrevs.append(abbrev)
+        self.index[comp] = nrow
+
+    def gather(self, comp_list: list) -> np.ndarray:
+        """Rows of the Components, in the order of comp_list
+
+        Args:
+            comp_list (list): List of String Components
+
+        Returns:
+            rows (np.ndarray): Structured Array, fields mw, pcrit, tcrit, acent
+        """
+        return self._rows[[self.index[comp] for comp in comp_list]]
+
+
+def gather_props(comp_list: list, prop_dict: dict | PropTable) -> np.ndarray:
+    """Structured Rows of the Components from either Table Type
+
+    Args:
+        comp_list (list): List of String Components
+        prop_dict (dict | PropTable): Dictionary of ChemProps or a PropTable
+
+    Returns:
+        rows (np.ndarray): Structured Array, fields mw, pcrit, tcrit, acent
+    """
+    if isinstance(prop_dict, PropTable):
+        return prop_dict.gather(comp_list)
+    props = [prop_dict[comp] for comp in comp_list]
+    return np.array([(p.mw, p.pcrit, p.tcrit, p.acent) for p in props], dtype=prop_dtype)
+
+
+prop_table = PropTable(prop_dict)
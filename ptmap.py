@@ -0,0 +1,280 @@
+"""Adaptive P-T Phase Map
+
+A quadtree over pressure and temperature that only splits cells where the phase behavior
+changes, so the flashes go to the bubble and dew lines instead of the single phase regions.
+The map starts as a base x base grid of cells. Each level the cells whose four corners differ
+in phase state (liquid, vapor, two phase or failed), or differ in beta by more than beta_tol,
+are split in four, and all the new corner points of a level are flashed together with
+overall.phase_comp_batch, the vectorized phase_comp. Splitting stops at max_depth, the finest
+cell is then (pmax - pmin) / (base 2^max_depth) by (tmax - tmin) / (base 2^max_depth).
+
+Corners live on an integer lattice of the finest spacing, so neighboring cells share their
+corner flashes. The base grid has to be fine enough to see the envelope at all, a two phase
+region that fits between base grid points is missed.
+
+    ptmap = PTMap(comp_dict, prop_dict, bini_dict, 0, 1500, -200, 100)
+    beta, nphase, boundary = ptmap.query(535, -100)
+    ptmap.boundary_points()  # bubble and dew line points polished by the saturation solvers
+"""
+
+import math
+
+import numpy as np
+
+import eos.cubic as cb
+import fluid as fd
+import overall as oa
+import telemetry as tm
+
+
+def phase_state(beta: float) -> int:
+    """Phase State of a Flash, 0 liquid, 1 vapor, 2 two phase, 3 failed"""
+    if math.isnan(beta):
+        return 3
+    if beta <= 0:
+        return 0
+    if beta >= 1:
+        return 1
+    return 2
+
+
+class PTNode:
+    __slots__ = ("i0", "j0", "size", "depth", "children")
+
+    def __init__(self, i0: int, j0: int, size: int, depth: int):
+        """Quadtree Cell on the Lattice of the Finest Spacing
+
+        Args:
+            i0 (int): Pressure Lattice Index of the low corner
+            j0 (int): Temperature Lattice Index of the low corner
+            size (int): Cell Width in Lattice Steps
+            depth (int): Number of Splits from a Base Cell
+        """
+        self.i0 = i0
+        self.j0 = j0
+        self.size = size
+        self.depth = depth
+        self.children = None  # four PTNodes once split, low pressure and low temperature first
+
+    def __repr__(self):
+        return f"PTNode: ({self.i0}, {self.j0}), size {self.size}, depth {self.depth}"
+
+    def corners(self) -> tuple:
+        """Lattice Indices of the four Corners, (p0, t0), (p1, t0), (p0, t1), (p1, t1)"""
+        i1 = self.i0 + self.size
+        j1 = self.j0 + self.size
+        return (self.i0, self.j0), (i1, self.j0), (self.i0, j1), (i1, j1)
+
+    def split(self) -> list:
+        """Make the four Children and return them"""
+        half = self.size // 2
+        self.children = [
+            PTNode(self.i0 + di, self.j0 + dj, half, self.depth + 1) for dj in (0, half) for di in (0, half)
+        ]
+        return self.children
+
+
+class PTMap:
+    def __init__(
+        self,
+        comp_dict: dict | fd.Fluid,
+        prop_dict: dict | None = None,
+        bini_dict: dict | None = None,
+        pmin: float = 0,
+        pmax: float = 1500,
+        tmin: float = -200,
+        tmax: float = 100,
+        base: int = 8,
+        max_depth: int = 6,
+        beta_tol: float = 0.2,
+        eos: cb.CubicEOS = cb.PR,
+    ):
+        """Adaptive Phase Map of a Fluid, refined when it is made
+
+        Args:
+            comp_dict (dict | fd.Fluid): Mixture Molar Composition, or a compiled fluid.Fluid
+            prop_dict (dict): Property Table for Lookup, not needed with a Fluid
+            bini_dict (dict): Binary Interaction Table, not needed with a Fluid
+            pmin (float): Lowest Pressure, psig
+            pmax (float): Highest Pressure, psig
+            tmin (float): Lowest Temperature, deg F
+            tmax (float): Highest Temperature, deg F
+            base (int): Cells on each side of the starting grid
+            max_depth (int): Most Splits of a Base Cell
+            beta_tol (float): Largest change in beta across a two phase cell before it is split
+            eos (cb.CubicEOS): Equation of State, cubic.PR or cubic.SRK
+        """
+        self.fluid = fd.as_fluid(comp_dict, prop_dict, bini_dict)
+        self.pmin = pmin
+        self.pmax = pmax
+        self.tmin = tmin
+        self.tmax = tmax
+        self.base = base
+        self.max_depth = max_depth
+        self.beta_tol = beta_tol
+        self.eos = eos
+        self.nlat = base * 2**max_depth  # lattice steps on each side
+        self.dpres = (pmax - pmin) / self.nlat
+        self.dtemp = (tmax - tmin) / self.nlat
+        self.beta = {}  # lattice index: vapor mole fraction of the flash
+        root = 2**max_depth
+        self.roots = [PTNode(i * root, j * root, root, 0) for j in range(base) for i in range(base)]
+
+        with tm.record("ptmap") as rec:
+            frontier = self.roots
+            self._flash(node.corners() for node in frontier)
+            for _ in range(max_depth):
+                frontier = [child for node in frontier if self._needs_split(node) for child in node.split()]
+                if not frontier:
+                    break
+                self._flash(node.corners() for node in frontier)
+        self.lnphi_calls = rec.calls.get("cubic_lnphi", 0)
+        self.seconds = rec.wall_time
+
+    def __repr__(self):
+        return f"PTMap: {len(self.beta)} flashes, {self.uniform_points()} on a uniform grid, depth {self.max_depth}"
+
+    def _flash(self, corner_sets) -> None:
+        """Flash the Lattice Points that have no result yet, all in one batch"""
+        new = sorted({idx for corners in corner_sets for idx in corners if idx not in self.beta})
+        if not new:
+            return
+        lattice = np.array(new)
+        peval = self.pmin + lattice[:, 0] * self.dpres
+        teval = self.tmin + lattice[:, 1] * self.dtemp
+        _, _, beta = oa.phase_comp_batch(peval, teval, self.fluid, eos=self.eos)
+        self.beta.update(zip(new, beta.tolist()))
+
+    def _needs_split(self, node: PTNode) -> bool:
+        """Corners of the Cell disagree on the phase state, or beta changes more than beta_tol"""
+        betas = [self.beta[idx] for idx in node.corners()]
+        states = {phase_state(bval) for bval in betas}
+        if len(states) > 1 or 3 in states:
+            return True
+        return max(betas) - min(betas) > self.beta_tol
+
+    def uniform_points(self) -> int:
+        """Flashes a Uniform Grid at the Finest Spacing would take"""
+        return (self.nlat + 1) ** 2
+
+    def leaves(self):
+        """Every Cell that is not split
+
+        Yields:
+            node (PTNode): Leaf Cell
+        """
+        stack = list(self.roots)
+        while stack:
+            node = stack.pop()
+            if node.children is None:
+                yield node
+            else:
+                stack.extend(node.children)
+
+    def boundary_cells(self) -> list:
+        """Leaf Cells whose Corners disagree on the Phase State, the envelope runs through them"""
+        return [node for node in self.leaves() if len({phase_state(self.beta[idx]) for idx in node.corners()}) > 1]
+
+    def cell_bounds(self, node: PTNode) -> tuple[float, float, float, float]:
+        """Pressures in psig and Temperatures in deg F of a Cell, (p0, p1, t0, t1)"""
+        p0 = self.pmin + node.i0 * self.dpres
+        t0 = self.tmin + node.j0 * self.dtemp
+        return p0, p0 + node.size * self.dpres, t0, t0 + node.size * self.dtemp
+
+    def locate(self, peval: float, teval: float) -> PTNode:
+        """Leaf Cell that holds a Point, raises ValueError off the map
+
+        Args:
+            peval (float): Pressure, psig
+            teval (float): Temperature, deg F
+
+        Returns:
+            node (PTNode): Leaf Cell
+        """
+        iloc = (peval - self.pmin) / self.dpres
+        jloc = (teval - self.tmin) / self.dtemp
+        if not (0 <= iloc <= self.nlat and 0 <= jloc <= self.nlat):
+            raise ValueError(f"Point {peval} psig, {teval} deg F is off the map")
+        root = 2**self.max_depth
+        node = self.roots[min(int(jloc // root), self.base - 1) * self.base + min(int(iloc // root), self.base - 1)]
+        while node.children is not None:
+            half = node.size // 2
+            node = node.children[2 * (jloc >= node.j0 + half) + (iloc >= node.i0 + half)]
+        return node
+
+    def query(self, peval: float, teval: float) -> tuple[float, int, bool]:
+        """Phase Behavior at a Point from its Leaf Cell
+
+        Args:
+            peval (float): Pressure, psig
+            teval (float): Temperature, deg F
+
+        Returns:
+            beta (float): Vapor Mole Fraction, bilinear in the cell corners
+            nphase (int): Number of Phases, 1 or 2, 0 if the corner flashes failed
+            boundary (bool): The envelope runs through the cell, beta and nphase are not reliable
+        """
+        node = self.locate(peval, teval)
+        b00, b10, b01, b11 = (self.beta[idx] for idx in node.corners())
+        pfrac = (peval - self.pmin) / self.dpres - node.i0
+        tfrac = (teval - self.tmin) / self.dtemp - node.j0
+        pfrac /= node.size
+        tfrac /= node.size
+        beta = (1 - tfrac) * ((1 - pfrac) * b00 + pfrac * b10) + tfrac * ((1 - pfrac) * b01 + pfrac * b11)
+        states = {phase_state(bval) for bval in (b00, b10, b01, b11)}
+        state = phase_state(b00)
+        nphase = (1, 1, 2, 0)[state]
+        return beta, nphase, len(states) > 1
+
+    def boundary_points(self) -> list:
+        """Bubble and Dew Line Points, one per Boundary Cell
+
+        The single phase corner of a cell tells the line, a liquid corner the bubble line and a
+        vapor corner the dew line. The point is solved for with overall.saturation_pressure at the
+        cell temperature when the phase changes along the pressure edges, else with
+        overall.saturation_temperature at the cell pressure, starting from the cell center.
+        An answer that fails, or leaves the cell by more than a cell width, keeps the center.
+        Neighboring cells in one row or column solve the same point when the line crosses near
+        their shared edge, an answer within a thousandth of a cell width of one already found
+        on the same row or column is only kept once.
+
+        Returns:
+            points (list): (pres psig, temp deg F, "bubble" or "dew", solved) for every boundary cell
+        """
+        points = []
+        found = {}  # (kind, along pressure, cell temperature or pressure): solved values
+        for node in self.boundary_cells():
+            p0, p1, t0, t1 = self.cell_bounds(node)
+            corners = node.corners()
+            states = [phase_state(self.beta[idx]) for idx in corners]
+            single = [state for state in states if state in (0, 1)]
+            if not single or 2 not in states:
+                continue  # liquid against vapor or a failed corner, no saturation line to follow
+            kind = "bubble" if single[0] == 0 else "dew"
+            pmid = (p0 + p1) / 2
+            tmid = (t0 + t1) / 2
+            along_p = states[0] != states[1] or states[2] != states[3]
+            beta = float(single[0])
+            solved = False
+            try:
+                if along_p:
+                    pres = oa.saturation_pressure(pmid + 14.7, tmid + 459.67, self.fluid, None, None, beta, self.eos)
+                    solved = abs(pres - pmid) <= p1 - p0
+                else:
+                    temp = oa.saturation_temperature(pmid + 14.7, tmid + 459.67, self.fluid, None, None, beta, self.eos)
+                    solved = abs(temp - tmid) <= t1 - t0
+            except (ValueError, np.linalg.LinAlgError):
+                pass
+            if solved:
+                value, width = (pres, p1 - p0) if along_p else (temp, t1 - t0)
+                same = found.setdefault((kind, along_p, tmid if along_p else pmid), [])
+                if any(abs(value - other) <= width / 1000 for other in same):
+                    continue
+                same.append(value)
+            if solved and along_p:
+                points.append((pres, tmid, kind, True))
+            elif solved:
+                points.append((pmid, temp, kind, True))
+            else:
+                points.append((pmid, tmid, kind, False))
+        return sorted(points, key=lambda point: (point[2], point[1]))
@@ -4,6 +4,8 @@ Solve the vapor molar fraction for flash equations, referred to as beta in Peder
 https://www.e-education.psu.edu/png520/m13_p2.html
 """
 
+import numpy as np
+
 
 def rr_func(zi: float, Ki: float, beta: float) -> float:
     """Component Rachford Rice Function
@@ -47,12 +49,188 @@ def rr_sum(zi_list: list, Ki_list: list, beta: float) -> tuple[float, float]:
         rrf_sum (float): Rachford Rice Function Summation
         rrd_sum (float): Rachford Rice Derivative Summation
     """
-    rrf_list = []
-    rrd_list = []
-    for zi, Ki in zip(zi_list, Ki_list):
-        rrf_list.append(rr_func(zi, Ki, beta))
-        rrd_list.append(rr_derv(zi, Ki, beta))
-    return sum(rrf_list), sum(rrd_list)
+    rrf_sum, rrd_sum = rr_sum_batch(np.asarray(zi_list, dtype=float), np.asarray(Ki_list, dtype=float), beta)
+    return float(rrf_sum), float(rrd_sum)
+
+
+def rr_sum_batch(zi_ray: np.ndarray, Ki_ray: np.ndarray, beta: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """Rachford and Rice Summations for Many Flashes
+
+    Same summations as rr_sum, for m flashes at once. Components are on the last axis.
+
+    Args:
+        zi_ray (np.ndarray): Feed Mixture Molar Fractions, shape (n,) or (m, n)
+        Ki_ray (np.ndarray): Equilibrium Ratios of Components, shape (m, n)
+        beta (np.ndarray): Vapor Mole Fractions, shape (m,)
+
+    Return:
+        rrf_sum (np.ndarray): Rachford Rice Function Summations
+        rrd_sum (np.ndarray): Rachford Rice Derivative Summations
+    """
+    kmo = Ki_ray - 1
+    den = 1 + np.expand_dims(beta, -1) * kmo
+    rrf_sum = np.sum(zi_ray * kmo / den, axis=-1)
+    rrd_sum = -np.sum(zi_ray * kmo**2 / den**2, axis=-1)
+    return rrf_sum, rrd_sum
+
+
+def rr_bounds(zi_ray: np.ndarray, Ki_ray: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """Rachford and Rice Root Window
+
+    The root sits between the asymptotes 1 / (1 - Kmax) and 1 / (1 - Kmin). Positive
+    phase compositions tighten that to the Whitson and Michelsen 1989 window,
+    (Ki * zi - 1) / (Ki - 1) for Ki > 1 below and (1 - zi) / (1 - Ki) for Ki < 1 above.
+
+    Args:
+        zi_ray (np.ndarray): Feed Mixture Molar Fractions, shape (n,) or (m, n)
+        Ki_ray (np.ndarray): Equilibrium Ratios of Components, shape (n,) or (m, n)
+
+    Return:
+        beta_min (np.ndarray): Lower Bound on Beta, -inf if no Ki is above one
+        beta_max (np.ndarray): Upper Bound on Beta, inf if no Ki is below one
+    """
+    kmo = Ki_ray - 1
+    with np.errstate(divide="ignore", invalid="ignore"):
+        low = np.where(kmo > 0, (Ki_ray * zi_ray - 1) / kmo, -np.inf)
+        high = np.where(kmo < 0, (1 - zi_ray) / -kmo, np.inf)
+    return np.max(low, axis=-1), np.min(high, axis=-1)
+
+
+def rr_solve(
+    zi_ray: np.ndarray, Ki_ray: np.ndarray, beta: np.ndarray | float = 0.5, tol: float = 1e-12, maxiter: int = 50
+) -> np.ndarray | float:
+    """Rachford and Rice Vapor Mole Fraction
+
+    Solve for beta with the Leibovici and Neoschil 1992 form of the equation,
+    h(beta) = (beta - beta_min) * (beta_max - beta) * g(beta), where beta_min and beta_max
+    are the asymptotes. h has no poles and is close to linear, so Newton on it takes
+    only a few steps. Every step is kept inside a bracket that starts as the Whitson and
+    Michelsen window and shrinks with the sign of g. A step that leaves the bracket
+    is replaced by bisection. Beta is limited to zero and one, a subcooled feed
+    (rr_subcool) returns zero and a superheated feed (rr_superheat) returns one.
+
+    Args:
+        zi_ray (np.ndarray): Feed Mixture Molar Fractions, shape (n,) or (m, n)
+        Ki_ray (np.ndarray): Equilibrium Ratios of Components, shape (n,) or (m, n)
+        beta (np.ndarray): Starting Vapor Mole Fractions, shape () or (m,)
+        tol (float): How much Beta needs to change
+        maxiter (int): Maximum Number of Iterations
+
+    Return:
+        beta (np.ndarray): Vapor Mole Fractions, Total Mixture, a float for a single flash
+    """
+    if np.ndim(zi_ray) == 1 and np.ndim(Ki_ray) == 1:
+        return rr_solve_scalar(zi_ray, Ki_ray, float(beta), tol, maxiter)
+
+    zi_ray, Ki_ray = np.broadcast_arrays(zi_ray, Ki_ray)
+    shape = Ki_ray.shape[:-1]
+    zi_ray = zi_ray.reshape(-1, Ki_ray.shape[-1])
+    Ki_ray = Ki_ray.reshape(zi_ray.shape)
+    beta = np.broadcast_to(np.asarray(beta, dtype=float), shape).ravel().copy()
+
+    rrf_liq, _ = rr_sum_batch(zi_ray, Ki_ray, np.zeros(beta.size))
+    rrf_vap, _ = rr_sum_batch(zi_ray, Ki_ray, np.ones(beta.size))
+    liquid = rrf_liq <= 0
+    vapor = rrf_vap >= 0
+
+    # only the two phase rows are iterated, every Ki is on both sides of one there
+    idx = np.flatnonzero(~(liquid | vapor))
+    zi_ray = zi_ray[idx]
+    Ki_ray = Ki_ray[idx]
+    asym_min = 1 / (1 - np.max(Ki_ray, axis=1))
+    asym_max = 1 / (1 - np.min(Ki_ray, axis=1))
+    low, high = rr_bounds(zi_ray, Ki_ray)
+    low = np.maximum(low, 0)
+    high = np.minimum(high, 1)
+
+    bsub = beta[idx]
+    bsub = np.where((bsub > low) & (bsub < high), bsub, (low + high) / 2)
+    active = np.arange(idx.size)
+    for _ in range(maxiter):
+        if active.size == 0:
+            break
+        bact = bsub[active]
+        rrf_sum, rrd_sum = rr_sum_batch(zi_ray[active], Ki_ray[active], bact)
+        lact = np.where(rrf_sum > 0, bact, low[active])  # g falls with beta, the root is above
+        hact = np.where(rrf_sum < 0, bact, high[active])
+
+        dmin = bact - asym_min[active]
+        dmax = asym_max[active] - bact
+        hfun = dmin * dmax * rrf_sum
+        hder = dmin * dmax * rrd_sum + (dmax - dmin) * rrf_sum
+        with np.errstate(divide="ignore", invalid="ignore"):
+            bnxt = bact - hfun / hder
+        bnxt = np.where((bnxt >= lact) & (bnxt <= hact), bnxt, (lact + hact) / 2)
+
+        bsub[active] = bnxt
+        low[active] = lact
+        high[active] = hact
+        active = active[(abs(bnxt - bact) >= tol) & (rrf_sum != 0)]
+
+    beta[idx] = bsub
+    beta[liquid] = 0.0
+    beta[vapor] = 1.0
+    return beta.reshape(shape)
+
+
+def rr_solve_scalar(
+    zi_ray: np.ndarray, Ki_ray: np.ndarray, beta: float = 0.5, tol: float = 1e-12, maxiter: int = 50
+) -> float:
+    """Rachford and Rice Vapor Mole Fraction for One Flash
+
+    Same method as rr_solve with python floats for beta, a single flash spends most of its
+    time in numpy overhead otherwise.
+
+    Args:
+        zi_ray (np.ndarray): Feed Mixture Molar Fractions
+        Ki_ray (np.ndarray): Equilibrium Ratios of Components
+        beta (float): Starting Vapor Mole Fraction
+        tol (float): How much Beta needs to change
+        maxiter (int): Maximum Number of Iterations
+
+    Return:
+        beta (float): Vapor Mole Fraction, Total Mixture, raises ValueError unless every K is finite and positive
+    """
+    if not (np.all(Ki_ray > 0) and np.all(np.isfinite(Ki_ray))):
+        raise ValueError(f"Equilibrium ratios need to be finite and positive, not {Ki_ray}")
+    kmo = Ki_ray - 1
+    zkmo = zi_ray * kmo
+    if zkmo.sum() <= 0:  # rr_subcool
+        return 0.0
+    if (zkmo / Ki_ray).sum() >= 0:  # rr_superheat
+        return 1.0
+
+    asym_min = 1 / (1 - float(Ki_ray.max()))
+    asym_max = 1 / (1 - float(Ki_ray.min()))
+    above = kmo > 0  # both sides have components, otherwise it is subcooled or superheated
+    below = kmo < 0
+    low = max(float(((Ki_ray[above] * zi_ray[above] - 1) / kmo[above]).max()), 0.0)  # same window as rr_bounds
+    high = min(float(((1 - zi_ray[below]) / -kmo[below]).min()), 1.0)
+    if not low < beta < high:
+        beta = (low + high) / 2
+
+    for _ in range(maxiter):
+        den = 1 + beta * kmo
+        rrf_sum = float((zkmo / den).sum())
+        rrd_sum = -float((zkmo * kmo / (den * den)).sum())  # no division by zi, it can be zero
+        if rrf_sum > 0:  # g falls with beta, the root is above
+            low = beta
+        elif rrf_sum < 0:
+            high = beta
+        else:
+            return beta
+
+        dmin = beta - asym_min
+        dmax = asym_max - beta
+        hfun = dmin * dmax * rrf_sum
+        hder = dmin * dmax * rrd_sum + (dmax - dmin) * rrf_sum
+        beta_nxt = beta - hfun / hder
+        if not low <= beta_nxt <= high:
+            beta_nxt = (low + high) / 2
+        if abs(beta_nxt - beta) < tol:
+            return beta_nxt
+        beta = beta_nxt
+    return beta
 
 
 def rr_newton(rrf_sum: float, rrd_sum: float, beta: float) -> float:
@@ -0,0 +1,562 @@
+"""Saturation Point Newton Solver
+
+Solve the K values, temperature and pressure of a saturation point together, Michelsen 1980.
+The unknowns are X = [ln K1 ... ln Kn, ln T, ln P] and the equations are
+
+    ln Ki + ln phi_i(vapor) - ln phi_i(liquid) = 0
+    sum(yi - xi) = 0
+    X[spec] - S = 0
+
+where beta = 0 makes the feed the liquid (bubble point) and beta = 1 makes the feed the
+vapor (dew point). Picking which variable is specified lets the same solver find pressures,
+temperatures or march around a phase envelope.
+"""
+
+import math
+
+import numpy as np
+
+import eos.cubic as cb
+import telemetry as tm
+
+
+def sat_phases(lnk: np.ndarray, zi_ray: np.ndarray, beta: float) -> tuple[np.ndarray, np.ndarray]:
+    """Liquid and Vapor Compositions from K Values
+
+    Args:
+        lnk (np.ndarray): Log of Equilibrium Ratios
+        zi_ray (np.ndarray): Feed Mixture Molar Fractions
+        beta (float): Vapor Mole Fraction, 0 for Bubble Point, 1 for Dew Point
+
+    Returns:
+        xi_ray (np.ndarray): Liquid Phase Molar Amounts, sum to one at the solution
+        yi_ray (np.ndarray): Vapor Phase Molar Amounts, sum to one at the solution
+    """
+    ki = np.exp(lnk)
+    xi_ray = zi_ray / (1 + beta * (ki - 1))
+    yi_ray = ki * xi_ray
+    return xi_ray, yi_ray
+
+
+def sat_lnphi(
+    pabs: float,
+    tabs: float,
+    ni_ray: np.ndarray,
+    comp_list: list,
+    prop_dict: dict,
+    kmat: np.ndarray,
+    eos: cb.CubicEOS = cb.PR,
+) -> np.ndarray:
+    """Log Fugacity Coefficients of a Phase at the Lowest Gibbs Energy Root
+
+    Args:
+        pabs (float): Absolute Evaluation Pressure, psia
+        tabs (float): Absolute Evaluation Temp, rankine
+        ni_ray (np.ndarray): Molar Amounts of the Phase, normalized here
+        comp_list (list): List of String Components
+        prop_dict (dict): Properties Dictionary
+        kmat (np.ndarray): Matrix of (1 - kij) from mixing_rules.bini_matrix
+        eos (cb.CubicEOS): Equation of State, cubic.PR or cubic.SRK
+
+    Returns:
+        lnphi (np.ndarray): Log of Fugacity Coefficients
+    """
+    ai_ray, bi_ray, sqai_ray = cb.cubic_ab_cache(tabs, comp_list, prop_dict, eos)
+    lnphi, _ = cb.cubic_lnphi(pabs, tabs, ni_ray / ni_ray.sum(), ai_ray, bi_ray, sqai_ray, kmat, None, eos)
+    return lnphi
+
+
+def sat_residual(
+    X: np.ndarray,
+    spec: int,
+    sval: float,
+    zi_ray: np.ndarray,
+    beta: float,
+    comp_list: list,
+    prop_dict: dict,
+    kmat: np.ndarray,
+    eos: cb.CubicEOS = cb.PR,
+) -> np.ndarray:
+    """Saturation Point Residuals
+
+    Args:
+        X (np.ndarray): Unknowns, [ln K, ln T, ln P], T in rankine, P in psia
+        spec (int): Index of the Specified Variable in X
+        sval (float): Value of the Specified Variable
+        zi_ray (np.ndarray): Feed Mixture Molar Fractions
+        beta (float): Vapor Mole Fraction, 0 for Bubble Point, 1 for Dew Point
+        comp_list (list): List of String Components
+        prop_dict (dict): Properties Dictionary
+        kmat (np.ndarray): Matrix of (1 - kij) from mixing_rules.bini_matrix
+        eos (cb.CubicEOS): Equation of State, cubic.PR or cubic.SRK
+
+    Returns:
+        fray (np.ndarray): Residuals, n + 2 values
+    """
+    nc = zi_ray.size
+    tabs = np.exp(X[nc])
+    pabs = np.exp(X[nc + 1])
+    xi_ray, yi_ray = sat_phases(X[:nc], zi_ray, beta)
+
+    lnphi_vap = sat_lnphi(pabs, tabs, yi_ray, comp_list, prop_dict, kmat, eos)
+    lnphi_liq = sat_lnphi(pabs, tabs, xi_ray, comp_list, prop_dict, kmat, eos)
+
+    fray = np.empty(nc + 2)
+    fray[:nc] = X[:nc] + lnphi_vap - lnphi_liq
+    fray[nc] = np.sum(yi_ray - xi_ray)
+    fray[nc + 1] = X[spec] - sval
+    return fray
+
+
+def sat_jacobian(
+    X: np.ndarray,
+    spec: int,
+    sval: float,
+    zi_ray: np.ndarray,
+    beta: float,
+    comp_list: list,
+    prop_dict: dict,
+    kmat: np.ndarray,
+    eos: cb.CubicEOS = cb.PR,
+) -> tuple[np.ndarray, np.ndarray]:
+    """Saturation Point Residuals and Analytic Jacobian
+
+    Uses the pressure, temperature and mole number derivatives of ln phi from cubic.cubic_lnphi_derivs.
+    The phase amounts follow ln K as dxi / d ln Ki = -beta Ki xi / ti and dyi / d ln Ki = (1 - beta) yi / ti,
+    with ti = 1 + beta (Ki - 1). The residuals come out of the same ln phi evaluation, so a Newton
+    iteration costs one derivative call per phase. The feed phase does not move with ln K, so its
+    mole number derivative is skipped, and so is the temperature derivative when ln T is specified,
+    that column only multiplies a zero step.
+
+    Args:
+        X (np.ndarray): Unknowns, [ln K, ln T, ln P]
+        spec (int): Index of the Specified Variable in X
+        sval (float): Value of the Specified Variable
+        zi_ray (np.ndarray): Feed Mixture Molar Fractions
+        beta (float): Vapor Mole Fraction, 0 for Bubble Point, 1 for Dew Point
+        comp_list (list): List of String Components
+        prop_dict (dict): Properties Dictionary
+        kmat (np.ndarray): Matrix of (1 - kij) from mixing_rules.bini_matrix
+        eos (cb.CubicEOS): Equation of State, cubic.PR or cubic.SRK
+
+    Returns:
+        fray (np.ndarray): Residuals, n + 2 values, same as sat_residual
+        jac (np.ndarray): Jacobian of the residuals, (n + 2) x (n + 2)
+    """
+    nc = zi_ray.size
+    tabs = np.exp(X[nc])
+    pabs = np.exp(X[nc + 1])
+    ki = np.exp(X[:nc])
+    xi_ray, yi_ray = sat_phases(X[:nc], zi_ray, beta)
+
+    ab_rays = cb.cubic_ab_cache(tabs, comp_list, prop_dict, eos)
+    dsqai_ray = cb.cubic_dsqai_cache(tabs, comp_list, prop_dict, eos) if spec != nc else None
+    lnphi_vap, _, dpv, dtv, dnv = cb.cubic_lnphi_derivs(
+        pabs, tabs, yi_ray, *ab_rays, kmat, None, eos, dsqai_ray, moles=beta != 1
+    )
+    lnphi_liq, _, dpl, dtl, dnl = cb.cubic_lnphi_derivs(
+        pabs, tabs, xi_ray, *ab_rays, kmat, None, eos, dsqai_ray, moles=beta != 0
+    )
+
+    fray = np.empty(nc + 2)
+    fray[:nc] = X[:nc] + lnphi_vap - lnphi_liq
+    fray[nc] = np.sum(yi_ray - xi_ray)
+    fray[nc + 1] = X[spec] - sval
+
+    tray = 1 + beta * (ki - 1)
+    dxi = -beta * ki * xi_ray / tray
+    dyi = (1 - beta) * yi_ray / tray
+
+    jac = np.zeros((nc + 2, nc + 2))
+    jac[:nc, :nc] = np.eye(nc)
+    if dnv is not None:
+        jac[:nc, :nc] += dnv * dyi
+    if dnl is not None:
+        jac[:nc, :nc] -= dnl * dxi
+    if dsqai_ray is not None:
+        jac[:nc, nc] = tabs * (dtv - dtl)
+    jac[:nc, nc + 1] = pabs * (dpv - dpl)
+    jac[nc, :nc] = dyi - dxi
+    jac[-1, spec] = 1  # specification row
+    return fray, jac
+
+
+def sat_newton(
+    X: np.ndarray,
+    spec: int,
+    sval: float,
+    zi_ray: np.ndarray,
+    beta: float,
+    comp_list: list,
+    prop_dict: dict,
+    kmat: np.ndarray,
+    maxiter: int = 25,
+    eos: cb.CubicEOS = cb.PR,
+    dstep: float = 0.1,
+    ktriv: float = 0.0,
+) -> tuple[np.ndarray, np.ndarray, int]:
+    """Saturation Point Newton Solve
+
+    Newton iteration on the full saturation system from a starting guess. The step in
+    ln T and ln P is limited to keep the first iterations from leaving the envelope.
+    Next to the trivial solution the Jacobian is close to singular and Newton crawls,
+    so with ktriv set the solve stops once every ln K is smaller than that, or once the
+    largest ln K is below 0.3 and has lost more than a quarter three iterations running.
+    A real saturation point that close to the critical point settles instead of shrinking.
+    The iterations go to an open telemetry record whether the solve converges or not.
+
+    Args:
+        X (np.ndarray): Starting Guess, [ln K, ln T, ln P]
+        spec (int): Index of the Specified Variable in X
+        sval (float): Value of the Specified Variable
+        zi_ray (np.ndarray): Feed Mixture Molar Fractions
+        beta (float): Vapor Mole Fraction, 0 for Bubble Point, 1 for Dew Point
+        comp_list (list): List of String Components
+        prop_dict (dict): Properties Dictionary
+        kmat (np.ndarray): Matrix of (1 - kij) from mixing_rules.bini_matrix
+        maxiter (int): Maximum Number of Newton Iterations
+        eos (cb.CubicEOS): Equation of State, cubic.PR or cubic.SRK
+        dstep (float): Largest Change in ln T or ln P per Iteration
+        ktriv (float): Largest ln K that Stops the Solve as Trivial, zero never stops
+
+    Returns:
+        X (np.ndarray): Converged Unknowns
+        jac (np.ndarray): Jacobian at the Last Iteration, used for sensitivities
+        niter (int): Number of Newton Iterations, raises ValueError if not converged
+    """
+    X = np.array(X, dtype=float)
+    nc = zi_ray.size
+    ftol = 1e-10  # how small the residuals need to be
+    xtol = 1e-6  # a full newton step this small leaves errors near xtol squared
+    kcrit = 0.3  # largest ln K where a steady shrink means the trivial solution
+    kshrink = 0.75  # ratio of the largest ln K between iterations that counts as shrinking
+    niter = 0
+    nshrink = 0
+    fray = None
+    try:
+        for niter in range(1, maxiter + 1):
+            fray, jac = sat_jacobian(X, spec, sval, zi_ray, beta, comp_list, prop_dict, kmat, eos)
+            if not np.all(np.isfinite(fray)):
+                raise ValueError("Saturation residuals are not finite, starting guess is too far off")
+            if np.max(abs(fray)) < ftol:
+                break
+
+            dX = np.linalg.solve(jac, -fray)
+            dmax = np.max(abs(dX[nc:]))
+            if dmax > dstep:  # limit the ln T and ln P step
+                dX *= dstep / dmax
+            kold = np.max(abs(X[:nc]))
+            X += dX
+            if np.max(abs(dX)) < xtol:
+                break
+            knew = np.max(abs(X[:nc]))
+            nshrink = nshrink + 1 if knew < kcrit and knew < kshrink * kold else 0
+            if knew < ktriv or (ktriv > 0 and nshrink == 3):
+                raise ValueError("Saturation point is heading to the trivial solution")
+        else:
+            raise ValueError(f"Saturation point did not converge in {maxiter} iterations")
+    finally:
+        rec = tm.active.get()
+        if rec is not None:
+            rec.iterations += niter
+            if fray is not None:
+                rec.residual = float(np.max(abs(fray)))
+    return X, jac, niter
+
+
+def sat_substitution(
+    X: np.ndarray,
+    free: int,
+    zi_ray: np.ndarray,
+    beta: float,
+    comp_list: list,
+    prop_dict: dict,
+    kmat: np.ndarray,
+    maxsub: int = 15,
+    eos: cb.CubicEOS = cb.PR,
+) -> tuple[np.ndarray, int]:
+    """Successive Substitution toward a Saturation Point
+
+    Substitution on ln K, with the free one of ln T or ln P updated by Newton on ln sum(zi Ki)
+    for a bubble point or ln sum(zi / Ki) for a dew point, using the analytic pressure or
+    temperature derivative of ln phi. Stops once ln K and the free variable change by less
+    than 0.1, which is close enough for sat_newton, or when the incipient phase is lost.
+    A substitution that more than halves the largest ln K to below 0.1 is not taken, from a
+    start above the saturation point near the critical point it collapses onto the feed.
+
+    Args:
+        X (np.ndarray): Starting Unknowns, [ln K, ln T, ln P]
+        free (int): Index of the Variable that is Updated, n for ln T, n + 1 for ln P
+        zi_ray (np.ndarray): Feed Mixture Molar Fractions
+        beta (float): Vapor Mole Fraction, 0 for Bubble Point, 1 for Dew Point
+        comp_list (list): List of String Components
+        prop_dict (dict): Properties Dictionary
+        kmat (np.ndarray): Matrix of (1 - kij) from mixing_rules.bini_matrix
+        maxsub (int): Maximum Number of Substitutions
+        eos (cb.CubicEOS): Equation of State, cubic.PR or cubic.SRK
+
+    Returns:
+        X (np.ndarray): Unknowns after the last good substitution
+        nsub (int): Number of Substitutions
+    """
+    nc = zi_ray.size
+    ktriv = 1e-3  # largest ln K this close to zero is the trivial solution
+    kcrit = 0.1  # largest ln K that is shrinking this fast is on its way to the trivial solution
+    sstol = 0.1  # change in ln K and the free variable to hand over to newton
+    dmax = 1.0 if free == nc + 1 else 0.1  # a decade in pressure, a tenth in temperature
+    sign = 1 if beta == 0 else -1
+    X = np.array(X, dtype=float)
+    nsub = 0
+    with np.errstate(divide="ignore", invalid="ignore", over="ignore"):
+        while nsub < maxsub:
+            nsub += 1
+            tabs = np.exp(X[nc])
+            pabs = np.exp(X[nc + 1])
+            ab_rays = cb.cubic_ab_cache(tabs, comp_list, prop_dict, eos)
+            dsqai_ray = cb.cubic_dsqai_cache(tabs, comp_list, prop_dict, eos) if free == nc else None
+            xi_ray, yi_ray = sat_phases(X[:nc], zi_ray, beta)
+            lnphi_vap, _, dpv, dtv, _ = cb.cubic_lnphi_derivs(
+                pabs, tabs, yi_ray, *ab_rays, kmat, None, eos, dsqai_ray, moles=False
+            )
+            lnphi_liq, _, dpl, dtl, _ = cb.cubic_lnphi_derivs(
+                pabs, tabs, xi_ray, *ab_rays, kmat, None, eos, dsqai_ray, moles=False
+            )
+            lnk_nxt = lnphi_liq - lnphi_vap
+            dlnk_dx = pabs * (dpl - dpv) if free == nc + 1 else tabs * (dtl - dtv)
+
+            wi = zi_ray * np.exp(sign * lnk_nxt)
+            fval = np.log(wi.sum())
+            dfdx = sign * (wi @ dlnk_dx) / wi.sum()
+            dx = np.clip(-fval / dfdx, -dmax, dmax)  # the first K values can be far off
+            dlnk = np.max(abs(lnk_nxt - X[:nc]))
+            kbig = np.max(abs(lnk_nxt))
+            if not (np.all(np.isfinite(lnk_nxt)) and np.isfinite(dx)) or kbig < ktriv:
+                break  # lost the incipient phase, newton starts from the last good values
+            if kbig < kcrit and kbig < np.max(abs(X[:nc])) / 2:
+                break  # collapsing onto the feed, near the critical point that is the trivial solution
+
+            X[:nc] = lnk_nxt
+            X[free] += dx
+            if dlnk < sstol and abs(dx) < sstol:
+                break
+
+    rec = tm.active.get()
+    if rec is not None:
+        rec.iterations += nsub
+        rec.lap("substitution")
+    return X, nsub
+
+
+def sat_pure(
+    X: np.ndarray,
+    spec: int,
+    zi_ray: np.ndarray,
+    comp_list: list,
+    prop_dict: dict,
+    kmat: np.ndarray,
+    maxiter: int = 50,
+    eos: cb.CubicEOS = cb.PR,
+) -> tuple[np.ndarray, int]:
+    """Saturation Point of a Single Component
+
+    With one component present both phases have the feed composition, K = 1 is the solution and
+    sat_newton has nothing to tell it from the trivial one. Instead the liquid and vapor roots are
+    taken at the feed composition and Newton on the free one of ln T or ln P zeroes
+    ln phi(liquid) - ln phi(vapor) of that component, whose derivative in ln P is Z(liquid) - Z(vapor).
+    A start outside the three root region is moved by dstep toward it, a lone liquid root below the
+    inflection of the cubic means the pressure is too high or the temperature too low.
+
+    Args:
+        X (np.ndarray): Starting Unknowns, [ln K, ln T, ln P]
+        spec (int): Index of the Fixed Variable, n for ln T, n + 1 for ln P
+        zi_ray (np.ndarray): Feed Mixture Molar Fractions, one of them non zero
+        comp_list (list): List of String Components
+        prop_dict (dict): Properties Dictionary
+        kmat (np.ndarray): Matrix of (1 - kij) from mixing_rules.bini_matrix
+        maxiter (int): Maximum Number of Newton Iterations
+        eos (cb.CubicEOS): Equation of State, cubic.PR or cubic.SRK
+
+    Returns:
+        X (np.ndarray): Converged Unknowns, ln K all zero
+        niter (int): Newton Iterations, raises ValueError if not converged or above the critical point
+    """
+    nc = zi_ray.size
+    ftol = 1e-12  # difference in ln phi of the two roots
+    dstep = 0.1  # largest change in ln T or ln P per iteration
+    free = nc if spec == nc + 1 else nc + 1
+    ic = int(np.argmax(zi_ray))
+    X = np.array(X, dtype=float)
+    X[:nc] = 0
+
+    pcrit, tcrit, _ = cb.crit_rays([comp_list[ic]], prop_dict)
+    if spec == nc and math.exp(X[nc]) >= tcrit[0]:
+        raise ValueError(f"{comp_list[ic]} has no saturation pressure above its critical temperature")
+    if spec == nc + 1 and math.exp(X[nc + 1]) >= pcrit[0]:
+        raise ValueError(f"{comp_list[ic]} has no saturation temperature above its critical pressure")
+
+    niter = 0
+    for niter in range(1, maxiter + 1):
+        tabs = math.exp(X[nc])
+        pabs = math.exp(X[nc + 1])
+        ab_rays = cb.cubic_ab_cache(tabs, comp_list, prop_dict, eos)
+        dsqai_ray = cb.cubic_dsqai_cache(tabs, comp_list, prop_dict, eos) if free == nc else None
+        lnphi_liq, zliq, dpl, dtl, _ = cb.cubic_lnphi_derivs(
+            pabs, tabs, zi_ray, *ab_rays, kmat, False, eos, dsqai_ray, moles=False
+        )
+        lnphi_vap, zvap, dpv, dtv, _ = cb.cubic_lnphi_derivs(
+            pabs, tabs, zi_ray, *ab_rays, kmat, True, eos, dsqai_ray, moles=False
+        )
+        if zvap - zliq < 1e-9:  # one root, step toward the three root region
+            bterm = ab_rays[1][ic] * pabs / (cb.rcon * tabs)
+            liquid = zliq < (1 - (eos.usum - 1) * bterm) / 3
+            X[free] += dstep if liquid == (free == nc) else -dstep
+            continue
+
+        fval = lnphi_liq[ic] - lnphi_vap[ic]
+        if abs(fval) < ftol:
+            break
+        dfdx = pabs * (dpl[ic] - dpv[ic]) if free == nc + 1 else tabs * (dtl[ic] - dtv[ic])
+        X[free] += min(max(-fval / dfdx, -dstep), dstep)
+    else:
+        raise ValueError(f"Saturation point of {comp_list[ic]} did not converge in {maxiter} iterations")
+
+    rec = tm.active.get()
+    if rec is not None:
+        rec.iterations += niter
+        rec.residual = float(abs(fval))
+    return X, niter
+
+
+def sat_fixed(
+    X: np.ndarray,
+    spec: int,
+    zi_ray: np.ndarray,
+    beta: float,
+    comp_list: list,
+    prop_dict: dict,
+    kmat: np.ndarray,
+    maxiter: int = 50,
+    eos: cb.CubicEOS = cb.PR,
+) -> tuple[np.ndarray, int]:
+    """Saturation Point at a Fixed Temperature or Pressure
+
+    Successive substitution brings the incipient phase close, then sat_newton finishes the
+    solve with the specified variable held. Close to the critical point the substitution can
+    drift onto the trivial solution, if the finish lands there or fails, damped Newton is run
+    again from the starting values. A single component feed is solved by sat_pure.
+
+    Args:
+        X (np.ndarray): Starting Unknowns, [ln K, ln T, ln P]
+        spec (int): Index of the Fixed Variable, n for ln T, n + 1 for ln P
+        zi_ray (np.ndarray): Feed Mixture Molar Fractions
+        beta (float): Vapor Mole Fraction, 0 for Bubble Point, 1 for Dew Point
+        comp_list (list): List of String Components
+        prop_dict (dict): Properties Dictionary
+        kmat (np.ndarray): Matrix of (1 - kij) from mixing_rules.bini_matrix
+        maxiter (int): Maximum Number of Newton Iterations
+        eos (cb.CubicEOS): Equation of State, cubic.PR or cubic.SRK
+
+    Returns:
+        X (np.ndarray): Converged Unknowns, [ln K, ln T, ln P]
+        niter (int): Substitution plus Newton Iterations, raises ValueError if not converged
+            or if the solve ends on the trivial solution
+    """
+    if np.count_nonzero(zi_ray) == 1:
+        return sat_pure(X, spec, zi_ray, comp_list, prop_dict, kmat, maxiter, eos)
+
+    nc = zi_ray.size
+    ktriv = 1e-3  # largest ln K this close to zero is the trivial solution
+    X_start = np.array(X, dtype=float)
+    free = nc if spec == nc + 1 else nc + 1
+    X, nsub = sat_substitution(X_start, free, zi_ray, beta, comp_list, prop_dict, kmat, eos=eos)
+
+    try:
+        X, _, nnewt = sat_newton(X, spec, X[spec], zi_ray, beta, comp_list, prop_dict, kmat, maxiter, eos, ktriv=ktriv)
+    except (ValueError, np.linalg.LinAlgError):
+        X[:nc] = 0  # send it to the damped newton below
+        nnewt = 0
+    if np.max(abs(X[:nc])) < ktriv:
+        nsub += nnewt
+        try:
+            X, _, nnewt = sat_newton(
+                X_start, spec, X_start[spec], zi_ray, beta, comp_list, prop_dict, kmat, maxiter, eos, ktriv=ktriv
+            )
+        except ValueError as err:
+            if "trivial" in str(err):
+                raise ValueError("Saturation point converged to the trivial solution, there is none at this spec")
+            raise
+    return X, nsub + nnewt
+
+
+def sat_pressure(
+    lnk: np.ndarray,
+    pabs: float,
+    tabs: float,
+    zi_ray: np.ndarray,
+    beta: float,
+    comp_list: list,
+    prop_dict: dict,
+    kmat: np.ndarray,
+    maxiter: int = 50,
+    eos: cb.CubicEOS = cb.PR,
+) -> tuple[np.ndarray, int]:
+    """Saturation Pressure at a Fixed Temperature
+
+    Args:
+        lnk (np.ndarray): Starting Log of Equilibrium Ratios, usually Wilson
+        pabs (float): Starting Pressure, psia
+        tabs (float): Absolute Temperature, rankine
+        zi_ray (np.ndarray): Feed Mixture Molar Fractions
+        beta (float): Vapor Mole Fraction, 0 for Bubble Point, 1 for Dew Point
+        comp_list (list): List of String Components
+        prop_dict (dict): Properties Dictionary
+        kmat (np.ndarray): Matrix of (1 - kij) from mixing_rules.bini_matrix
+        maxiter (int): Maximum Number of Newton Iterations
+        eos (cb.CubicEOS): Equation of State, cubic.PR or cubic.SRK
+
+    Returns:
+        X (np.ndarray): Converged Unknowns, [ln K, ln T, ln P]
+        niter (int): Substitution plus Newton Iterations, raises ValueError if not converged
+            or if the solve ends on the trivial solution
+    """
+    X = np.concatenate((lnk, [np.log(tabs), np.log(pabs)]))
+    return sat_fixed(X, zi_ray.size, zi_ray, beta, comp_list, prop_dict, kmat, maxiter, eos)
+
+
+def sat_temperature(
+    lnk: np.ndarray,
+    pabs: float,
+    tabs: float,
+    zi_ray: np.ndarray,
+    beta: float,
+    comp_list: list,
+    prop_dict: dict,
+    kmat: np.ndarray,
+    maxiter: int = 50,
+    eos: cb.CubicEOS = cb.PR,
+) -> tuple[np.ndarray, int]:
+    """Saturation Temperature at a Fixed Pressure
+
+    Same as sat_pressure with ln P held, the substitution updates ln T with the analytic
+    temperature derivative of ln phi. Retrograde mixtures can have two dew point temperatures
+    at one pressure, the one closest to the starting temperature is usually found.
+
+    Args:
+        lnk (np.ndarray): Starting Log of Equilibrium Ratios, usually Wilson
+        pabs (float): Absolute Pressure, psia
+        tabs (float): Starting Temperature, rankine
+        zi_ray (np.ndarray): Feed Mixture Molar Fractions
+        beta (float): Vapor Mole Fraction, 0 for Bubble Point, 1 for Dew Point
+        comp_list (list): List of String Components
+        prop_dict (dict): Properties Dictionary
+        kmat (np.ndarray): Matrix of (1 - kij) from mixing_rules.bini_matrix
+        maxiter (int): Maximum Number of Newton Iterations
+        eos (cb.CubicEOS): Equation of State, cubic.PR or cubic.SRK
+
+    Returns:
+        X (np.ndarray): Converged Unknowns, [ln K, ln T, ln P]
+        niter (int): Substitution plus Newton Iterations, raises ValueError if not converged
+            or if the solve ends on the trivial solution
+    """
+    X = np.concatenate((lnk, [np.log(tabs), np.log(pabs)]))
+    return sat_fixed(X, zi_ray.size + 1, zi_ray, beta, comp_list, prop_dict, kmat, maxiter, eos)
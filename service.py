@@ -0,0 +1,377 @@
+"""Local Flash Service
+
+An asyncio server so several applications on one machine share one process for their flashes
+instead of each importing overall. Requests and responses are one JSON object per line, over
+TCP on the loopback or over a Unix socket.
+
+    {"id": 1, "kind": "flash", "comp": {"c3": 0.6, "nc4": 0.3, "nc5": 0.1}, "pres": 175, "temp": 150}
+    {"id": 1, "ok": true, "result": {"xi": [...], "yi": [...], "beta": 0.26}}
+
+kind is "flash" with pres in psig and temp in deg F, "bubble" or "dew" with temp in deg F which
+return the saturation pressure in psig as the result, or "stats" for the service counters.
+A request that fails returns "ok": false with the error message, the id is echoed back either way
+so a client can have many requests open on one connection.
+
+Requests of the same kind for the same composition are held up to max_wait seconds and solved
+together, flashes in one overall.phase_comp_batch call. Saturation points have no vectorized
+solver, a batch of them shares the compiled fluid.Fluid and runs one after the other. Solves run
+on a single worker thread so the event loop keeps taking requests in the meantime.
+
+    service = FlashService(prop_dict, bini_dict)
+    await service.start(port=8765)
+    client = await FlashClient.connect(port=8765)
+    xi, yi, beta = await client.flash(comp_dict, 175, 150)
+"""
+
+import asyncio
+import itertools
+import json
+import math
+import time
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+import eos.cubic as cb
+import fluid as fd
+import overall as oa
+
+_kinds = ("flash", "bubble", "dew")
+
+
+class FlashService:
+    def __init__(
+        self,
+        prop_dict: dict,
+        bini_dict: dict,
+        max_wait: float = 0.005,
+        max_batch: int = 256,
+        max_fluids: int = 64,
+        eos: cb.CubicEOS = cb.PR,
+    ):
+        """Micro-Batching Flash Server
+
+        Args:
+            prop_dict (dict): Property Table for Lookup
+            bini_dict (dict): Binary Interaction Table
+            max_wait (float): Seconds the first request of a batch waits for others to join
+            max_batch (int): Requests that send a batch to the solver without waiting
+            max_fluids (int): Compiled Fluids kept, least recently used are dropped
+            eos (cb.CubicEOS): Equation of State, cubic.PR or cubic.SRK
+        """
+        self.prop_dict = prop_dict
+        self.bini_dict = bini_dict
+        self.max_wait = max_wait
+        self.max_batch = max_batch
+        self.max_fluids = max_fluids
+        self.eos = eos
+        self.requests = 0
+        self.errors = 0
+        self.batches = 0
+        self.batch_max = 0
+        self._latency = deque(maxlen=10_000)  # seconds of the most recent requests
+        self._fluids = OrderedDict()  # composition items: Fluid
+        self._pending = {}  # (kind, composition items): list of ((pres, temp), future)
+        self._timers = {}  # (kind, composition items): timer handle
+        self._tasks = set()  # batches being solved
+        self._worker = ThreadPoolExecutor(max_workers=1)
+        self._server = None
+        self._start = time.perf_counter()
+
+    def __repr__(self):
+        return f"FlashService: {self.requests} requests, {self.batches} batches, max_wait: {self.max_wait} s"
+
+    def stats(self) -> dict:
+        """Service Counters
+
+        Returns:
+            stats (dict): requests, errors, batches, mean and largest batch size, requests per second
+                since start, and latency percentiles in milliseconds over the last 10,000 requests
+        """
+        uptime = time.perf_counter() - self._start
+        lat = np.array(self._latency) * 1000
+        pct = np.percentile(lat, (50, 90, 99)) if lat.size else (math.nan,) * 3
+        return {
+            "requests": self.requests,
+            "errors": self.errors,
+            "batches": self.batches,
+            "batch_mean": self.requests / self.batches if self.batches else 0.0,
+            "batch_max": self.batch_max,
+            "requests_per_sec": self.requests / uptime if uptime > 0 else 0.0,
+            "latency_ms_p50": float(pct[0]),
+            "latency_ms_p90": float(pct[1]),
+            "latency_ms_p99": float(pct[2]),
+            "latency_ms_max": float(lat.max()) if lat.size else math.nan,
+        }
+
+    async def start(self, host: str = "127.0.0.1", port: int = 0, path: str | None = None) -> None:
+        """Start Listening, on a Unix socket when path is given, else TCP
+
+        Args:
+            host (str): Interface to bind, keep it on the loopback
+            port (int): TCP Port, zero picks a free one, see address
+            path (str): Unix Socket Path, used in place of host and port
+        """
+        if path is not None:
+            self._server = await asyncio.start_unix_server(self._connection, path=path)
+        else:
+            self._server = await asyncio.start_server(self._connection, host=host, port=port)
+
+    @property
+    def address(self):
+        """Bound Address, (host, port) for TCP or the socket path"""
+        return self._server.sockets[0].getsockname()
+
+    async def serve_forever(self) -> None:
+        """Serve until Cancelled"""
+        await self._server.serve_forever()
+
+    async def close(self) -> None:
+        """Stop Listening and let the worker finish the solves it has"""
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+        self._worker.shutdown(wait=True)
+
+    async def _connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        """Read requests off one connection, every request is answered by its own task"""
+        lock = asyncio.Lock()
+        tasks = set()
+        try:
+            while line := await reader.readline():
+                task = asyncio.create_task(self._answer(line, writer, lock))
+                tasks.add(task)
+                task.add_done_callback(tasks.discard)
+            if tasks:
+                await asyncio.gather(*tasks)
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    async def _answer(self, line: bytes, writer: asyncio.StreamWriter, lock: asyncio.Lock) -> None:
+        """Solve one request and write its response line"""
+        arrival = time.perf_counter()
+        rid = None
+        try:
+            req = json.loads(line)
+            rid = req.get("id")
+            kind = req.get("kind")
+            if kind == "stats":
+                response = {"id": rid, "ok": True, "result": self.stats()}
+            else:
+                result = await self.submit(kind, req["comp"], req.get("pres"), req["temp"])
+                response = {"id": rid, "ok": True, "result": result}
+                self._latency.append(time.perf_counter() - arrival)
+        except Exception as err:
+            self.errors += 1
+            response = {"id": rid, "ok": False, "error": f"{type(err).__name__}: {err}"}
+        async with lock:
+            writer.write(json.dumps(response).encode() + b"\n")
+            await writer.drain()
+
+    async def submit(self, kind: str, comp_dict: dict, peval: float | None, teval: float):
+        """Queue a Request into the Micro-Batch of its Kind and Composition
+
+        Args:
+            kind (str): "flash", "bubble" or "dew"
+            comp_dict (dict): Mixture Molar Composition
+            peval (float): Evaluated Pressure of a flash, psig, not used for bubble and dew
+            teval (float): Evaluated Temperature, deg F
+
+        Returns:
+            result: {"xi", "yi", "beta"} of a flash, the saturation pressure in psig for bubble and dew
+        """
+        if kind not in _kinds:
+            raise ValueError(f"Request kind {kind} is not one of {_kinds} or stats")
+        if kind == "flash" and peval is None:
+            raise ValueError("A flash request needs pres")
+        self.requests += 1
+        key = (kind, tuple(comp_dict.items()))
+        future = asyncio.get_running_loop().create_future()
+        batch = self._pending.setdefault(key, [])
+        batch.append(((peval, float(teval)), future))
+
+        if len(batch) >= self.max_batch:
+            self._flush(key)
+        elif len(batch) == 1:
+            self._timers[key] = asyncio.get_running_loop().call_later(self.max_wait, self._flush, key)
+        return await future
+
+    def _flush(self, key: tuple) -> None:
+        """Send a pending batch to the worker"""
+        timer = self._timers.pop(key, None)
+        if timer is not None:
+            timer.cancel()
+        batch = self._pending.pop(key)
+        self.batches += 1
+        self.batch_max = max(self.batch_max, len(batch))
+        task = asyncio.create_task(self._solve(key, batch))
+        self._tasks.add(task)  # the loop only keeps a weak reference
+        task.add_done_callback(self._tasks.discard)
+
+    async def _solve(self, key: tuple, batch: list) -> None:
+        """Solve a batch on the worker thread and hand out the results"""
+        kind, comp_items = key
+        points = [point for point, _ in batch]
+        try:
+            fluid = self._fluid(comp_items)
+            loop = asyncio.get_running_loop()
+            results = await loop.run_in_executor(self._worker, self._solve_batch, kind, fluid, points)
+        except Exception as err:
+            results = [err] * len(batch)
+        for (_, future), result in zip(batch, results):
+            if future.done():  # client went away
+                continue
+            if isinstance(result, Exception):
+                future.set_exception(result)
+            else:
+                future.set_result(result)
+
+    def _fluid(self, comp_items: tuple) -> fd.Fluid:
+        """Compiled Fluid of a Composition, checked with comp_verify the first time"""
+        fluid = self._fluids.get(comp_items)
+        if fluid is None:
+            fluid = fd.Fluid(dict(comp_items), self.prop_dict, self.bini_dict)
+            self._fluids[comp_items] = fluid
+            if len(self._fluids) > self.max_fluids:
+                self._fluids.popitem(last=False)
+        else:
+            self._fluids.move_to_end(comp_items)
+        return fluid
+
+    def _solve_batch(self, kind: str, fluid: fd.Fluid, points: list) -> list:
+        """Results of a Batch in request order, an Exception in place of a failed point"""
+        if kind == "flash":
+            peval = np.array([pres for pres, _ in points], dtype=float)
+            teval = np.array([temp for _, temp in points], dtype=float)
+            xi_ray, yi_ray, beta = oa.phase_comp_batch(peval, teval, fluid, eos=self.eos)
+            results = []
+            for xi, yi, bval in zip(xi_ray, yi_ray, beta):
+                if np.isnan(bval):
+                    results.append(ValueError("Flash did not converge"))
+                else:
+                    results.append({"xi": xi.tolist(), "yi": yi.tolist(), "beta": float(bval)})
+            return results
+
+        solver = oa.bubblepoint_pressure if kind == "bubble" else oa.dewpoint_pressure
+        results = []
+        for _, temp in points:
+            try:
+                results.append(float(solver(temp, fluid, eos=self.eos)))
+            except Exception as err:
+                results.append(err)
+        return results
+
+
+def run_service(
+    prop_dict: dict, bini_dict: dict, host: str = "127.0.0.1", port: int = 8765, path: str | None = None, **kwargs
+) -> None:
+    """Run a FlashService until Interrupted, kwargs go to FlashService
+
+    Args:
+        prop_dict (dict): Property Table for Lookup
+        bini_dict (dict): Binary Interaction Table
+        host (str): Interface to bind, keep it on the loopback
+        port (int): TCP Port
+        path (str): Unix Socket Path, used in place of host and port
+
+    Returns:
+        None
+    """
+
+    async def main():
+        service = FlashService(prop_dict, bini_dict, **kwargs)
+        await service.start(host, port, path)
+        try:
+            await service.serve_forever()
+        finally:
+            await service.close()
+
+    asyncio.run(main())
+
+
+class FlashClient:
+    def __init__(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        """Client of a FlashService, open it with FlashClient.connect
+
+        Requests can be awaited concurrently, for example with asyncio.gather,
+        they share the one connection and are matched to responses by id.
+
+        Args:
+            reader (asyncio.StreamReader): Stream from the service
+            writer (asyncio.StreamWriter): Stream to the service
+        """
+        self._reader = reader
+        self._writer = writer
+        self._ids = itertools.count()
+        self._waiting = {}  # id: future
+        self._listener = asyncio.create_task(self._listen())
+
+    def __repr__(self):
+        return f"FlashClient: {len(self._waiting)} requests open"
+
+    @classmethod
+    async def connect(cls, host: str = "127.0.0.1", port: int = 8765, path: str | None = None) -> "FlashClient":
+        """Connect to a Service, on a Unix socket when path is given, else TCP"""
+        if path is not None:
+            reader, writer = await asyncio.open_unix_connection(path)
+        else:
+            reader, writer = await asyncio.open_connection(host, port)
+        return cls(reader, writer)
+
+    async def _listen(self) -> None:
+        """Hand each response line to the request waiting on its id"""
+        try:
+            while line := await self._reader.readline():
+                response = json.loads(line)
+                future = self._waiting.pop(response.get("id"), None)
+                if future is None or future.done():
+                    continue
+                if response["ok"]:
+                    future.set_result(response["result"])
+                else:
+                    future.set_exception(RuntimeError(response["error"]))
+        finally:
+            for future in self._waiting.values():
+                if not future.done():
+                    future.set_exception(ConnectionError("Flash service closed the connection"))
+            self._waiting.clear()
+
+    async def request(self, kind: str, **fields):
+        """Send one Request and wait for its Result, raises RuntimeError with the service error"""
+        rid = next(self._ids)
+        future = asyncio.get_running_loop().create_future()
+        self._waiting[rid] = future
+        self._writer.write(json.dumps({"id": rid, "kind": kind, **fields}).encode() + b"\n")
+        await self._writer.drain()
+        return await future
+
+    async def flash(self, comp_dict: dict, peval: float, teval: float) -> tuple[list, list, float]:
+        """Two Phase Flash, same answer as overall.phase_comp_batch at one point
+
+        Returns:
+            xi_list (list): Liquid Molar Fractions
+            yi_list (list): Vapor Molar Fractions
+            beta (float): Vapor Mole Fraction, zero or one for a single phase
+        """
+        result = await self.request("flash", comp=comp_dict, pres=peval, temp=teval)
+        return result["xi"], result["yi"], result["beta"]
+
+    async def bubble(self, comp_dict: dict, teval: float) -> float:
+        """Bubble Point Pressure, psig, at teval in deg F"""
+        return await self.request("bubble", comp=comp_dict, temp=teval)
+
+    async def dew(self, comp_dict: dict, teval: float) -> float:
+        """Dew Point Pressure, psig, at teval in deg F"""
+        return await self.request("dew", comp=comp_dict, temp=teval)
+
+    async def stats(self) -> dict:
+        """Counters of the Service, see FlashService.stats"""
+        return await self.request("stats")
+
+    async def close(self) -> None:
+        self._writer.close()
+        await self._writer.wait_closed()
+        self._listener.cancel()
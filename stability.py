@@ -0,0 +1,124 @@
+"""Phase Stability
+
+Michelsen tangent plane distance test, Pg 252 Michelsen 2008. A vapor like trial phase (zi * Ki)
+and a liquid like trial phase (zi / Ki) are started from Wilson K values and updated with
+successive substitution. If neither trial phase can lower the Gibbs energy of the feed, the feed
+is a single stable phase and no flash is needed. Otherwise the trial phases give K values that are
+much closer to the answer than Wilson, and are handed to the flash as a starting point. A trial
+that runs out of iterations, or loses its root, has not decided anything, the point is then not
+called stable and the flash gets Wilson K values. Components missing from the feed stay out of
+the trial phases and out of the convergence checks.
+"""
+
+import numpy as np
+
+import eos.cubic as cb
+
+ktriv = 1e-4  # ln K this close to zero is the trivial solution
+
+
+def stability_batch(
+    pabs: np.ndarray,
+    tabs: np.ndarray,
+    zi_ray: np.ndarray,
+    ai_ray: np.ndarray,
+    bi_ray: np.ndarray,
+    sqai_ray: np.ndarray,
+    kmat: np.ndarray,
+    ki_ray: np.ndarray,
+    maxiter: int = 100,
+    eos: cb.CubicEOS = cb.PR,
+    vapor: bool | None = None,
+) -> tuple[np.ndarray, np.ndarray]:
+    """Tangent Plane Stability Test for Many Points
+
+    A vapor like trial phase from zi Ki and a liquid like one from zi / Ki are each taken to a
+    stationary point. When the K values already tell which side of the envelope the feed is on,
+    only the trial that can split it needs to run, a liquid feed is tested with a vapor trial and
+    the reverse. A trial that is not run counts as collapsed onto the feed.
+
+    Args:
+        pabs (np.ndarray): Absolute Evaluation Pressures, psia, shape (m,)
+        tabs (np.ndarray): Absolute Evaluation Temps, rankine, shape (m,)
+        zi_ray (np.ndarray): Feed Mixture Molar Fractions, shape (n,) or (m, n)
+        ai_ray (np.ndarray): Cubic EOS a values, shape (n,) or (m, n)
+        bi_ray (np.ndarray): Cubic EOS b values, shape (n,)
+        sqai_ray (np.ndarray): Square root of Cubic EOS a values, shape (n,) or (m, n)
+        kmat (np.ndarray): Matrix of (1 - kij) from mixing_rules.bini_matrix
+        ki_ray (np.ndarray): Starting Equilibrium Ratios, usually Wilson, shape (m, n)
+        maxiter (int): Maximum Number of Successive Substitution Iterations
+        eos (cb.CubicEOS): Equation of State, cubic.PR or cubic.SRK
+        vapor (bool | None): True - Vapor Like Trial only, False - Liquid Like Trial only, None - Both
+
+    Returns:
+        stable (np.ndarray): True if the feed is a single stable phase, shape (m,). False where a
+            trial phase lowers the Gibbs energy, or where neither does but one did not settle
+        ki_ray (np.ndarray): Equilibrium Ratios from the trial phases, shape (m, n). For unstable
+            points they start a flash. For stable points rachford_rice.rr_subcool / rr_superheat
+            on them gives the phase, a feed where both trials collapse gives K of one.
+    """
+    npts = pabs.size
+    zi_ray = np.broadcast_to(zi_ray, ki_ray.shape)
+    ai_ray = np.broadcast_to(ai_ray, ki_ray.shape)
+    sqai_ray = np.broadcast_to(sqai_ray, ki_ray.shape)
+
+    lnphi_z, _ = cb.cubic_lnphi(pabs, tabs, zi_ray, ai_ray, bi_ray, sqai_ray, kmat, None, eos)
+    with np.errstate(divide="ignore"):
+        dray = np.log(zi_ray) + lnphi_z  # tangent plane of the feed
+
+    present = zi_ray > 0
+    ktol = 1e-8  # how much ln W needs to change
+    ttol = ktriv  # trial this close to the feed is the trivial solution
+    trials = []
+    with np.errstate(divide="ignore"):
+        starts = (np.log(zi_ray * ki_ray), np.log(zi_ray / ki_ray))  # vapor like, then liquid like
+    for lnw, run in zip(starts, (vapor is not False, vapor is not True)):
+        unstable = np.zeros(npts, dtype=bool)
+        collapsed = np.full(npts, not run)
+        failed = np.zeros(npts, dtype=bool)
+        active = np.full(npts, run)
+        with np.errstate(divide="ignore", invalid="ignore", over="ignore"):
+            for _ in range(maxiter):
+                idx = np.flatnonzero(active)
+                if idx.size == 0:
+                    break
+
+                wi = np.exp(lnw[idx])
+                wsum = wi.sum(axis=1)
+                lnphi_w, _ = cb.cubic_lnphi(
+                    pabs[idx], tabs[idx], wi / wsum[:, None], ai_ray[idx], bi_ray, sqai_ray[idx], kmat, None, eos
+                )
+                lnw_nxt = dray[idx] - lnphi_w
+                wsum_nxt = np.exp(lnw_nxt).sum(axis=1)
+                here = present[idx]  # ln W of a missing component is -inf throughout
+
+                # tangent plane distance is 1 - sum(W) after a substitution, below zero is unstable
+                bad = ~np.all(np.isfinite(lnw_nxt) | ~here, axis=1)  # no root, nothing is decided
+                neg = (wsum_nxt > 1 + ktol) & ~bad
+                conv = np.max(np.where(here, abs(lnw_nxt - lnw[idx]), 0), axis=1) < ktol
+                lnw_feed = lnw_nxt - np.log(wsum_nxt)[:, None] - np.log(zi_ray[idx])
+                trivial = np.max(np.where(here, abs(lnw_feed), 0), axis=1) < ttol
+
+                lnw[idx] = lnw_nxt
+                unstable[idx[neg]] = True
+                collapsed[idx[trivial & ~neg & ~bad]] = True
+                failed[idx[bad]] = True
+                active[idx[neg | conv | trivial | bad]] = False
+        trials.append((unstable, collapsed, failed | active, lnw))
+
+    (vap_unstable, vap_trivial, vap_open, lnw_vap), (liq_unstable, liq_trivial, liq_open, lnw_liq) = trials
+    undecided = ~(vap_unstable | liq_unstable) & (vap_open | liq_open)
+    stable = ~(vap_unstable | liq_unstable | undecided)
+
+    # K values from the trial phases, both trials unstable uses the ratio of the two
+    # a stable feed keeps the K values of a trial phase that did not collapse onto the feed,
+    # a distinct vapor like stationary point puts the feed on the liquid side and the reverse
+    with np.errstate(divide="ignore", invalid="ignore", over="ignore"):
+        lnz = np.log(zi_ray)
+        lnk = np.where(vap_unstable[:, None], lnw_vap - lnz, lnz - lnw_liq)
+        lnk = np.where((vap_unstable & liq_unstable)[:, None], lnw_vap - lnw_liq, lnk)
+        lnk = np.where((stable & ~vap_trivial)[:, None], lnw_vap - lnz, lnk)
+        lnk = np.where((stable & vap_trivial & ~liq_trivial)[:, None], lnz - lnw_liq, lnk)
+        lnk = np.where((stable & vap_trivial & liq_trivial)[:, None], 0, lnk)
+        lnk = np.where(np.isfinite(lnk) & ~undecided[:, None], lnk, np.log(ki_ray))
+    return stable, np.exp(lnk)
@@ -0,0 +1,284 @@
+"""Streaming Flash
+
+Flash operating point exports that are too large to hold in memory. The input is read a chunk
+of rows at a time, each chunk goes through overall.phase_comp_batch and its results are appended
+to the output before the next chunk is read, so memory stays at one chunk whatever the file size.
+CSV is read and written with the standard library. Parquet is used for a .parquet or .pq suffix
+and needs pyarrow, which is only imported then.
+
+The feed is one composition for every row, pass a comp_dict or fluid.Fluid, or a column per
+component with the molar fraction of each row, pass comp_dict as None and name the component
+columns in comp_list. Per row fractions are normalized to sum to one.
+
+    stats = stream_flash("export.csv", "flashed.csv", comp_dict, prop_dict, bini_dict)
+    stats["rows_per_sec"]
+
+The input columns are written back untouched, followed by beta, the liquid and vapor Z factors
+(nan when that phase is not present) and the phase compositions as x_<comp> and y_<comp>.
+Rows that did not converge, or had no pressure or temperature, are written as nan.
+"""
+
+import csv
+import itertools
+import time
+from pathlib import Path
+
+import numpy as np
+
+import eos.cubic as cb
+import fluid as fd
+import overall as oa
+
+
+def _is_parquet(path: str) -> bool:
+    """File is Parquet by its Suffix"""
+    return Path(path).suffix.lower() in (".parquet", ".pq")
+
+
+def _as_list(values) -> list:
+    """Column as a python list, from a list, numpy array or pyarrow array"""
+    if hasattr(values, "to_pylist"):
+        return values.to_pylist()
+    if hasattr(values, "tolist"):
+        return values.tolist()
+    return list(values)
+
+
+def _float_col(values) -> np.ndarray:
+    """Column as floats, cells that are empty or not numbers are nan"""
+    try:
+        return np.asarray(values, dtype=float)
+    except (TypeError, ValueError):
+        out = np.full(len(values), np.nan)
+        for i, val in enumerate(_as_list(values)):
+            try:
+                out[i] = float(val)
+            except (TypeError, ValueError):
+                pass
+        return out
+
+
+def csv_chunks(path: str, chunksize: int):
+    """Read a CSV File a Chunk of Rows at a Time
+
+    Args:
+        path (str): CSV File with a Header Row
+        chunksize (int): Rows per Chunk
+
+    Yields:
+        cols (dict): column name: tuple of the cell strings in the chunk
+    """
+    with open(path, newline="") as file:
+        reader = csv.reader(file)
+        header = next(reader)
+        while rows := list(itertools.islice(reader, chunksize)):
+            yield dict(zip(header, zip(*rows)))
+
+
+def parquet_chunks(path: str, chunksize: int):
+    """Read a Parquet File a Chunk of Rows at a Time, needs pyarrow
+
+    Args:
+        path (str): Parquet File
+        chunksize (int): Rows per Chunk
+
+    Yields:
+        cols (dict): column name: pyarrow array of the chunk
+    """
+    import pyarrow.parquet as pq
+
+    for batch in pq.ParquetFile(path).iter_batches(batch_size=chunksize):
+        yield dict(zip(batch.schema.names, batch.columns))
+
+
+class CsvSink:
+    def __init__(self, path: str):
+        """Append Chunks of Columns to a CSV File, the header comes from the first chunk
+
+        Args:
+            path (str): CSV File, overwritten
+        """
+        self.path = path
+        self._file = open(path, "w", newline="")
+        self._writer = csv.writer(self._file)
+        self._header = None
+
+    def __repr__(self):
+        return f"CsvSink: {self.path}"
+
+    def write(self, cols: dict) -> None:
+        """Append the Rows of a Chunk"""
+        if self._header is None:
+            self._header = list(cols.keys())
+            self._writer.writerow(self._header)
+        self._writer.writerows(zip(*(_as_list(cols[name]) for name in self._header)))
+
+    def close(self) -> None:
+        self._file.close()
+
+
+class ParquetSink:
+    def __init__(self, path: str):
+        """Append Chunks of Columns to a Parquet File as Row Groups, needs pyarrow
+
+        Args:
+            path (str): Parquet File, overwritten
+        """
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        self.path = path
+        self._pa = pa
+        self._pq = pq
+        self._writer = None
+
+    def __repr__(self):
+        return f"ParquetSink: {self.path}"
+
+    def write(self, cols: dict) -> None:
+        """Append the Rows of a Chunk, the schema comes from the first chunk"""
+        table = self._pa.table({name: self._pa.array(_as_list(val)) for name, val in cols.items()})
+        if self._writer is None:
+            self._writer = self._pq.ParquetWriter(self.path, table.schema)
+        self._writer.write_table(table.cast(self._writer.schema))
+
+    def close(self) -> None:
+        if self._writer is not None:
+            self._writer.close()
+
+
+def phase_zfac(
+    peval: np.ndarray,
+    teval: np.ndarray,
+    xi_ray: np.ndarray,
+    yi_ray: np.ndarray,
+    beta: np.ndarray,
+    fluid: fd.Fluid,
+    eos: cb.CubicEOS = cb.PR,
+) -> tuple[np.ndarray, np.ndarray]:
+    """Liquid and Vapor Z Factors of Flashed Points
+
+    Args:
+        peval (np.ndarray): Evaluated Pressures, psig, shape (m,)
+        teval (np.ndarray): Evaluated Temperatures, deg F, shape (m,)
+        xi_ray (np.ndarray): Liquid Molar Fractions, shape (m, n)
+        yi_ray (np.ndarray): Vapor Molar Fractions, shape (m, n)
+        beta (np.ndarray): Vapor Mole Fractions, shape (m,)
+        fluid (fd.Fluid): Compiled Mixture the points were flashed with
+        eos (cb.CubicEOS): Equation of State, cubic.PR or cubic.SRK
+
+    Returns:
+        zliq (np.ndarray): Liquid Z Factors, nan where there is no liquid
+        zvap (np.ndarray): Vapor Z Factors, nan where there is no vapor
+    """
+    pabs = peval + 14.7
+    tabs = teval + 459.67
+    ai_ray, bi_ray, sqai_ray = fluid.ab_temp(tabs[:, None], eos)
+    with np.errstate(invalid="ignore", divide="ignore"):  # failed points are nan all the way through
+        _, zliq = cb.cubic_lnphi(pabs, tabs, xi_ray, ai_ray, bi_ray, sqai_ray, fluid.kmat, False, eos)
+        _, zvap = cb.cubic_lnphi(pabs, tabs, yi_ray, ai_ray, bi_ray, sqai_ray, fluid.kmat, True, eos)
+    zliq = np.where(beta < 1, zliq, np.nan)
+    zvap = np.where(beta > 0, zvap, np.nan)
+    return zliq, zvap
+
+
+def stream_flash(
+    src: str,
+    dst: str,
+    comp_dict: dict | fd.Fluid | None,
+    prop_dict: dict | None = None,
+    bini_dict: dict | None = None,
+    comp_list: list | None = None,
+    pres_col: str = "pressure",
+    temp_col: str = "temperature",
+    chunksize: int = 50_000,
+    maxiter: int = 200,
+    eos: cb.CubicEOS = cb.PR,
+    verbose: bool = False,
+) -> dict:
+    """Flash every Row of a CSV or Parquet File into another File
+
+    Args:
+        src (str): Input File, with pressure in psig and temperature in deg F columns
+        dst (str): Output File, overwritten, CSV or Parquet by the suffix
+        comp_dict (dict | fd.Fluid | None): Feed of every Row, None to read it from the comp_list columns
+        prop_dict (dict): Property Table for Lookup, not needed with a Fluid
+        bini_dict (dict): Binary Interaction Table, not needed with a Fluid
+        comp_list (list): Component Columns of a per Row Feed, also the component keys
+        pres_col (str): Name of the Pressure Column, psig
+        temp_col (str): Name of the Temperature Column, deg F
+        chunksize (int): Rows Flashed at a Time, sets the memory use
+        maxiter (int): Maximum Number of Iterations of the Batch Flash
+        eos (cb.CubicEOS): Equation of State, cubic.PR or cubic.SRK
+        verbose (bool): Print the throughput after every chunk
+
+    Returns:
+        stats (dict): rows, chunks, failed rows, seconds and rows_per_sec of the run
+    """
+    if comp_dict is None:
+        if not comp_list:
+            raise ValueError("A per row feed needs the component columns in comp_list")
+        comp_dict = dict.fromkeys(comp_list, 1 / len(comp_list))  # only the components are used
+        fluid = fd.Fluid(comp_dict, prop_dict, bini_dict)
+        per_row = True
+    else:
+        fluid = fd.as_fluid(comp_dict, prop_dict, bini_dict)
+        per_row = False
+
+    chunks = parquet_chunks(src, chunksize) if _is_parquet(src) else csv_chunks(src, chunksize)
+    sink = ParquetSink(dst) if _is_parquet(dst) else CsvSink(dst)
+    nrows = 0
+    nchunks = 0
+    nfailed = 0
+    start = time.perf_counter()
+    try:
+        for cols in chunks:
+            peval = _float_col(cols[pres_col])
+            teval = _float_col(cols[temp_col])
+            zi_rows = None
+            if per_row:
+                zi_rows = np.column_stack([_float_col(cols[comp]) for comp in fluid.comp_list])
+                zi_rows /= zi_rows.sum(axis=1, keepdims=True)
+
+            good = np.isfinite(peval) & np.isfinite(teval)
+            if per_row:
+                good &= np.all(np.isfinite(zi_rows), axis=1)
+            npts = peval.size
+            nc = fluid.zi_ray.size
+            xi_ray = np.full((npts, nc), np.nan)
+            yi_ray = np.full((npts, nc), np.nan)
+            beta = np.full(npts, np.nan)
+            if good.any():
+                rows = None if zi_rows is None else zi_rows[good]
+                xi_ray[good], yi_ray[good], beta[good] = oa.phase_comp_batch(
+                    peval[good], teval[good], fluid, maxiter=maxiter, eos=eos, zi_rows=rows
+                )
+            zliq, zvap = phase_zfac(peval, teval, xi_ray, yi_ray, beta, fluid, eos)
+
+            out = dict(cols)
+            out["beta"] = beta
+            out["zliq"] = zliq
+            out["zvap"] = zvap
+            for j, comp in enumerate(fluid.comp_list):
+                out[f"x_{comp}"] = xi_ray[:, j]
+            for j, comp in enumerate(fluid.comp_list):
+                out[f"y_{comp}"] = yi_ray[:, j]
+            sink.write(out)
+
+            nrows += npts
+            nchunks += 1
+            nfailed += int(np.count_nonzero(np.isnan(beta)))
+            if verbose:
+                elapsed = time.perf_counter() - start
+                print(f"{nrows} rows, {nrows / elapsed:.0f} rows/s")
+    finally:
+        sink.close()
+
+    seconds = time.perf_counter() - start
+    return {
+        "rows": nrows,
+        "chunks": nchunks,
+        "failed": nfailed,
+        "seconds": seconds,
+        "rows_per_sec": nrows / seconds if seconds > 0 else float("nan"),
+    }
@@ -0,0 +1,277 @@
+"""P-T Surrogate Tables
+
+Flash one fluid over a pressure and temperature grid once, then answer beta, the phase
+compositions and the Z factors by bilinear interpolation in the grid. The grid is a .npy file
+of shape (ntemp, npres, nfield) that is opened memory mapped, so worker processes reading the
+same file share one copy through the page cache. A json sidecar next to it holds the axes, the
+components, the field names and a fingerprint of the tables the grid was built with.
+
+    report = build_table("lift.npy", comp_dict, prop_dict, bini_dict, 50, 1500, 146, -150, 100, 126)
+    table = SurrogateTable("lift.npy")
+    xi, yi, beta, zliq, zvap, exact = table.lookup(peval, teval)
+
+Interpolation across a phase boundary is meaningless, a lookup sets exact for points in a cell
+whose corners are not all in the same phase state, or with a failed corner, or off the grid.
+Those points need a real flash, SurrogateTable.flash runs it for them when given the fluid.
+"""
+
+import json
+import os
+import time
+from pathlib import Path
+
+import numpy as np
+
+import eos.cubic as cb
+import flash_cache as fc
+import fluid as fd
+import overall as oa
+import stream as sm
+
+
+def _sidecar(path: str) -> Path:
+    """Path of the json sidecar of a table"""
+    return Path(path).with_suffix(".json")
+
+
+def table_fields(comp_list: list) -> list:
+    """Field Names along the last axis of a table, beta, zliq, zvap, x_<comp>, y_<comp>"""
+    return ["beta", "zliq", "zvap"] + [f"x_{comp}" for comp in comp_list] + [f"y_{comp}" for comp in comp_list]
+
+
+def build_table(
+    path: str,
+    comp_dict: dict | fd.Fluid,
+    prop_dict: dict | None = None,
+    bini_dict: dict | None = None,
+    pmin: float = 50,
+    pmax: float = 1500,
+    npres: int = 146,
+    tmin: float = -150,
+    tmax: float = 100,
+    ntemp: int = 126,
+    dtype: str = "float32",
+    eos: cb.CubicEOS = cb.PR,
+) -> dict:
+    """Flash a Fluid over an Evenly Spaced P-T Grid and write the Table
+
+    Args:
+        path (str): Table File, .npy, the sidecar is written next to it as .json
+        comp_dict (dict | fd.Fluid): Mixture Molar Composition, or a compiled fluid.Fluid
+        prop_dict (dict): Property Table for Lookup, not needed with a Fluid
+        bini_dict (dict): Binary Interaction Table, not needed with a Fluid
+        pmin (float): Lowest Grid Pressure, psig
+        pmax (float): Highest Grid Pressure, psig
+        npres (int): Number of Pressures
+        tmin (float): Lowest Grid Temperature, deg F
+        tmax (float): Highest Grid Temperature, deg F
+        ntemp (int): Number of Temperatures
+        dtype (str): Stored Precision, float32 halves the file against float64
+        eos (cb.CubicEOS): Equation of State, cubic.PR or cubic.SRK
+
+    Returns:
+        report (dict): grid points, failed points, build_seconds and file_bytes of the table
+    """
+    fluid = fd.as_fluid(comp_dict, prop_dict, bini_dict)
+    pres_axis = np.linspace(pmin, pmax, npres)
+    temp_axis = np.linspace(tmin, tmax, ntemp)
+    tgrid, pgrid = np.meshgrid(temp_axis, pres_axis, indexing="ij")
+
+    start = time.perf_counter()
+    xi_ray, yi_ray, beta = oa.phase_comp_batch(pgrid.ravel(), tgrid.ravel(), fluid, eos=eos)
+    zliq, zvap = sm.phase_zfac(pgrid.ravel(), tgrid.ravel(), xi_ray, yi_ray, beta, fluid, eos)
+    build_seconds = time.perf_counter() - start
+
+    grid = np.column_stack([beta, zliq, zvap, xi_ray, yi_ray]).reshape(ntemp, npres, -1).astype(dtype)
+    np.save(path, grid)
+
+    meta = {
+        "components": fluid.comp_list,
+        "zi": fluid.zi_ray.tolist(),
+        "eos": eos.name,
+        "fingerprint": fc.table_fingerprint(fluid.comp_list, fluid.prop_dict, fluid.bini_dict),
+        "pres": [float(pmin), float(pmax), int(npres)],
+        "temp": [float(tmin), float(tmax), int(ntemp)],
+        "fields": table_fields(fluid.comp_list),
+        "failed": int(np.count_nonzero(np.isnan(beta))),
+        "build_seconds": build_seconds,
+    }
+    with open(_sidecar(path), "w") as file:
+        json.dump(meta, file, indent=1)
+
+    return {
+        "points": int(beta.size),
+        "failed": meta["failed"],
+        "build_seconds": build_seconds,
+        "file_bytes": os.path.getsize(path) + os.path.getsize(_sidecar(path)),
+    }
+
+
+class SurrogateTable:
+    def __init__(self, path: str, fluid: fd.Fluid | None = None):
+        """Memory Mapped P-T Table written by build_table
+
+        Args:
+            path (str): Table File, .npy, with its .json sidecar
+            fluid (fd.Fluid): Fluid the table was built for, only needed by flash for the exact points
+        """
+        with open(_sidecar(path)) as file:
+            self.meta = json.load(file)
+        self.path = path
+        self.grid = np.load(path, mmap_mode="r")
+        self.comp_list = self.meta["components"]
+        self.pmin, self.pmax, self.npres = self.meta["pres"]
+        self.tmin, self.tmax, self.ntemp = self.meta["temp"]
+        self.dpres = (self.pmax - self.pmin) / (self.npres - 1)
+        self.dtemp = (self.tmax - self.tmin) / (self.ntemp - 1)
+        self.eos = cb.SRK if self.meta["eos"] == cb.SRK.name else cb.PR
+        self.fluid = fluid
+        if fluid is not None:
+            fingerprint = fc.table_fingerprint(fluid.comp_list, fluid.prop_dict, fluid.bini_dict)
+            if fluid.comp_list != self.comp_list or fingerprint != self.meta["fingerprint"]:
+                raise ValueError("Fluid does not match the components and tables the surrogate was built with")
+            if not np.allclose(fluid.zi_ray, self.meta["zi"]):
+                raise ValueError("Fluid composition is not the one the surrogate was built with")
+
+    def __repr__(self):
+        return (
+            f"SurrogateTable: {len(self.comp_list)} components, {self.npres} x {self.ntemp}, "
+            f"{self.pmin:g} to {self.pmax:g} psig, {self.tmin:g} to {self.tmax:g} deg F"
+        )
+
+    def lookup(
+        self, peval: np.ndarray, teval: np.ndarray
+    ) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """Bilinear Interpolation of the Table
+
+        Args:
+            peval (np.ndarray): Evaluated Pressures, psig
+            teval (np.ndarray): Evaluated Temperatures, deg F, broadcast against peval
+
+        Returns:
+            xi_ray (np.ndarray): Liquid Molar Fractions, shape of the points + (n,)
+            yi_ray (np.ndarray): Vapor Molar Fractions, shape of the points + (n,)
+            beta (np.ndarray): Vapor Mole Fractions, shape of the points
+            zliq (np.ndarray): Liquid Z Factors, nan where there is no liquid
+            zvap (np.ndarray): Vapor Z Factors, nan where there is no vapor
+            exact (np.ndarray): True where the point needs a real flash instead
+        """
+        peval, teval = np.broadcast_arrays(np.asarray(peval, dtype=float), np.asarray(teval, dtype=float))
+        shape = peval.shape
+        ploc = (peval.ravel() - self.pmin) / self.dpres
+        tloc = (teval.ravel() - self.tmin) / self.dtemp
+        outside = ~((ploc >= 0) & (ploc <= self.npres - 1) & (tloc >= 0) & (tloc <= self.ntemp - 1))
+
+        pidx = np.clip(np.floor(np.nan_to_num(ploc)).astype(int), 0, self.npres - 2)
+        tidx = np.clip(np.floor(np.nan_to_num(tloc)).astype(int), 0, self.ntemp - 2)
+        pfrac = (ploc - pidx)[:, None]
+        tfrac = (tloc - tidx)[:, None]
+        c00 = self.grid[tidx, pidx].astype(float)  # only the corner rows are read off the map
+        c01 = self.grid[tidx, pidx + 1].astype(float)
+        c10 = self.grid[tidx + 1, pidx].astype(float)
+        c11 = self.grid[tidx + 1, pidx + 1].astype(float)
+        vals = (1 - tfrac) * ((1 - pfrac) * c00 + pfrac * c01) + tfrac * ((1 - pfrac) * c10 + pfrac * c11)
+
+        # phase state of each corner, 0 liquid, 1 vapor, 2 two phase, 3 failed
+        corner_beta = np.stack([c00[:, 0], c01[:, 0], c10[:, 0], c11[:, 0]])
+        states = np.select([np.isnan(corner_beta), corner_beta <= 0, corner_beta >= 1], [3, 0, 1], 2)
+        exact = outside | np.any(states != states[0], axis=0) | (states[0] == 3)
+
+        nc = len(self.comp_list)
+        beta = vals[:, 0].reshape(shape)
+        zliq = vals[:, 1].reshape(shape)
+        zvap = vals[:, 2].reshape(shape)
+        xi_ray = vals[:, 3 : 3 + nc].reshape(shape + (nc,))
+        yi_ray = vals[:, 3 + nc :].reshape(shape + (nc,))
+        return xi_ray, yi_ray, beta, zliq, zvap, exact.reshape(shape)
+
+    def flash(
+        self, peval: np.ndarray, teval: np.ndarray
+    ) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """Table Lookup with a Real Flash for the Points that need one, same returns as lookup
+
+        exact is returned as it came from the lookup, it marks the points that were flashed.
+        """
+        if self.fluid is None:
+            raise ValueError("SurrogateTable needs the fluid it was built for to flash the exact points")
+        xi_ray, yi_ray, beta, zliq, zvap, exact = self.lookup(peval, teval)
+        if exact.any():
+            pexact, texact = (np.broadcast_to(ray, exact.shape)[exact] for ray in (peval, teval))
+            xi, yi, bval = oa.phase_comp_batch(pexact, texact, self.fluid, eos=self.eos)
+            zl, zv = sm.phase_zfac(pexact, texact, xi, yi, bval, self.fluid, self.eos)
+            xi_ray[exact], yi_ray[exact], beta[exact], zliq[exact], zvap[exact] = xi, yi, bval, zl, zv
+        return xi_ray, yi_ray, beta, zliq, zvap, exact
+
+
+def surrogate_report(table: SurrogateTable, fluid: fd.Fluid, npts: int = 500, seed: int = 0) -> dict:
+    """Lookup Error and Speed of a Table against overall.phase_comp at Random Points
+
+    The reference values come from overall.phase_comp_batch, the same solve as phase_comp for
+    each point, phase_comp itself is timed point by point for the speed comparison.
+
+    Args:
+        table (SurrogateTable): Table to check
+        fluid (fd.Fluid): Fluid the table was built for
+        npts (int): Number of Random Points inside the grid
+        seed (int): Seed of the Random Points
+
+    Returns:
+        report (dict): file size and build time of the table, the share of points flagged exact,
+            the share of the points that were not flagged where the lookup and the flash disagree on
+            which phases are present (state_mismatch), largest and mean absolute errors of beta, Z
+            and the compositions over the rest, and microseconds per point of a lookup and of phase_comp
+    """
+    rng = np.random.default_rng(seed)
+    peval = rng.uniform(table.pmin, table.pmax, npts)
+    teval = rng.uniform(table.tmin, table.tmax, npts)
+
+    start = time.perf_counter()
+    xi_ray, yi_ray, beta, zliq, zvap, exact = table.lookup(peval, teval)
+    lookup_us = (time.perf_counter() - start) / npts * 1e6
+
+    start = time.perf_counter()
+    for pres, temp in zip(peval, teval):
+        try:
+            oa.phase_comp(pres, temp, fluid, eos=table.eos)
+        except ValueError:  # only timed here, the batch below gives the reference
+            pass
+    flash_us = (time.perf_counter() - start) / npts * 1e6
+
+    xi_ref, yi_ref, beta_ref = oa.phase_comp_batch(peval, teval, fluid, eos=table.eos)
+    zliq_ref, zvap_ref = sm.phase_zfac(peval, teval, xi_ref, yi_ref, beta_ref, fluid, table.eos)
+
+    good = ~exact & np.isfinite(beta_ref)
+
+    # a phase that is not present is nan, a lookup that has a phase the flash does not, or the
+    # reverse, has no error to measure and is counted on its own instead of dropped
+    fields = (
+        ("beta", beta, beta_ref),
+        ("zliq", zliq, zliq_ref),
+        ("zvap", zvap, zvap_ref),
+        ("xi", xi_ray, xi_ref),
+        ("yi", yi_ray, yi_ref),
+    )
+    mismatch = np.zeros(npts, dtype=bool)
+    for _, vals, ref in fields:
+        state = np.isfinite(vals) != np.isfinite(ref)
+        mismatch |= state.reshape(npts, -1).any(axis=1)
+    mismatch &= good
+
+    def err(vals, ref):
+        keep = good & ~mismatch
+        diff = abs(vals[keep] - ref[keep])
+        diff = diff[np.isfinite(diff)]  # the phase that is not present is nan in both
+        return (float(diff.max()), float(diff.mean())) if diff.size else (0.0, 0.0)
+
+    path = table.path
+    report = {
+        "file_bytes": os.path.getsize(path) + os.path.getsize(_sidecar(path)),
+        "build_seconds": table.meta["build_seconds"],
+        "exact_share": float(exact.mean()),
+        "state_mismatch": float(mismatch.sum() / max(good.sum(), 1)),
+        "lookup_us": lookup_us,
+        "phase_comp_us": flash_us,
+    }
+    for name, vals, ref in fields:
+        report[f"{name}_max_err"], report[f"{name}_mean_err"] = err(vals, ref)
+    return report
@@ -0,0 +1,119 @@
+"""Saturation Pressure Sweeps
+
+Spread many bubble and dew point pressure calculations over a process pool. A job is a
+(comp_dict, teval, kind) tuple, kind is "bubble" or "dew". The property and binary interaction
+tables are sent to each worker once when the pool starts, the jobs themselves only carry
+the composition and temperature. Results come back in the same order as the jobs, a job that
+fails returns nan with the error message instead of stopping the sweep. Compositions are checked
+with fluid.comp_verify before anything is submitted, a job with a bad feed is not sent to the pool.
+
+On platforms that spawn workers (Windows, macOS) call the sweep from under an
+if __name__ == "__main__": guard.
+"""
+
+import itertools
+import math
+from concurrent.futures import ProcessPoolExecutor
+
+import fluid as fd
+import overall as oa
+
+# tables of the worker process, set once by sweep_init
+_prop_dict = None
+_bini_dict = None
+
+
+def sweep_init(prop_dict: dict, bini_dict: dict) -> None:
+    """Worker Process Initializer, stores the tables for every job the worker runs
+
+    Args:
+        prop_dict (dict): Property Table for Lookup
+        bini_dict (dict): Binary Interaction Table
+
+    Returns:
+        None
+    """
+    global _prop_dict, _bini_dict
+    _prop_dict = prop_dict
+    _bini_dict = bini_dict
+
+
+def sweep_job(job: tuple[dict, float, str]) -> tuple[float, str | None]:
+    """Run one Saturation Job in a Worker
+
+    Args:
+        job (tuple): comp_dict, teval in deg F and kind, "bubble" or "dew"
+
+    Returns:
+        pres (float): Saturation Pressure, psig, nan if the job failed
+        error (str): None, or the exception type and message of a failed job
+    """
+    comp_dict, teval, kind = job
+    try:
+        if kind == "bubble":
+            pres = oa.bubblepoint_pressure(teval, comp_dict, _prop_dict, _bini_dict)
+        elif kind == "dew":
+            pres = oa.dewpoint_pressure(teval, comp_dict, _prop_dict, _bini_dict)
+        else:
+            raise ValueError(f"Saturation kind {kind} is not bubble or dew")
+    except Exception as err:
+        return math.nan, f"{type(err).__name__}: {err}"
+    return float(pres), None
+
+
+def sweep_jobs(comp_list: list, temp_list: list, kinds: tuple = ("bubble", "dew")) -> list:
+    """Every Combination of Composition, Temperature and Kind as a Job List
+
+    Args:
+        comp_list (list): Mixture Molar Compositions, list of dictionaries
+        temp_list (list): Evaluated Temperatures, deg F
+        kinds (tuple): Saturation Kinds to run, "bubble" and or "dew"
+
+    Returns:
+        jobs (list): (comp_dict, teval, kind) tuples, composition changes slowest
+    """
+    return [(comp, temp, kind) for comp, temp, kind in itertools.product(comp_list, temp_list, kinds)]
+
+
+def sweep_saturation(
+    jobs: list, prop_dict: dict, bini_dict: dict, max_workers: int | None = None, chunksize: int = 4
+) -> tuple[list, list]:
+    """Saturation Pressures for Many Jobs on a Process Pool
+
+    Args:
+        jobs (list): (comp_dict, teval, kind) tuples, see sweep_jobs
+        prop_dict (dict): Property Table for Lookup
+        bini_dict (dict): Binary Interaction Table
+        max_workers (int): Number of Worker Processes, None uses the cpu count
+        chunksize (int): Jobs sent to a worker at a time, larger cuts down on messaging
+
+    Returns:
+        pres_list (list): Saturation Pressures, psig, in job order, nan where a job failed
+        err_list (list): None for each job that worked, else the error message
+    """
+    results = [None] * len(jobs)
+    checked = {}  # composition items: error message or None
+    run_idx = []
+    for i, (comp_dict, _, _) in enumerate(jobs):
+        comp_items = tuple(comp_dict.items())
+        if comp_items not in checked:
+            try:
+                fd.comp_verify(comp_dict, prop_dict, bini_dict)
+                checked[comp_items] = None
+            except (ValueError, KeyError) as err:
+                checked[comp_items] = f"{type(err).__name__}: {err}"
+        if checked[comp_items] is None:
+            run_idx.append(i)
+        else:
+            results[i] = (math.nan, checked[comp_items])
+
+    if run_idx:
+        with ProcessPoolExecutor(
+            max_workers=max_workers, initializer=sweep_init, initargs=(prop_dict, bini_dict)
+        ) as pool:
+            for i, result in zip(run_idx, pool.map(sweep_job, [jobs[i] for i in run_idx], chunksize=chunksize)):
+                results[i] = result
+
+    pres_list = [pres for pres, _ in results]
+    err_list = [err for _, err in results]
+    return pres_list, err_list
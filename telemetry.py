@@ -0,0 +1,90 @@
+"""Solver Telemetry
+
+Record how a solve went, the number of iterations, how many times the cubic EOS kernels
+ran, the final residual and the wall time of each stage. Nothing is recorded unless a caller
+opens a record, the solvers only check one context variable, so it costs next to nothing when off.
+
+    with telemetry.record("bubblepoint_pressure") as rec:
+        pbub = overall.bubblepoint_pressure(100, comp_dict, prop_dict, bini_dict)
+    rec.to_dict()
+
+Records nest, an inner record collects only its own solve and leaves the outer one alone.
+The active record is a contextvars.ContextVar, so threads and asyncio tasks each see their
+own record, a solve on a worker thread is not charged to a record opened on another thread.
+"""
+
+import contextvars
+import time
+from contextlib import contextmanager
+
+active = contextvars.ContextVar("active", default=None)  # SolveRecord being filled, None when off, get only outside
+
+
+class SolveRecord:
+    def __init__(self, solver: str | None = None):
+        """Telemetry of one Solve
+
+        Args:
+            solver (str): Name of the solve, for the exported record
+        """
+        self.solver = solver
+        self.iterations = 0
+        self.residual = None
+        self.calls = {}  # kernel name: number of calls
+        self.steps = {}  # kind of solver step: number of steps, substitution or newton
+        self.stages = {}  # stage name: seconds
+        self.wall_time = 0.0
+        self._start = time.perf_counter()
+        self._lap = self._start
+
+    def __repr__(self):
+        return f"SolveRecord: {self.solver}, {self.iterations} iterations, {self.calls}, {self.wall_time:.3E} s"
+
+    def count(self, name: str, ncalls: int = 1) -> None:
+        """Add to the call counter of a kernel"""
+        self.calls[name] = self.calls.get(name, 0) + ncalls
+
+    def step(self, kind: str, nsteps: int = 1) -> None:
+        """Add to the step counter of a kind of solver step"""
+        self.steps[kind] = self.steps.get(kind, 0) + nsteps
+
+    def lap(self, stage: str) -> None:
+        """Charge the time since the last lap, or the start, to a stage"""
+        now = time.perf_counter()
+        self.stages[stage] = self.stages.get(stage, 0.0) + now - self._lap
+        self._lap = now
+
+    def to_dict(self) -> dict:
+        """Plain Dictionary of the Record, for a metrics system or json
+
+        Returns:
+            record (dict): solver, iterations, residual, calls, steps, stages and wall_time in seconds
+        """
+        return {
+            "solver": self.solver,
+            "iterations": self.iterations,
+            "residual": self.residual,
+            "calls": dict(self.calls),
+            "steps": dict(self.steps),
+            "stages": dict(self.stages),
+            "wall_time": self.wall_time,
+        }
+
+
+@contextmanager
+def record(solver: str | None = None):
+    """Turn on telemetry for the solves inside the with block
+
+    Args:
+        solver (str): Name of the solve, for the exported record
+
+    Yields:
+        rec (SolveRecord): Filled in while the block runs, wall_time is set on exit
+    """
+    rec = SolveRecord(solver)
+    token = active.set(rec)
+    try:
+        yield rec
+    finally:
+        rec.wall_time = time.perf_counter() - rec._start
+        active.reset(token)
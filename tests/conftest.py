@@ -0,0 +1,39 @@
+import pytest
+
+from proptables.bini_vals import bini_dict as _bini_dict
+from proptables.crit_vals import prop_dict as _prop_dict
+
+
+@pytest.fixture
+def prop_dict():
+    return _prop_dict
+
+
+@pytest.fixture
+def bini_dict():
+    return _bini_dict
+
+
+@pytest.fixture
+def prac_comp():
+    return {"c3": 0.6, "nc4": 0.3, "nc5": 0.1}
+
+
+@pytest.fixture
+def lift_comp():
+    return {
+        "c1": 0.7785,
+        "c2": 0.0575,
+        "c3": 0.0249,
+        "nc4": 0.0039,
+        "ic4": 0.0021,
+        "nc5": 0.0011,
+        "ic5": 0.0008,
+        "nc6": 0.0013,
+        "nc7": 0.0007,
+        "nc8": 0.0003,
+        "nc9": 0.0002,
+        "nc10": 0.0001,
+        "co2": 0.1228,
+        "n2": 0.0058,
+    }
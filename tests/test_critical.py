@@ -0,0 +1,20 @@
+import pytest
+
+import critical as cr
+import envelope as ev
+
+
+def test_pure_component(prop_dict, bini_dict):
+    """A pure component is critical at its own critical pressure and temperature"""
+    pcrit, tcrit = cr.critical_point({"c3": 1.0}, prop_dict, bini_dict)
+    assert pcrit == pytest.approx(prop_dict["c3"].pcrit - 14.7, rel=1e-3)
+    assert tcrit == pytest.approx(prop_dict["c3"].tcrit - 459.67, rel=1e-3)
+
+
+def test_mixture_on_envelope(prac_comp, prop_dict, bini_dict):
+    """The mixture critical point is where the traced envelope goes from bubble to dew"""
+    pcrit, tcrit = cr.critical_point(prac_comp, prop_dict, bini_dict)
+    pres, temp, desc = ev.phase_envelope(prac_comp, prop_dict, bini_dict)
+    assert pcrit == pytest.approx(pres[desc == "crit"][0], rel=1e-6)
+    assert tcrit == pytest.approx(temp[desc == "crit"][0], abs=1e-4)
+    assert prop_dict["c3"].tcrit - 459.67 < tcrit < prop_dict["nc5"].tcrit - 459.67
@@ -0,0 +1,48 @@
+import numpy as np
+import pytest
+
+import eos.cubic as cb
+import fluid as fd
+
+STATES = [  # comp_dict, psia, rankine
+    ({"c3": 0.6, "nc4": 0.3, "nc5": 0.1}, 114.7, 559.67),
+    ({"c1": 0.5, "c3": 0.3, "nc5": 0.2}, 500.0, 520.0),
+    ({"c3": 0.7, "nc4": 0.3, "nc5": 0.0}, 114.7, 559.67),  # a component missing from the feed
+]
+
+
+def lnphi_at(fluid, pabs, tabs, ni_ray, vapor, eos):
+    ai_ray, bi_ray, sqai_ray = fluid.ab_temp(tabs, eos)
+    lnphi, _ = cb.cubic_lnphi(pabs, tabs, ni_ray / ni_ray.sum(), ai_ray, bi_ray, sqai_ray, fluid.kmat, vapor, eos)
+    return lnphi
+
+
+@pytest.mark.parametrize("eos", [cb.PR, cb.SRK], ids=["pr", "srk"])
+@pytest.mark.parametrize("vapor", [False, True], ids=["liquid", "vapor"])
+@pytest.mark.parametrize("comp_dict, pabs, tabs", STATES)
+def test_lnphi_derivs_match_central_differences(comp_dict, pabs, tabs, vapor, eos, prop_dict, bini_dict):
+    fluid = fd.Fluid(comp_dict, prop_dict, bini_dict)
+    ni_ray = fluid.zi_ray.copy()
+    ai_ray, bi_ray, sqai_ray = fluid.ab_temp(tabs, eos)
+    dsqai_ray = cb.cubic_dsqai_temp(tabs, fluid.comp_list, fluid.prop_dict, eos)
+    lnphi, _, dlnphi_dp, dlnphi_dt, dlnphi_dn = cb.cubic_lnphi_derivs(
+        pabs, tabs, ni_ray, ai_ray, bi_ray, sqai_ray, fluid.kmat, vapor, eos, dsqai_ray
+    )
+    np.testing.assert_allclose(lnphi, lnphi_at(fluid, pabs, tabs, ni_ray, vapor, eos), rtol=1e-12)
+
+    hp = 1e-4 * pabs
+    fd_dp = lnphi_at(fluid, pabs + hp, tabs, ni_ray, vapor, eos) - lnphi_at(fluid, pabs - hp, tabs, ni_ray, vapor, eos)
+    np.testing.assert_allclose(dlnphi_dp, fd_dp / (2 * hp), rtol=1e-6, atol=1e-10)
+
+    ht = 1e-4 * tabs
+    fd_dt = lnphi_at(fluid, pabs, tabs + ht, ni_ray, vapor, eos) - lnphi_at(fluid, pabs, tabs - ht, ni_ray, vapor, eos)
+    np.testing.assert_allclose(dlnphi_dt, fd_dt / (2 * ht), rtol=1e-6, atol=1e-8)
+
+    hn = 1e-6
+    for j in range(ni_ray.size):
+        step = np.zeros(ni_ray.size)
+        step[j] = hn
+        fd_dn = lnphi_at(fluid, pabs, tabs, ni_ray + step, vapor, eos) - lnphi_at(
+            fluid, pabs, tabs, ni_ray - step, vapor, eos
+        )
+        np.testing.assert_allclose(dlnphi_dn[:, j], fd_dn / (2 * hn), rtol=1e-5, atol=1e-8)
@@ -0,0 +1,40 @@
+import numpy as np
+import pytest
+
+import eos.cubic as cb
+import eos.peng_robinson as pr
+import eos.soave_redlich_kwong as srk
+
+
+def pressure_residual(zfac, A, B, eos):
+    """Z from the pressure explicit EOS, P V / (R T) = V / (V - b) - a V / (R T (V + d1 b) (V + d2 b))"""
+    return zfac / (zfac - B) - A * zfac / ((zfac + eos.delta1 * B) * (zfac + eos.delta2 * B)) - zfac
+
+
+@pytest.mark.parametrize("eos", [cb.PR, cb.SRK], ids=["pr", "srk"])
+def test_roots_satisfy_the_equation_of_state(eos):
+    rng = np.random.default_rng(7)
+    B = rng.uniform(0.001, 0.2, 500)
+    A = B * rng.uniform(1, 20, 500)
+    zliq, zvap = cb.cubic_zroots(A, B, eos)
+    assert np.all(zliq > B) and np.all(zvap >= zliq)
+    np.testing.assert_allclose(pressure_residual(zliq, A, B, eos), 0, atol=1e-10)
+    np.testing.assert_allclose(pressure_residual(zvap, A, B, eos), 0, atol=1e-10)
+
+
+def test_srk_zfactors_is_the_srk_cubic():
+    """The Z coefficient is A - B - B^2, the baseline had + B^2"""
+    A, B = 0.4, 0.05
+    zray = srk.srk_zfactors(A, B)
+    np.testing.assert_allclose(zray**3 - zray**2 + (A - B - B**2) * zray - A * B, 0, atol=1e-12)
+    np.testing.assert_allclose(pressure_residual(zray, A, B, cb.SRK), 0, atol=1e-12)
+
+
+@pytest.mark.parametrize("A, B", [(0.1, 0.01), (0.4, 0.03), (2.0, 0.1)], ids=["three_roots", "one_root", "dense"])
+def test_pengrob_zfactors_liquid_vapor(A, B):
+    """Always [zliq, zvap], the smallest root above B and the largest root of np.roots"""
+    zroots = np.roots([1, B - 1, A - 2 * B - 3 * B**2, -(A * B - B**2 - B**3)])
+    zreal = zroots.real[abs(zroots.imag) < 1e-8]
+    zray = pr.pengrob_zfactors(A, B)
+    assert zray.shape == (2,)
+    np.testing.assert_allclose(zray, [zreal[zreal > B].min(), zreal.max()], rtol=1e-10)
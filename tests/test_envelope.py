@@ -0,0 +1,25 @@
+import numpy as np
+import pytest
+
+import envelope as ev
+import overall as oa
+
+
+def test_envelope_shape(prac_comp, prop_dict, bini_dict):
+    """Bubble curve up to one critical point, then the dew curve back down to pmin"""
+    pres, temp, desc = ev.phase_envelope(prac_comp, prop_dict, bini_dict, pmin=5.0)
+    icrit = np.flatnonzero(desc == "crit")
+    assert icrit.size == 1
+    assert np.all(desc[: icrit[0]] == "bub") and np.all(desc[icrit[0] + 1 :] == "dew")
+    assert pres[0] == pytest.approx(5.0) and pres[-1] < 5.0
+    assert temp[-1] > temp[0]  # the dew curve ends hotter than the bubble curve starts
+
+
+@pytest.mark.parametrize("kind", ["bub", "dew"])
+def test_envelope_points(prac_comp, prop_dict, bini_dict, kind):
+    """Points on the envelope are the saturation pressures at their temperatures"""
+    pres, temp, desc = ev.phase_envelope(prac_comp, prop_dict, bini_dict)
+    func = oa.bubblepoint_pressure if kind == "bub" else oa.dewpoint_pressure
+    idx = np.flatnonzero(desc == kind)
+    for i in idx[:: max(idx.size // 4, 1)]:
+        assert pres[i] == pytest.approx(func(temp[i], prac_comp, prop_dict, bini_dict), rel=1e-6)
@@ -0,0 +1,38 @@
+import pytest
+
+import flash_cache as fc
+import fluid as fd
+import overall as oa
+
+
+def test_cached_flash(prac_comp, prop_dict, bini_dict):
+    """A repeat call is served from memory and matches the solve at the rounded point"""
+    cache = fc.FlashCache(pres_step=1.0, temp_step=1.0)
+    xi_list, yi_list = cache.phase_comp(100.3, 99.8, prac_comp, prop_dict, bini_dict)
+    assert cache.phase_comp(99.7, 100.2, prac_comp, prop_dict, bini_dict) == (xi_list, yi_list)
+    assert cache.stats()["hits"] == 1 and cache.stats()["misses"] == 1
+    assert (xi_list, yi_list) == oa.phase_comp(100, 100, prac_comp, prop_dict, bini_dict)
+
+
+def test_cached_fluid(prac_comp, prop_dict, bini_dict):
+    """A Fluid and its dictionaries share the same entries"""
+    cache = fc.FlashCache()
+    pbub = cache.bubblepoint_pressure(100, prac_comp, prop_dict, bini_dict)
+    assert cache.bubblepoint_pressure(100, fd.as_fluid(prac_comp, prop_dict, bini_dict)) == pbub
+    assert pbub == pytest.approx(110.1485121649873, rel=1e-8)
+    assert cache.stats()["hits"] == 1
+
+
+def test_fingerprint_tables(prop_dict, bini_dict):
+    """Different table values give a different fingerprint, the digests stay bounded"""
+    comps = ["c3", "nc4", "nc5"]
+    base = fc.table_fingerprint(comps, prop_dict, bini_dict)
+    assert fc.table_fingerprint(comps, prop_dict, bini_dict) == base
+
+    edited = {ci: dict(row) for ci, row in bini_dict.items()}
+    edited["c3"]["nc4"] += 0.01
+    assert fc.table_fingerprint(comps, prop_dict, edited) != base
+
+    for _ in range(fc._fingerprints_size + 10):
+        fc.table_fingerprint(comps, prop_dict, {ci: dict(row) for ci, row in bini_dict.items()})
+    assert len(fc._fingerprints) <= fc._fingerprints_size
@@ -0,0 +1,41 @@
+import numpy as np
+import pytest
+
+import flash as fl
+import flash_jit as fj
+import fluid as fd
+
+CASES = [  # comp_dict, psig, deg F
+    ({"c3": 0.6, "nc4": 0.3, "nc5": 0.1}, 100, 100),
+    ({"c3": 0.7, "nc4": 0.3, "nc5": 0.0}, 100, 100),
+]
+
+
+def compare_backends(monkeypatch, comp_dict, peval, teval, prop_dict, bini_dict):
+    fluid = fd.Fluid(comp_dict, prop_dict, bini_dict)
+    pabs, tabs = peval + 14.7, teval + 459.67
+    ai_ray, bi_ray, sqai_ray = fluid.ab_rays(tabs)
+    ki_ray = fluid.wilson_ki(pabs, tabs)
+    xi_jit, yi_jit, beta_jit, _, gmax, _ = fj.flash_ss(
+        pabs, tabs, fluid.zi_ray, bi_ray, sqai_ray, fluid.kmat, ki_ray, 1e-10, 1e-4, 500
+    )
+    assert gmax < 1e-10
+    monkeypatch.setattr(fj, "enabled", False)
+    xi_ray, yi_ray, beta, _, _ = fl.flash_ssgdem(pabs, tabs, fluid.zi_ray, ai_ray, bi_ray, sqai_ray, fluid.kmat, ki_ray)
+    assert beta_jit == pytest.approx(beta, abs=1e-9)
+    np.testing.assert_allclose(xi_jit, xi_ray, atol=1e-9)
+    np.testing.assert_allclose(yi_jit, yi_ray, atol=1e-9)
+
+
+@pytest.mark.parametrize("comp_dict, peval, teval", CASES)
+def test_loops_match_numpy(monkeypatch, comp_dict, peval, teval, prop_dict, bini_dict):
+    """The loops run as plain python without numba, same answer as the numpy backend"""
+    compare_backends(monkeypatch, comp_dict, peval, teval, prop_dict, bini_dict)
+
+
+@pytest.mark.parametrize("comp_dict, peval, teval", CASES)
+def test_compiled_matches_numpy(monkeypatch, comp_dict, peval, teval, prop_dict, bini_dict):
+    pytest.importorskip("numba")
+    assert fj.enabled
+    assert hasattr(fj.flash_ss_loop, "py_func")  # compiled, not the plain python loop
+    compare_backends(monkeypatch, comp_dict, peval, teval, prop_dict, bini_dict)
@@ -0,0 +1,84 @@
+import functools
+
+import numpy as np
+import pytest
+
+import flash as fl
+import fluid as fd
+import overall as oa
+import stability as st
+import telemetry as tm
+
+
+def unstable_start(fluid, pabs, tabs):
+    ai_ray, bi_ray, sqai_ray = fluid.ab_rays(tabs)
+    ki_ray = fluid.wilson_ki(pabs, tabs)[None, :]
+    stable, ki_ray = st.stability_batch(
+        np.array([pabs]), np.array([tabs]), fluid.zi_ray, ai_ray, bi_ray, sqai_ray, fluid.kmat, ki_ray
+    )
+    assert not stable[0]
+    return ai_ray, bi_ray, sqai_ray, ki_ray[0]
+
+
+def test_flash_converges_on_fugacity_equality(lift_comp, prop_dict, bini_dict):
+    fluid = fd.Fluid(lift_comp, prop_dict, bini_dict)
+    pabs, tabs = 535 + 14.7, -100 + 459.67
+    ai_ray, bi_ray, sqai_ray, ki_ray = unstable_start(fluid, pabs, tabs)
+    xi_ray, yi_ray, beta, niter_ss, niter_newton = fl.flash_ssgdem(
+        pabs, tabs, fluid.zi_ray, ai_ray, bi_ray, sqai_ray, fluid.kmat, ki_ray
+    )
+    assert 0 < beta < 1
+    assert niter_ss + niter_newton < 50
+    gray, _, _, _ = fl.flash_residual(
+        np.log(yi_ray / xi_ray), pabs, tabs, fluid.zi_ray, ai_ray, bi_ray, sqai_ray, fluid.kmat, beta
+    )
+    assert np.max(abs(gray)) < 1e-9
+    np.testing.assert_allclose(beta * yi_ray + (1 - beta) * xi_ray, fluid.zi_ray, atol=1e-12)
+
+
+def test_flash_out_of_iterations_is_nan(lift_comp, prop_dict, bini_dict):
+    fluid = fd.Fluid(lift_comp, prop_dict, bini_dict)
+    pabs, tabs = 535 + 14.7, -100 + 459.67
+    ai_ray, bi_ray, sqai_ray, _ = unstable_start(fluid, pabs, tabs)
+    xi_ray, yi_ray, beta, _, _ = fl.flash_ssgdem(
+        pabs, tabs, fluid.zi_ray, ai_ray, bi_ray, sqai_ray, fluid.kmat, fluid.wilson_ki(pabs, tabs), maxiter=2
+    )
+    assert np.isnan(beta)
+    assert np.all(np.isnan(xi_ray)) and np.all(np.isnan(yi_ray))
+
+
+def test_phase_comp_raises_when_flash_fails(monkeypatch, lift_comp, prop_dict, bini_dict):
+    monkeypatch.setattr(fl, "flash_ssgdem", functools.partial(fl.flash_ssgdem, maxiter=1))
+    with pytest.raises(ValueError, match="did not converge"):
+        oa.phase_comp(535, -100, lift_comp, prop_dict, bini_dict)
+
+
+def test_phase_comp_reports_steps(lift_comp, prop_dict, bini_dict):
+    with tm.record("phase_comp") as rec:
+        oa.phase_comp(535, -100, lift_comp, prop_dict, bini_dict)
+    steps = rec.to_dict()["steps"]
+    assert steps["newton"] > 0
+    assert steps["substitution"] + steps["newton"] == rec.iterations
+
+
+def test_flash_fewer_steps_than_substitution(monkeypatch, lift_comp, prop_dict, bini_dict):
+    """Lift gas at 535 psig and -100 deg F from Wilson K, plain substitution needs about 27 steps"""
+    monkeypatch.setattr(fl.fj, "enabled", False)  # count the numpy steps, the compiled loop has no newton finish
+    fluid = fd.Fluid(lift_comp, prop_dict, bini_dict)
+    pabs, tabs = 535 + 14.7, -100 + 459.67
+    ai_ray, bi_ray, sqai_ray = fluid.ab_rays(tabs)
+    ki_ray = fluid.wilson_ki(pabs, tabs)
+
+    lnk, beta = np.log(ki_ray), 0.5
+    for nsub in range(1, 200):
+        gray, _, _, beta = fl.flash_residual(lnk, pabs, tabs, fluid.zi_ray, ai_ray, bi_ray, sqai_ray, fluid.kmat, beta)
+        if np.max(abs(gray)) < 1e-10:
+            break
+        lnk = lnk - gray
+
+    _, _, bflash, niter_ss, niter_newton = fl.flash_ssgdem(
+        pabs, tabs, fluid.zi_ray, ai_ray, bi_ray, sqai_ray, fluid.kmat, ki_ray
+    )
+    assert bflash == pytest.approx(beta, abs=1e-8)
+    assert nsub > 20
+    assert niter_ss + niter_newton <= 10
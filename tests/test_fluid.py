@@ -0,0 +1,20 @@
+import fluid as fd
+
+
+def test_as_fluid_cached(prac_comp, prop_dict, bini_dict):
+    """The same feed and tables return the stored Fluid, a new composition or table does not"""
+    fluid = fd.as_fluid(prac_comp, prop_dict, bini_dict)
+    assert fd.as_fluid(dict(prac_comp), prop_dict, bini_dict) is fluid
+    assert fd.as_fluid(fluid) is fluid
+
+    other = fd.as_fluid({"c3": 0.5, "nc4": 0.4, "nc5": 0.1}, prop_dict, bini_dict)
+    assert other is not fluid
+    assert other.comp_dict == {"c3": 0.5, "nc4": 0.4, "nc5": 0.1}
+    tables = {ci: dict(row) for ci, row in bini_dict.items()}
+    assert fd.as_fluid(prac_comp, prop_dict, tables) is not fluid
+
+
+def test_as_fluid_cache_bounded(prop_dict, bini_dict):
+    for i in range(fd._fluid_cache_size + 10):
+        fd.as_fluid({"c3": 0.5, "nc4": 0.5 - i * 1e-6, "nc5": i * 1e-6}, prop_dict, bini_dict)
+    assert len(fd._fluid_cache) <= fd._fluid_cache_size
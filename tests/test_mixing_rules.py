@@ -0,0 +1,14 @@
+import numpy as np
+
+import eos.mixing_rules as mr
+
+
+def test_kmat_cache_bounded(bini_dict):
+    """Stored matrices stay under the cache size, the most recent set is kept"""
+    comps = list(bini_dict.keys())
+    for _ in range(mr._kmat_cache_size + 10):
+        tables = {ci: dict(row) for ci, row in bini_dict.items()}  # a new table each time
+        kmat = mr.bini_matrix(comps[:3], tables)
+    assert len(mr._kmat_cache) <= mr._kmat_cache_size
+    assert mr.bini_matrix(comps[:3], tables) is kmat
+    np.testing.assert_allclose(np.diag(kmat), 1 - np.array([bini_dict[ci][ci] for ci in comps[:3]]))
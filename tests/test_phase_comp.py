@@ -0,0 +1,20 @@
+import numpy as np
+
+import overall as oa
+
+
+def test_zero_fraction_feed(prop_dict, bini_dict):
+    """A component at zero is the same flash as leaving it out"""
+    xi_zero, yi_zero = oa.phase_comp(100, 100, {"c3": 0.7, "nc4": 0.3, "nc5": 0.0}, prop_dict, bini_dict)
+    xi_two, yi_two = oa.phase_comp(100, 100, {"c3": 0.7, "nc4": 0.3}, prop_dict, bini_dict)
+    assert xi_zero[2] == 0 and yi_zero[2] == 0
+    np.testing.assert_allclose(xi_zero[:2], xi_two, atol=1e-8)
+    np.testing.assert_allclose(yi_zero[:2], yi_two, atol=1e-8)
+
+
+def test_single_phase_feed(prac_comp, lift_comp, prop_dict, bini_dict):
+    """Wilson puts these outside the envelope, the one trial phase run finds them stable"""
+    zi_prac = list(prac_comp.values())
+    zi_lift = list(lift_comp.values())
+    assert oa.phase_comp(1000, 100, prac_comp, prop_dict, bini_dict) == (zi_prac, zi_prac)
+    assert oa.phase_comp(100, 100, lift_comp, prop_dict, bini_dict) == (zi_lift, zi_lift)
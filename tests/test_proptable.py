@@ -0,0 +1,27 @@
+import numpy as np
+
+import eos.eos_start as es
+import eos.peng_robinson as pr
+import proptables.crit_vals as ct
+
+
+def test_table_rows(prop_dict):
+    """A row reads the same as the dictionary and is only built once"""
+    table = ct.PropTable(prop_dict)
+    for comp, prop in prop_dict.items():
+        row = table[comp]
+        for field in ct.ChemProps.__slots__:
+            assert getattr(row, field) == getattr(prop, field)
+        assert table[comp] is row
+
+
+def test_table_callers(lift_comp, prop_dict, bini_dict):
+    """Per component callers give the same answer from a table as from the dictionary"""
+    table = ct.PropTable(prop_dict)
+    comp_list, zi_list = list(lift_comp.keys()), list(lift_comp.values())
+    np.testing.assert_allclose(
+        es.wilson_ki_list(500, 560, comp_list, zi_list, table, bini_dict),
+        es.wilson_ki_list(500, 560, comp_list, zi_list, prop_dict, bini_dict),
+    )
+    np.testing.assert_allclose(pr.pengrob_ab_rays(560, comp_list, table), pr.pengrob_ab_rays(560, comp_list, prop_dict))
+    assert es.bubblepoint_guess(560, lift_comp, table) == es.bubblepoint_guess(560, lift_comp, prop_dict)
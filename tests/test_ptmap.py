@@ -0,0 +1,18 @@
+import numpy as np
+import pytest
+
+import overall as oa
+import ptmap as pm
+
+
+def test_boundary_points(prac_comp, prop_dict, bini_dict):
+    """Line points are not reported twice by cells sharing a row or column, and are on the line"""
+    ptmap = pm.PTMap(prac_comp, prop_dict, bini_dict, 0, 700, 0, 300, max_depth=4)
+    points = ptmap.boundary_points()
+    locs = np.array([(pres / ptmap.dpres, temp / ptmap.dtemp) for pres, temp, _, _ in points])
+    dist = np.hypot(*(locs[:, None, :] - locs[None, :, :]).transpose(2, 0, 1))
+    np.fill_diagonal(dist, np.inf)
+    assert dist.min() > 1e-3
+
+    pres, temp = next((pres, temp) for pres, temp, kind, solved in points if kind == "bubble" and solved)
+    assert pres == pytest.approx(oa.bubblepoint_pressure(temp, prac_comp, prop_dict, bini_dict), rel=1e-6)
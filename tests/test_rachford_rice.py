@@ -0,0 +1,37 @@
+import numpy as np
+import pytest
+
+import rachford_rice as rr
+
+ZI = np.array([0.6, 0.3, 0.1])
+KI = np.array([2.5, 0.8, 0.2])
+
+
+def test_scalar_root_zeroes_the_objective():
+    beta = rr.rr_solve(ZI, KI)
+    assert 0 < beta < 1
+    rrf_sum, _ = rr.rr_sum(ZI, KI, beta)
+    assert abs(rrf_sum) < 1e-12
+
+
+def test_batch_matches_scalar():
+    ki_ray = np.array([KI, KI * 1.2, KI * 0.9, [0.9, 0.5, 0.1], [3.0, 2.0, 1.5]])
+    beta = rr.rr_solve(ZI, ki_ray)
+    scalar = [rr.rr_solve_scalar(ZI, ki) for ki in ki_ray]
+    np.testing.assert_allclose(beta, scalar, atol=1e-12)
+    assert beta[3] == 0.0 and beta[4] == 1.0  # subcooled and superheated
+
+
+def test_zero_fraction_feed():
+    """A component at zero is the same solve as leaving it out"""
+    zi_ray = np.array([0.7, 0.3, 0.0])
+    ki_ray = np.array([2.5, 0.4, 0.1])
+    with np.errstate(all="raise"):
+        beta = rr.rr_solve(zi_ray, ki_ray)
+    assert beta == pytest.approx(rr.rr_solve(zi_ray[:2], ki_ray[:2]), abs=1e-12)
+
+
+@pytest.mark.parametrize("bad", [np.nan, np.inf, 0.0])
+def test_bad_equilibrium_ratios_raise(bad):
+    with pytest.raises(ValueError, match="finite and positive"):
+        rr.rr_solve(ZI, np.array([2.5, bad, 0.2]))
@@ -0,0 +1,111 @@
+import numpy as np
+import pytest
+
+import fluid as fd
+import overall as oa
+import saturation as sat
+import telemetry as tm
+
+
+def test_bubble_dew_points(prac_comp, lift_comp, prop_dict, bini_dict):
+    """Saturation pressures away from the critical point"""
+    assert oa.bubblepoint_pressure(100, prac_comp, prop_dict, bini_dict) == pytest.approx(110.1485121649873, rel=1e-8)
+    assert oa.dewpoint_pressure(100, prac_comp, prop_dict, bini_dict) == pytest.approx(52.824992780266896, rel=1e-8)
+    assert oa.bubblepoint_pressure(-100, lift_comp, prop_dict, bini_dict) == pytest.approx(630.2272002584921, rel=1e-8)
+    assert oa.dewpoint_pressure(50, lift_comp, prop_dict, bini_dict) == pytest.approx(39.92625244633216, rel=1e-8)
+
+
+@pytest.mark.parametrize("teval, pbub", [(260, 601.1031340089871), (265, 616.8191227981541)])
+def test_near_critical_bubble(prac_comp, prop_dict, bini_dict, teval, pbub):
+    """Next to the critical point the solve stops short of the trivial solution"""
+    with tm.record() as rec:
+        psat = oa.bubblepoint_pressure(teval, prac_comp, prop_dict, bini_dict)
+    assert psat == pytest.approx(pbub, rel=1e-8)
+    assert rec.iterations < 40
+
+
+@pytest.mark.parametrize("teval, psat", [(0, 23.6096683), (60, 92.8313215), (100, 174.1395321)])
+def test_pure_component(prop_dict, bini_dict, teval, psat):
+    """One component has K = 1 at its vapor pressure, bubble and dew point are the same"""
+    pure = {"c3": 1.0}
+    assert oa.bubblepoint_pressure(teval, pure, prop_dict, bini_dict) == pytest.approx(psat, rel=1e-7)
+    assert oa.dewpoint_pressure(teval, pure, prop_dict, bini_dict) == pytest.approx(psat, rel=1e-7)
+
+
+def test_pure_component_supercritical(prop_dict, bini_dict):
+    with pytest.raises(ValueError, match="single component"):
+        oa.dewpoint_pressure(250, {"c3": 1.0}, prop_dict, bini_dict)
+
+
+@pytest.mark.parametrize("teval, pbub", [(100, 1269.1924509), (90, 1265.1936476)])
+def test_bubble_near_cricondenbar(prop_dict, bini_dict, teval, pbub):
+    """Methane propane 20 to 30 deg F under its 118.7 deg F critical point, next to the cricondenbar"""
+    assert oa.bubblepoint_pressure(teval, {"c1": 0.5, "c3": 0.5}, prop_dict, bini_dict) == pytest.approx(pbub, rel=1e-8)
+
+
+def test_newton_failure_counted(prac_comp, prop_dict, bini_dict):
+    """Iterations of a Newton solve that does not converge still reach telemetry"""
+    fluid = fd.as_fluid(prac_comp, prop_dict, bini_dict)
+    tabs, pabs = 560, 200
+    X = np.concatenate((np.log(fluid.wilson_ki(pabs, tabs)), [np.log(tabs), np.log(pabs)]))
+    nc = fluid.zi_ray.size
+    with tm.record() as rec:
+        with pytest.raises(ValueError):
+            sat.sat_newton(X, nc, X[nc], fluid.zi_ray, 0.0, fluid.comp_list, fluid.prop_dict, fluid.kmat, maxiter=2)
+    assert rec.iterations == 2
+    assert rec.residual > 0
+
+
+def test_newton_trivial_stop(prac_comp, prop_dict, bini_dict):
+    """A start on the feed is stopped as trivial instead of crawling there"""
+    fluid = fd.as_fluid(prac_comp, prop_dict, bini_dict)
+    nc = fluid.zi_ray.size
+    X = np.concatenate((np.full(nc, 1e-4), [np.log(560), np.log(2000)]))
+    with pytest.raises(ValueError, match="trivial"):
+        sat.sat_newton(X, nc, X[nc], fluid.zi_ray, 0.0, fluid.comp_list, fluid.prop_dict, fluid.kmat, ktriv=1e-3)
+
+
+@pytest.mark.parametrize(
+    "func, psat, teval",
+    [
+        (oa.bubblepoint_temperature, 110.1485121649873, 100),
+        (oa.dewpoint_temperature, 52.824992780266896, 100),
+    ],
+    ids=["bubble", "dew"],
+)
+def test_saturation_temperature_round_trip(prac_comp, prop_dict, bini_dict, func, psat, teval):
+    """Inverse of the saturation pressures in test_bubble_dew_points"""
+    with tm.record() as rec:
+        tsat = func(psat, prac_comp, prop_dict, bini_dict)
+    assert tsat == pytest.approx(teval, abs=1e-8)
+    assert rec.iterations < 10
+
+
+def test_saturation_temperature_lift(lift_comp, prop_dict, bini_dict):
+    tbub = oa.bubblepoint_temperature(630.2272002584921, lift_comp, prop_dict, bini_dict)
+    tdew = oa.dewpoint_temperature(39.92625244633216, lift_comp, prop_dict, bini_dict)
+    assert tbub == pytest.approx(-100, abs=1e-8)
+    assert tdew == pytest.approx(50, abs=1e-8)
+
+
+def test_saturation_temperature_from_fluid(prac_comp, prop_dict, bini_dict):
+    fluid = fd.Fluid(prac_comp, prop_dict, bini_dict)
+    tsat = oa.saturation_temperature(200 + 14.7, 600, fluid, None, None, 0.0)
+    assert tsat == pytest.approx(oa.bubblepoint_temperature(200, prac_comp, prop_dict, bini_dict), abs=1e-8)
+    assert oa.bubblepoint_pressure(tsat, fluid) == pytest.approx(200, rel=1e-8)
+
+
+@pytest.mark.parametrize("func", [oa.bubblepoint_temperature, oa.dewpoint_temperature], ids=["bubble", "dew"])
+def test_no_saturation_temperature(prac_comp, prop_dict, bini_dict, func):
+    """Above the cricondenbar there is no saturation temperature"""
+    with pytest.raises(ValueError):
+        func(5000, prac_comp, prop_dict, bini_dict)
+
+
+def test_pure_component_temperature(prop_dict, bini_dict):
+    """Vapor pressure of propane at 60 deg F from test_pure_component, back to its temperature"""
+    pure = {"c3": 1.0}
+    assert oa.bubblepoint_temperature(92.8313215, pure, prop_dict, bini_dict) == pytest.approx(60, abs=1e-6)
+    assert oa.dewpoint_temperature(92.8313215, pure, prop_dict, bini_dict) == pytest.approx(60, abs=1e-6)
+    with pytest.raises(ValueError, match="above its critical pressure"):
+        oa.bubblepoint_temperature(1000, pure, prop_dict, bini_dict)
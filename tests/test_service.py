@@ -0,0 +1,63 @@
+import asyncio
+
+import numpy as np
+import pytest
+
+import fluid as fd
+import overall as oa
+from service import FlashClient, FlashService
+
+
+def run_loopback(prop_dict, bini_dict, requests):
+    """Start a service on a free loopback port, run requests(client) against it and return its result"""
+
+    async def main():
+        service = FlashService(prop_dict, bini_dict, max_wait=0.05)
+        await service.start(port=0)
+        host, port = service.address
+        client = await FlashClient.connect(host, port)
+        try:
+            return await requests(client)
+        finally:
+            await client.close()
+            await service.close()
+
+    return asyncio.run(main())
+
+
+def test_concurrent_flashes_are_batched(prac_comp, prop_dict, bini_dict):
+    pres = np.array([50, 100, 150, 175, 200, 250])
+    temp = np.array([100, 120, 140, 150, 160, 180])
+
+    async def requests(client):
+        flashes = await asyncio.gather(*(client.flash(prac_comp, p, t) for p, t in zip(pres.tolist(), temp.tolist())))
+        bubbles = await asyncio.gather(*(client.bubble(prac_comp, t) for t in (100, 150)))
+        return flashes, bubbles, await client.stats()
+
+    flashes, bubbles, stats = run_loopback(prop_dict, bini_dict, requests)
+
+    xi_ray, yi_ray, beta = oa.phase_comp_batch(pres, temp, fd.Fluid(prac_comp, prop_dict, bini_dict))
+    for (xi, yi, bval), xi_exp, yi_exp, bexp in zip(flashes, xi_ray, yi_ray, beta):  # responses in request order
+        assert bval == pytest.approx(bexp, abs=1e-10)
+        np.testing.assert_allclose(xi, xi_exp, atol=1e-10)
+        np.testing.assert_allclose(yi, yi_exp, atol=1e-10)
+    assert bubbles[0] == pytest.approx(oa.bubblepoint_pressure(100, prac_comp, prop_dict, bini_dict), rel=1e-10)
+    assert bubbles[1] == pytest.approx(oa.bubblepoint_pressure(150, prac_comp, prop_dict, bini_dict), rel=1e-10)
+
+    assert stats["requests"] == 8
+    assert stats["errors"] == 0
+    assert stats["batches"] < stats["requests"]
+
+
+def test_bad_composition_error_reply(prac_comp, prop_dict, bini_dict):
+    async def requests(client):
+        with pytest.raises(RuntimeError, match="ValueError: Molar fractions do not sum to one"):
+            await client.flash({"c3": 1.2}, 175, 150)
+        with pytest.raises(RuntimeError, match="not one of"):
+            await client.request("critical", comp=prac_comp, temp=150)
+        xi, yi, beta = await client.flash(prac_comp, 175, 150)  # the connection is still good
+        return beta, await client.stats()
+
+    beta, stats = run_loopback(prop_dict, bini_dict, requests)
+    assert 0 < beta < 1
+    assert stats["errors"] == 2
@@ -0,0 +1,49 @@
+import numpy as np
+import pytest
+
+import fluid as fd
+import stability as st
+
+
+def run_stability(comp_dict, prop_dict, bini_dict, peval, teval, maxiter=100, vapor=None):
+    fluid = fd.Fluid(comp_dict, prop_dict, bini_dict)
+    pabs = np.array([peval + 14.7])
+    tabs = np.array([teval + 459.67])
+    ai_ray, bi_ray, sqai_ray = fluid.ab_temp(tabs[:, None])
+    ki_ray = fluid.wilson_ki(pabs[:, None], tabs[:, None])
+    stable, ki_ray = st.stability_batch(
+        pabs, tabs, fluid.zi_ray, ai_ray, bi_ray, sqai_ray, fluid.kmat, ki_ray, maxiter, vapor=vapor
+    )
+    return stable[0], ki_ray[0]
+
+
+def test_two_phase_feed_is_unstable(prac_comp, prop_dict, bini_dict):
+    stable, ki_ray = run_stability(prac_comp, prop_dict, bini_dict, 100, 100)
+    assert not stable
+    assert ki_ray[0] > 1 > ki_ray[2]  # propane to the vapor, pentane to the liquid
+
+
+def test_single_phase_gas_is_stable(lift_comp, prop_dict, bini_dict):
+    stable, _ = run_stability(lift_comp, prop_dict, bini_dict, 100, 100)
+    assert stable
+
+
+@pytest.mark.parametrize("peval, vapor, stable", [(1000, True, True), (5, False, True), (100, True, False)])
+def test_single_trial(prac_comp, prop_dict, bini_dict, peval, vapor, stable):
+    """The trial phase on the other side of the feed decides the same as both trials"""
+    assert run_stability(prac_comp, prop_dict, bini_dict, peval, 100, vapor=vapor)[0] == stable
+    assert run_stability(prac_comp, prop_dict, bini_dict, peval, 100)[0] == stable
+
+
+def test_unsettled_trial_is_not_stable(lift_comp, prop_dict, bini_dict):
+    """A trial phase that runs out of iterations has not shown the feed is stable"""
+    stable, _ = run_stability(lift_comp, prop_dict, bini_dict, 100, 100, maxiter=1)
+    assert not stable
+
+
+def test_zero_fraction_feed(prop_dict, bini_dict):
+    stable_zero, ki_zero = run_stability({"c3": 0.7, "nc4": 0.3, "nc5": 0.0}, prop_dict, bini_dict, 100, 100)
+    stable_two, ki_two = run_stability({"c3": 0.7, "nc4": 0.3}, prop_dict, bini_dict, 100, 100)
+    assert not stable_zero and not stable_two
+    assert np.all(np.isfinite(ki_zero))
+    np.testing.assert_allclose(ki_zero[:2], ki_two, rtol=1e-6)
@@ -0,0 +1,86 @@
+import csv
+
+import numpy as np
+import pytest
+
+import fluid as fd
+import overall as oa
+import stream as sm
+
+points = [(50, 100), (175, 150), (1000, 100), (100, 250), (20, 60)]  # psig, deg F
+
+
+def write_csv(path, header, rows):
+    with open(path, "w", newline="") as file:
+        writer = csv.writer(file)
+        writer.writerow(header)
+        writer.writerows(rows)
+
+
+def read_csv(path):
+    with open(path, newline="") as file:
+        reader = csv.reader(file)
+        header = next(reader)
+        return header, list(reader)
+
+
+def test_csv_fixed_feed(tmp_path, prac_comp, prop_dict, bini_dict):
+    src, dst = tmp_path / "points.csv", tmp_path / "flashed.csv"
+    write_csv(src, ["id", "pressure", "temperature"], [(i, p, t) for i, (p, t) in enumerate(points)] + [(5, "", 100)])
+    stats = sm.stream_flash(str(src), str(dst), prac_comp, prop_dict, bini_dict, chunksize=2)
+    assert stats["rows"] == 6 and stats["chunks"] == 3 and stats["failed"] == 1
+
+    header, rows = read_csv(dst)
+    comps = list(prac_comp)
+    assert header == ["id", "pressure", "temperature", "beta", "zliq", "zvap"] + [
+        f"{ph}_{comp}" for ph in "xy" for comp in comps
+    ]
+    assert [row[0] for row in rows] == ["0", "1", "2", "3", "4", "5"]
+    out = np.array([[float(val) for val in row[3:]] for row in rows])
+    assert np.all(np.isnan(out[5]))  # no pressure
+
+    peval, teval = np.array(points, dtype=float).T
+    xi_ray, yi_ray, beta = oa.phase_comp_batch(peval, teval, fd.Fluid(prac_comp, prop_dict, bini_dict))
+    np.testing.assert_allclose(out[:5, 0], beta, rtol=1e-12)
+    np.testing.assert_allclose(out[:5, 3:6], xi_ray, rtol=1e-12)
+    np.testing.assert_allclose(out[:5, 6:9], yi_ray, rtol=1e-12)
+    assert np.isnan(out[2, 2]) and np.isfinite(out[2, 1])  # liquid at 1000 psig, no vapor Z
+    assert np.isnan(out[3, 1]) and np.isfinite(out[3, 2])  # vapor at 250 deg F, no liquid Z
+
+
+def test_csv_per_row_feed(tmp_path, prop_dict, bini_dict):
+    src, dst = tmp_path / "points.csv", tmp_path / "flashed.csv"
+    comps = ["c3", "nc4", "nc5"]
+    feeds = [(0.6, 0.3, 0.1), (0.2, 0.3, 0.5), (6, 3, 1)]  # last row normalized to the first
+    write_csv(src, ["temperature", "pressure"] + comps, [(150, 175) + feed for feed in feeds])
+    stats = sm.stream_flash(str(src), str(dst), None, prop_dict, bini_dict, comp_list=comps, chunksize=2)
+    assert stats["rows"] == 3 and stats["failed"] == 0
+
+    header, rows = read_csv(dst)
+    assert header[:8] == ["temperature", "pressure", "c3", "nc4", "nc5", "beta", "zliq", "zvap"]
+    assert [row[2] for row in rows] == ["0.6", "0.2", "6"]
+    for row, feed in zip(rows, feeds):
+        fluid = fd.Fluid(dict(zip(comps, np.array(feed) / sum(feed))), prop_dict, bini_dict)
+        xi_ray, yi_ray, beta = oa.phase_comp_batch(np.array([175.0]), np.array([150.0]), fluid)
+        assert float(row[5]) == pytest.approx(beta[0], abs=1e-9)
+        np.testing.assert_allclose([float(val) for val in row[8:11]], xi_ray[0], atol=1e-9)
+        np.testing.assert_allclose([float(val) for val in row[11:14]], yi_ray[0], atol=1e-9)
+    np.testing.assert_allclose(np.array(rows[2][5:], dtype=float), np.array(rows[0][5:], dtype=float), rtol=1e-12)
+
+
+def test_parquet_round_trip(tmp_path, prac_comp, prop_dict, bini_dict):
+    pa = pytest.importorskip("pyarrow")
+    pq = pytest.importorskip("pyarrow.parquet")
+    src, dst, ref = tmp_path / "points.parquet", tmp_path / "flashed.parquet", tmp_path / "flashed.csv"
+    peval, teval = np.array(points, dtype=float).T
+    pq.write_table(pa.table({"pressure": peval, "temperature": teval}), src)
+    write_csv(tmp_path / "points.csv", ["pressure", "temperature"], points)
+    sm.stream_flash(str(src), str(dst), prac_comp, prop_dict, bini_dict, chunksize=2)
+    sm.stream_flash(str(tmp_path / "points.csv"), str(ref), prac_comp, prop_dict, bini_dict, chunksize=2)
+
+    table = pq.read_table(dst)
+    header, rows = read_csv(ref)
+    assert table.column_names == header
+    np.testing.assert_allclose(table.column("pressure").to_numpy(), peval)
+    for j, name in enumerate(header[2:], start=2):
+        np.testing.assert_allclose(table.column(name).to_numpy(), [float(row[j]) for row in rows], rtol=1e-12)
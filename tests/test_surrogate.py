@@ -0,0 +1,28 @@
+import numpy as np
+
+import fluid as fd
+import surrogate as sg
+
+
+def test_surrogate_report(tmp_path, prac_comp, prop_dict, bini_dict):
+    """Lookups off the flagged cells are close to the flash, phase state mismatches are counted"""
+    fluid = fd.as_fluid(prac_comp, prop_dict, bini_dict)
+    path = str(tmp_path / "prac.npy")
+    sg.build_table(path, fluid, pmin=20, pmax=220, npres=41, tmin=50, tmax=150, ntemp=21, dtype="float64")
+    report = sg.surrogate_report(sg.SurrogateTable(path, fluid), fluid, npts=200)
+    assert 0 <= report["state_mismatch"] < 0.05
+    assert report["beta_max_err"] < 0.05
+    assert np.isfinite(report["xi_mean_err"]) and np.isfinite(report["yi_mean_err"])
+
+
+def test_surrogate_state_mismatch(tmp_path, prac_comp, prop_dict, bini_dict):
+    """A table without the liquid Z factor disagrees with the flash on every two phase point"""
+    fluid = fd.as_fluid(prac_comp, prop_dict, bini_dict)
+    path = str(tmp_path / "prac.npy")
+    sg.build_table(path, fluid, pmin=20, pmax=220, npres=41, tmin=50, tmax=150, ntemp=21, dtype="float64")
+    grid = np.load(path)
+    grid[:, :, 1] = np.nan  # zliq
+    np.save(path, grid)
+    report = sg.surrogate_report(sg.SurrogateTable(path, fluid), fluid, npts=200)
+    assert report["state_mismatch"] > 0.5
+    assert report["zliq_max_err"] == 0
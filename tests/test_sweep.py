@@ -0,0 +1,33 @@
+import math
+
+import pytest
+
+import sweep as sw
+
+
+def test_sweep_order_and_errors(prac_comp, lift_comp, prop_dict, bini_dict):
+    jobs = sw.sweep_jobs([prac_comp], [100], ("bubble", "dew")) + [
+        ({"c3": 1.2}, 60, "bubble"),
+        (lift_comp, 50, "dew"),
+        (prac_comp, 100, "critical"),
+        ({"c3": 0.5, "unobtainium": 0.5}, 60, "dew"),
+        (lift_comp, -100, "bubble"),
+    ]
+    pres_list, err_list = sw.sweep_saturation(jobs, prop_dict, bini_dict, max_workers=2, chunksize=1)
+
+    expected = [110.1485121649873, 52.824992780266896, None, 39.92625244633216, None, None, 630.2272002584921]
+    for pres, err, pexp in zip(pres_list, err_list, expected):
+        if pexp is None:
+            assert math.isnan(pres)
+        else:
+            assert pres == pytest.approx(pexp, rel=1e-8)
+            assert err is None
+    assert err_list[2].startswith("ValueError: Molar fractions do not sum to one")
+    assert err_list[4] == "ValueError: Saturation kind critical is not bubble or dew"
+    assert err_list[5].startswith("KeyError:") and "unobtainium" in err_list[5]
+
+
+def test_sweep_all_bad_skips_the_pool(prop_dict, bini_dict):
+    pres_list, err_list = sw.sweep_saturation([({"c3": 1.2}, 60, "bubble")], prop_dict, bini_dict, max_workers=2)
+    assert math.isnan(pres_list[0])
+    assert "do not sum to one" in err_list[0]
@@ -0,0 +1,43 @@
+import threading
+
+import pytest
+
+import overall as oa
+import telemetry as tm
+
+
+def test_record_nesting_and_reset():
+    assert tm.active.get() is None
+    with tm.record("outer") as outer:
+        assert tm.active.get() is outer
+        tm.active.get().count("kernel")
+        with tm.record("inner") as inner:
+            assert tm.active.get() is inner
+            tm.active.get().count("kernel", 2)
+        assert tm.active.get() is outer
+        tm.active.get().count("kernel")
+    assert tm.active.get() is None
+    assert outer.calls == {"kernel": 2}
+    assert inner.calls == {"kernel": 2}
+    assert inner.wall_time <= outer.wall_time
+
+
+def test_record_reset_on_error():
+    with pytest.raises(RuntimeError):
+        with tm.record("outer") as outer:
+            with tm.record("inner"):
+                raise RuntimeError("solver blew up")
+    assert tm.active.get() is None
+    assert outer.wall_time > 0
+
+
+def test_record_per_thread(prac_comp, prop_dict, bini_dict):
+    """A solve on another thread is not charged to the record of this one"""
+    seen = []
+    thread = threading.Thread(target=lambda: seen.append(tm.active.get()))
+    with tm.record("bubble") as rec:
+        thread.start()
+        thread.join()
+        oa.bubblepoint_pressure(100, prac_comp, prop_dict, bini_dict)
+    assert seen == [None]
+    assert rec.iterations > 0 and rec.calls["cubic_lnphi"] > 0
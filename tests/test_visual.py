@@ -0,0 +1,42 @@
+import os
+import shutil
+
+import numpy as np
+import pytest
+
+import visual as vis
+
+pd = pytest.importorskip("pandas")
+pytest.importorskip("openpyxl")
+
+
+@pytest.mark.parametrize("sheet_name", ["ternary", "lift_gas"])
+def test_hysys_sheet_cache(tmp_path, monkeypatch, sheet_name):
+    """The workbook is parsed once into the npz cache, which reads back the same frame"""
+    xlsx = tmp_path / "hysys_vals.xlsx"
+    shutil.copy(vis.HYSYS_XLSX, xlsx)
+    monkeypatch.setattr(vis, "HYSYS_XLSX", str(xlsx))
+    frame = pd.read_excel(xlsx, sheet_name=sheet_name)
+
+    parsed = vis.hysys_sheet(sheet_name)
+    npz_path = tmp_path / f"hysys_vals_{sheet_name}.npz"
+    assert npz_path.exists()
+    assert list(parsed) == [str(col) for col in frame.columns]
+
+    def no_excel(*args, **kwargs):
+        raise AssertionError("the cache should be read, not the workbook")
+
+    monkeypatch.setattr(pd, "read_excel", no_excel)
+    cached = vis.hysys_sheet(sheet_name)
+    for col in frame.columns:
+        vals = frame[col].to_numpy()
+        if vals.dtype == object:
+            np.testing.assert_array_equal(cached[str(col)], vals.astype(str))
+        else:
+            np.testing.assert_array_equal(cached[str(col)], vals)
+
+    # a newer workbook is parsed again
+    mtime = os.path.getmtime(xlsx) + 10
+    os.utime(xlsx, (mtime, mtime))
+    with pytest.raises(AssertionError, match="the cache should be read"):
+        vis.hysys_sheet(sheet_name)
@@ -1,13 +1,59 @@
 """Visual Graphs and Plots
 
 Used for creating visuals to be seen and verify results are correct
+
+The Hysys reference data, tern and lift, is read from data/hysys_vals.xlsx the first time
+it is used, not at import. Each sheet is saved next to the workbook as an .npz file and
+read from there afterwards, until the workbook is modified. pandas and matplotlib are
+only imported when they are needed.
 """
 
-import matplotlib.pyplot as plt
-import pandas as pd
+import os
+
+import numpy as np
+
+HYSYS_XLSX = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "hysys_vals.xlsx")
+HYSYS_SHEETS = {"tern": "ternary", "lift": "lift_gas"}  # module attribute: sheet name
+
+
+def hysys_sheet(sheet_name: str) -> dict:
+    """Hysys Reference Sheet as Numpy Arrays
+
+    Read a sheet from the .npz cache if it was written from the current workbook,
+    otherwise parse the workbook with pandas and rewrite the cache.
+
+    Args:
+        sheet_name (str): Sheet in data/hysys_vals.xlsx, "ternary" or "lift_gas"
+
+    Returns:
+        sheet (dict): Column name: np.ndarray, text columns are string arrays
+    """
+    npz_path = os.path.splitext(HYSYS_XLSX)[0] + f"_{sheet_name}.npz"
+    xlsx_mtime = os.path.getmtime(HYSYS_XLSX) if os.path.exists(HYSYS_XLSX) else None
+
+    if os.path.exists(npz_path):
+        with np.load(npz_path) as npz:
+            if xlsx_mtime is None or float(npz["_xlsx_mtime"]) == xlsx_mtime:
+                return {key: npz[key] for key in npz.files if key != "_xlsx_mtime"}
 
-tern = pd.read_excel("data/hysys_vals.xlsx", sheet_name="ternary")
-lift = pd.read_excel("data/hysys_vals.xlsx", sheet_name="lift_gas")
+    import pandas as pd
+
+    df = pd.read_excel(HYSYS_XLSX, sheet_name=sheet_name)
+    sheet = {}
+    for col in df.columns:
+        vals = df[col].to_numpy()
+        sheet[str(col)] = vals.astype(str) if vals.dtype == object else vals
+    np.savez(npz_path, _xlsx_mtime=np.array(xlsx_mtime), **sheet)
+    return sheet
+
+
+def __getattr__(name: str) -> dict:
+    """Load tern and lift on First Access, later access finds them in the module"""
+    if name in HYSYS_SHEETS:
+        sheet = hysys_sheet(HYSYS_SHEETS[name])
+        globals()[name] = sheet
+        return sheet
+    raise AttributeError(f"module {__name__} has no attribute {name}")
 
 
 def hysys_plot(
@@ -35,6 +81,11 @@ def hysys_plot(
     Returns:
         Graphs (None)
     """
+    import matplotlib.pyplot as plt
+
+    hy_pres = np.asarray(hy_pres)
+    hy_temp = np.asarray(hy_temp)
+    hy_desc = np.asarray(hy_desc)
     for pres, temp, desc in zip(py_pres, py_temp, py_desc):
         plt.plot(temp, pres, marker="o", label="Py-" + desc.capitalize())
 